@@ -0,0 +1,105 @@
+"""
+Rows/sec of the single-row create_member path vs the create_members_batch path
+
+Run from app/ against the docker-compose database:
+    python -m benchmarks.batch_insert --rows 5000
+"""
+import argparse
+import time
+import uuid
+
+from sqlalchemy import delete
+
+from database.database import SessionLocal
+from database.db_model import Member as MemberTable
+from database.db_model import NotificationOutbox
+from database.init_db import init_db
+from models.member_model import MemberCreate
+from services.member_service import create_member, create_members_batch
+from services.member_stats_service import record_members_deleted
+
+
+def _session():
+    # Outbox rows are still written, so their cost is measured, but as "skipped": no
+    # dispatcher, local or the scheduled Lambda, sends mail to the fake bench-* addresses
+    db = SessionLocal()
+    db.info["outbox_skip"] = True
+    return db
+
+
+def _payloads(run_id: str, label: str, rows: int) -> list:
+    return [
+        {
+            "firstName": "Bench",
+            "lastName": f"Member{i}",
+            "email": f"bench-{run_id}-{label}-{i}@example.com",
+            "phone": "91234567",
+            "age": 30,
+            "isEmployee": i % 2 == 0,
+        }
+        for i in range(rows)
+    ]
+
+
+def bench_single(run_id: str, rows: int) -> float:
+    db = _session()
+    try:
+        payloads = _payloads(run_id, "single", rows)
+        start = time.perf_counter()
+        for payload in payloads:
+            create_member(db, MemberCreate(**payload))
+        return rows / (time.perf_counter() - start)
+    finally:
+        db.close()
+
+
+def bench_batch(run_id: str, rows: int) -> float:
+    db = _session()
+    try:
+        payloads = _payloads(run_id, "batch", rows)
+        start = time.perf_counter()
+        results = create_members_batch(db, payloads)
+        elapsed = time.perf_counter() - start
+        failed = [result for result in results if result["status"] != "created"]
+        if failed:
+            raise RuntimeError(f"{len(failed)} batch rows failed, first: {failed[0]}")
+        return rows / elapsed
+    finally:
+        db.close()
+
+
+def cleanup(run_id: str):
+    db = SessionLocal()
+    try:
+        pattern = f"bench-{run_id}-%"
+        db.execute(delete(NotificationOutbox).where(NotificationOutbox.payload["member"]["email"].astext.like(pattern)))
+        deleted = db.execute(
+            delete(MemberTable).where(MemberTable.email.like(pattern)).returning(MemberTable.age, MemberTable.isEmployee)
+        ).all()
+        # Both create paths counted these members in member_stats
+        record_members_deleted(db, deleted)
+        db.commit()
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000, help="Members inserted by each path")
+    args = parser.parse_args()
+
+    init_db()
+    run_id = uuid.uuid4().hex[:8]
+    try:
+        single = bench_single(run_id, args.rows)
+        batch = bench_batch(run_id, args.rows)
+    finally:
+        cleanup(run_id)
+
+    print(f"single-row create_member : {single:10.0f} rows/sec")
+    print(f"create_members_batch     : {batch:10.0f} rows/sec")
+    print(f"speedup                  : {batch / single:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Cold-start benchmark: init duration and first-request latency of the Lambda handler
+
+Each run starts a fresh interpreter, imports lambda_handler (the Lambda init phase) and
+sends one API Gateway proxy event through it (the first invoke). Run from app/:
+    python -m benchmarks.cold_start --runs 20 --release 1.4.0 --json cold_start.json
+    python -m benchmarks.cold_start --path /members/d2e2c905-0e57-410d-bd31-a99deed4d39e
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def api_gateway_event(path: str, api_key: str) -> dict:
+    return {
+        "resource": path,
+        "path": path,
+        "httpMethod": "GET",
+        "headers": {"X-API-Key": api_key},
+        "multiValueHeaders": {"X-API-Key": [api_key]},
+        "queryStringParameters": None,
+        "multiValueQueryStringParameters": None,
+        "pathParameters": None,
+        "stageVariables": None,
+        "requestContext": {
+            "resourcePath": path,
+            "httpMethod": "GET",
+            "path": f"/bench{path}",
+            "stage": "bench",
+            "requestId": "cold-start-bench",
+            "identity": {"sourceIp": "127.0.0.1"},
+        },
+        "body": None,
+        "isBase64Encoded": False,
+    }
+
+
+def run_child(path: str, api_key: str):
+    """Measure one cold start inside this (fresh) interpreter and print it as JSON"""
+    start = time.perf_counter()
+    import lambda_handler
+    init_done = time.perf_counter()
+    response = lambda_handler.lambda_handler(api_gateway_event(path, api_key), None)
+    first_done = time.perf_counter()
+    print(json.dumps({
+        "init_ms": (init_done - start) * 1000,
+        "first_request_ms": (first_done - init_done) * 1000,
+        "status_code": response["statusCode"],
+    }))
+
+
+def _percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def _summary(values: list) -> dict:
+    return {
+        "min": round(min(values), 2),
+        "p50": round(statistics.median(values), 2),
+        "p95": round(_percentile(values, 95), 2),
+        "max": round(max(values), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="Fresh interpreters to start")
+    parser.add_argument("--path", default="/health", help="Path of the first request")
+    parser.add_argument("--release", default="dev", help="Label stored in the report")
+    parser.add_argument("--json", help="Also write the report to this file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    api_key = os.getenv("API_KEY") or "dev-api-key-12345"
+    if args.child:
+        run_child(args.path, api_key)
+        return
+
+    samples = []
+    for _ in range(args.runs):
+        completed = subprocess.run(
+            [sys.executable, "-m", "benchmarks.cold_start", "--child", "--path", args.path],
+            cwd=APP_DIR,
+            capture_output=True,
+            text=True,
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(f"Cold start run failed:\n{completed.stderr}")
+        samples.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    report = {
+        "release": args.release,
+        "path": args.path,
+        "runs": args.runs,
+        "status_codes": sorted({sample["status_code"] for sample in samples}),
+        "init_ms": _summary([sample["init_ms"] for sample in samples]),
+        "first_request_ms": _summary([sample["first_request_ms"] for sample in samples]),
+    }
+    print(json.dumps(report, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Bytes on the wire and latency of member list responses: identity vs gzip vs br
+
+Drives a throwaway FastAPI app through ASGI (no HTTP client in the loop) whose route
+renders N synthetic members the way GET /members does, behind CompressionMiddleware. For
+each size and encoding it reports:
+- Body bytes, and the Lambda payload bytes (compressed bodies are base64 encoded)
+- Whether the response fits the 6 MB Lambda limit
+- Server time per request (serialization + compression), p50/p95
+- Estimated transfer time at --mbps, and server time + transfer
+Run from app/ (br needs the brotli package):
+    python -m benchmarks.compression --sizes 1000,10000 --requests 50 --mbps 50
+"""
+import argparse
+import asyncio
+import base64
+import json
+import statistics
+import time
+
+from fastapi import FastAPI
+
+from seed import SYNTHETIC_COLUMNS, generate_members
+from utils.compression import LAMBDA_MAX_RESPONSE_BYTES, LAMBDA_RESPONSE_OVERHEAD, CompressionMiddleware, ENCODINGS
+from utils.serialization import json_response
+
+
+def build_app(sizes) -> FastAPI:
+    pages = {size: [dict(zip(SYNTHETIC_COLUMNS, row)) for row in generate_members(0, size, 42)] for size in sizes}
+    app = FastAPI()
+
+    @app.get("/members/{size}")
+    async def members(size: int):
+        return json_response({"message": "Members retrieved successfully", "members": pages[size], "next_cursor": None})
+
+    app.add_middleware(CompressionMiddleware)
+    return app
+
+
+async def _request(app, path: str, encoding: str):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "headers": [(b"accept-encoding", encoding.encode())],
+        "client": ("127.0.0.1", 1234), "server": ("test", 80),
+    }
+    headers, chunks = {}, []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            headers.update((k.decode(), v.decode()) for k, v in message["headers"])
+        else:
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return headers, b"".join(chunks)
+
+
+def measure(app, size: int, encoding: str, requests: int, mbps: float) -> dict:
+    loop = asyncio.new_event_loop()
+    path = f"/members/{size}"
+    headers, body = loop.run_until_complete(_request(app, path, encoding))
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        loop.run_until_complete(_request(app, path, encoding))
+        timings.append((time.perf_counter() - started) * 1000)
+    loop.close()
+
+    timings.sort()
+    compressed = "content-encoding" in headers
+    # What the function returns: text as-is, compressed bytes base64 encoded
+    lambda_bytes = len(base64.b64encode(body)) if compressed else len(body)
+    transfer_ms = len(body) * 8 / (mbps * 1_000_000) * 1000
+    p50 = statistics.median(timings)
+    return {
+        "content_encoding": headers.get("content-encoding", "identity"),
+        "body_bytes": len(body),
+        "lambda_payload_bytes": lambda_bytes,
+        "fits_lambda_limit": lambda_bytes + LAMBDA_RESPONSE_OVERHEAD <= LAMBDA_MAX_RESPONSE_BYTES,
+        "server_ms_p50": round(p50, 2),
+        "server_ms_p95": round(timings[int(len(timings) * 0.95) - 1], 2),
+        "transfer_ms": round(transfer_ms, 2),
+        "total_ms_p50": round(p50 + transfer_ms, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000", help="Comma-separated member counts per response")
+    parser.add_argument("--requests", type=int, default=50, help="Timed requests per size and encoding")
+    parser.add_argument("--mbps", type=float, default=50.0, help="Client bandwidth for the transfer estimate")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    encodings = ("identity",) + ENCODINGS
+    app = build_app(sizes)
+    results = {}
+    for size in sizes:
+        results[size] = {encoding: measure(app, size, encoding, args.requests, args.mbps) for encoding in encodings}
+        identity = results[size]["identity"]["body_bytes"]
+        for encoding, result in results[size].items():
+            result["ratio"] = round(identity / result["body_bytes"], 2)
+
+    report = {"requests": args.requests, "mbps": args.mbps, "results": results}
+    print(json.dumps(report, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Secret rotation check against the docker-compose database
+
+Mimics a Secrets Manager rotation without AWS: a throwaway login role gets a password
+held in LocalSecretsClient, an engine connects as it through install_credential_refresh,
+then the password is changed in both the database and the secret. Checks that:
+- A connection opened before the rotation keeps working (Postgres keeps live sessions)
+- The first new connection after it is rejected with the cached password, re-fetches
+  the secret once and succeeds
+- Later connections reuse the re-fetched credentials without calling the client again
+Exits non-zero if any check fails. Run from app/ (the .env user must be able to CREATE ROLE):
+    python -m benchmarks.credential_rotation
+"""
+import json
+import secrets
+import sys
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import URL
+
+from database.credentials import CredentialProvider, LocalSecretsClient, SecretsManagerCredentials, install_credential_refresh
+from database.database import get_database_credentials, get_engine
+
+ROLE = "rotation_check"
+SECRET_ID = "local/rotation-check"
+
+
+def _set_password(admin, password: str, create: bool = False) -> None:
+    # Utility statements take no bind parameters; the password is generated hex
+    verb = "CREATE ROLE" if create else "ALTER ROLE"
+    admin.execute(text(f"{verb} {ROLE} LOGIN PASSWORD '{password}'"))
+
+
+def _secret(password: str) -> str:
+    return json.dumps({"username": ROLE, "password": password})
+
+
+def main():
+    creds = get_database_credentials()
+    url = URL.create(
+        "postgresql+psycopg2", username=ROLE, host=creds["host"],
+        port=int(creds["port"]) if creds["port"] else None, database=creds["dbname"],
+    )
+    client = LocalSecretsClient()
+    provider = CredentialProvider(SecretsManagerCredentials(SECRET_ID, client=client), ttl=300)
+    engine = create_engine(url, pool_size=2, max_overflow=0)
+    install_credential_refresh(engine, provider)
+
+    checks = {}
+    with get_engine().connect().execution_options(isolation_level="AUTOCOMMIT") as admin:
+        admin.execute(text(f"DROP ROLE IF EXISTS {ROLE}"))
+        password = secrets.token_hex(16)
+        _set_password(admin, password, create=True)
+        client.put_secret_value(SecretId=SECRET_ID, SecretString=_secret(password))
+        try:
+            with engine.connect() as before:
+                checks["connects_before_rotation"] = before.execute(text("SELECT current_user")).scalar() == ROLE
+
+                rotated = secrets.token_hex(16)
+                _set_password(admin, rotated)
+                client.put_secret_value(SecretId=SECRET_ID, SecretString=_secret(rotated))
+                checks["open_connection_survives"] = before.execute(text("SELECT 1")).scalar() == 1
+
+                # A second pool slot forces a new connection while the cached password is stale
+                with engine.connect() as after:
+                    checks["new_connection_after_rotation"] = after.execute(text("SELECT current_user")).scalar() == ROLE
+            checks["secret_fetched_twice"] = client.call_count == 2
+
+            engine.dispose()
+            with engine.connect() as again:
+                again.execute(text("SELECT 1"))
+            checks["no_extra_fetch"] = client.call_count == 2
+        finally:
+            engine.dispose()
+            admin.execute(text(f"DROP ROLE IF EXISTS {ROLE}"))
+
+    report = {"checks": checks, "secret_fetches": client.call_count, "provider_fetches": provider.fetch_count}
+    print(json.dumps(report, indent=2))
+    if not all(checks.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Import-time profile of the Lambda entry point, based on python -X importtime
+
+Run from app/:
+    python -m benchmarks.import_profile --top 25
+    python -m benchmarks.import_profile --json import_profile.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Libraries that should stay out of the cold-start import graph
+DEFERRED_MODULES = ["boto3", "botocore", "bleach", "phonenumbers", "jwt", "psycopg2", "asyncpg"]
+
+
+def profile_imports(entry_module: str = "lambda_handler") -> list:
+    """Import entry_module in a fresh interpreter and return one record per imported module"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {entry_module}"],
+        cwd=APP_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {entry_module} failed:\n{completed.stderr}")
+
+    records = []
+    for line in completed.stderr.splitlines():
+        # import time:       self [us] |   cumulative | imported package
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # One separator space, then two spaces of indentation per nesting level
+        name = name[1:].rstrip()
+        records.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip())) // 2,
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+        })
+    return records
+
+
+def build_report(records: list, entry_module: str, top: int) -> dict:
+    entry = next((r for r in records if r["module"] == entry_module), None)
+    loaded = {r["module"].split(".")[0] for r in records}
+    by_self = sorted(records, key=lambda r: r["self_us"], reverse=True)
+    return {
+        "entry_module": entry_module,
+        "total_ms": round(entry["cumulative_us"] / 1000, 2) if entry else None,
+        "modules_imported": len(records),
+        "deferred_modules_loaded": [name for name in DEFERRED_MODULES if name in loaded],
+        "top_self": [
+            {"module": r["module"], "self_ms": round(r["self_us"] / 1000, 2)} for r in by_self[:top]
+        ],
+        "direct_imports": [
+            {"module": r["module"], "cumulative_ms": round(r["cumulative_us"] / 1000, 2)}
+            for r in sorted(
+                (r for r in records if r["depth"] == 1),
+                key=lambda r: r["cumulative_us"],
+                reverse=True,
+            )[:top]
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="lambda_handler", help="Module to import")
+    parser.add_argument("--top", type=int, default=20, help="Rows per table")
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    report = build_report(profile_imports(args.module), args.module, args.top)
+
+    print(f"import {report['entry_module']}: {report['total_ms']} ms, {report['modules_imported']} modules")
+    if report["deferred_modules_loaded"]:
+        print(f"WARNING: deferred modules loaded at import: {', '.join(report['deferred_modules_loaded'])}")
+    print("\nDirect imports by cumulative time:")
+    for row in report["direct_imports"]:
+        print(f"  {row['cumulative_ms']:9.2f} ms  {row['module']}")
+    print("\nModules by self time:")
+    for row in report["top_self"]:
+        print(f"  {row['self_ms']:9.2f} ms  {row['module']}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+"""
+Load test for the Membership API: mixed read/write workload with per-endpoint percentiles
+
+run      starts the app with uvicorn against the docker-compose database (SES replaced by
+         LocalSESClient), seeds members through POST /members:batch, then drives a weighted
+         mix of create / by_id / list_filtered / list requests at fixed concurrency
+compare  diffs two result files and exits non-zero when the candidate regressed
+
+Run from app/ (needs uvicorn and httpx: pip install uvicorn httpx):
+    python -m benchmarks.load_test run --members 10000 --concurrency 20 --duration 60 --json baseline.json
+    python -m benchmarks.load_test run --url http://localhost:8000 --json candidate.json
+    python -m benchmarks.load_test compare baseline.json candidate.json --max-regression 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+from seed import FIRST_NAMES, LAST_NAMES
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MIX = "create=10,by_id=50,list_filtered=25,list=15"
+EXPECTED_STATUS = {
+    "create": {201},
+    "by_id": {200},
+    "list_filtered": {200},
+    "list": {200},
+}
+LATENCY_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+def serve(port: int, ses_latency_ms: float):
+    """Child process: the app under uvicorn with SES stubbed out"""
+    from services import notification_service
+    service = notification_service.NotificationService(
+        ses_client=notification_service.LocalSESClient(latency=ses_latency_ms / 1000)
+    )
+    service.enabled = True
+    notification_service._notification_service = service
+
+    import uvicorn
+    from main import app
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def start_server(port: int, ses_latency_ms: float) -> subprocess.Popen:
+    env = {**os.environ, "REQUEST_METRICS_LOG": "false"}
+    return subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.load_test", "serve", "--port", str(port), "--ses-latency-ms", str(ses_latency_ms)],
+        cwd=APP_DIR,
+        env=env,
+    )
+
+
+async def wait_healthy(client, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except Exception:
+            pass
+        await asyncio.sleep(0.5)
+    raise RuntimeError("App did not become healthy in time")
+
+
+def member_payload(rng: random.Random, run_id: str, index: int) -> dict:
+    return {
+        "firstName": rng.choice(FIRST_NAMES),
+        "lastName": rng.choice(LAST_NAMES),
+        "email": f"load-{run_id}-{index}@example.com",
+        "phone": f"9{rng.randint(0, 9999999):07d}",
+        "age": rng.randint(18, 80),
+        "isEmployee": rng.random() < 0.1,
+    }
+
+
+async def seed(client, rng: random.Random, run_id: str, count: int, chunk: int = 1000) -> list:
+    """Create count members through the batch endpoint; returns (id, firstName, lastName) tuples"""
+    seeded = []
+    for start in range(0, count, chunk):
+        payloads = [member_payload(rng, run_id, i) for i in range(start, min(count, start + chunk))]
+        response = await client.post("/members:batch", json=payloads)
+        response.raise_for_status()
+        for result, payload in zip(response.json()["results"], payloads):
+            if result["status"] == "created":
+                seeded.append((result["id"], payload["firstName"], payload["lastName"]))
+    return seeded
+
+
+def parse_mix(mix: str) -> dict:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name not in EXPECTED_STATUS:
+            raise ValueError(f"Unknown operation in mix: {name}")
+        weights[name] = float(weight)
+    return weights
+
+
+async def worker(client, rng: random.Random, run_id: str, members: list, weights: dict,
+                 deadline: float, latencies: dict, errors: dict, counter: list):
+    operations, cumulative = list(weights), list(weights.values())
+    while time.monotonic() < deadline:
+        operation = rng.choices(operations, weights=cumulative)[0]
+        if operation == "create":
+            counter[0] += 1
+            request = client.post("/members", json=member_payload(rng, run_id, f"w{counter[0]}"))
+        elif operation == "by_id":
+            request = client.get(f"/members/{rng.choice(members)[0]}")
+        elif operation == "list_filtered":
+            _, first_name, last_name = rng.choice(members)
+            request = client.get("/members", params={"firstName": first_name, "lastName": last_name})
+        else:
+            request = client.get("/members", params={"limit": 100})
+
+        start = time.perf_counter()
+        try:
+            response = await request
+            ok = response.status_code in EXPECTED_STATUS[operation]
+        except Exception:
+            ok = False
+        latencies[operation].append((time.perf_counter() - start) * 1000)
+        if not ok:
+            errors[operation] += 1
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def summarize(samples: list, errors: int, duration: float) -> dict:
+    if not samples:
+        return {"requests": 0, "errors": errors}
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 4),
+        "throughput_rps": round(len(samples) / duration, 1),
+        "mean_ms": round(sum(samples) / len(samples), 2),
+        "p50_ms": round(percentile(samples, 50), 2),
+        "p95_ms": round(percentile(samples, 95), 2),
+        "p99_ms": round(percentile(samples, 99), 2),
+        "max_ms": round(max(samples), 2),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=APP_DIR, capture_output=True, text=True
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+
+async def run_load(args) -> dict:
+    import httpx
+
+    rng = random.Random(args.seed)
+    run_id = uuid.uuid4().hex[:8]
+    weights = parse_mix(args.mix)
+    headers = {"X-API-Key": os.getenv("API_KEY") or "dev-api-key-12345"}
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=args.url, headers=headers, limits=limits, timeout=30.0) as client:
+        await wait_healthy(client)
+        members = await seed(client, rng, run_id, args.members)
+        if not members:
+            raise RuntimeError("Seeding created no members")
+        print(f"Seeded {len(members)} members, warming up for {args.warmup}s")
+
+        for phase_seconds, record in ((args.warmup, False), (args.duration, True)):
+            latencies = {operation: [] for operation in weights}
+            errors = {operation: 0 for operation in weights}
+            counter = [0]
+            deadline = time.monotonic() + phase_seconds
+            started = time.perf_counter()
+            await asyncio.gather(*[
+                worker(client, random.Random(rng.random()), run_id, members, weights, deadline, latencies, errors, counter)
+                for _ in range(args.concurrency)
+            ])
+            elapsed = time.perf_counter() - started
+
+    all_samples = [sample for samples in latencies.values() for sample in samples]
+    return {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "git_commit": git_commit(),
+            "url": args.url,
+            "members": len(members),
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "mix": weights,
+            "seed": args.seed,
+        },
+        "endpoints": {
+            operation: summarize(latencies[operation], errors[operation], elapsed) for operation in weights
+        },
+        "total": summarize(all_samples, sum(errors.values()), elapsed),
+    }
+
+
+def command_run(args):
+    server = None
+    if args.url is None:
+        args.url = f"http://127.0.0.1:{args.port}"
+        server = start_server(args.port, args.ses_latency_ms)
+    try:
+        report = asyncio.run(run_load(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    print(f"{'endpoint':<14} {'req':>7} {'err':>5} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, stats in {**report["endpoints"], "total": report["total"]}.items():
+        if not stats["requests"]:
+            continue
+        print(
+            f"{name:<14} {stats['requests']:>7} {stats['errors']:>5} {stats['throughput_rps']:>8} "
+            f"{stats['p50_ms']:>8} {stats['p95_ms']:>8} {stats['p99_ms']:>8}"
+        )
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+def compare(baseline: dict, candidate: dict, max_regression: float, min_delta_ms: float, max_error_increase: float) -> list:
+    """Regressions of candidate vs baseline, one message per endpoint metric"""
+    regressions = []
+    for name, base in {**baseline["endpoints"], "total": baseline["total"]}.items():
+        cand = candidate["endpoints"].get(name) if name != "total" else candidate["total"]
+        if not cand or not base.get("requests") or not cand.get("requests"):
+            continue
+        for metric in LATENCY_METRICS:
+            limit = base[metric] * (1 + max_regression / 100)
+            if cand[metric] > limit and cand[metric] - base[metric] > min_delta_ms:
+                regressions.append(f"{name} {metric}: {base[metric]} -> {cand[metric]}")
+        if cand["throughput_rps"] < base["throughput_rps"] * (1 - max_regression / 100):
+            regressions.append(f"{name} throughput_rps: {base['throughput_rps']} -> {cand['throughput_rps']}")
+        if cand["error_rate"] > base["error_rate"] + max_error_increase:
+            regressions.append(f"{name} error_rate: {base['error_rate']} -> {cand['error_rate']}")
+    return regressions
+
+
+def command_compare(args):
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    print(f"{'endpoint':<14} {'metric':<15} {'baseline':>10} {'candidate':>10} {'change':>8}")
+    for name, base in {**baseline["endpoints"], "total": baseline["total"]}.items():
+        cand = candidate["endpoints"].get(name) if name != "total" else candidate["total"]
+        if not cand or not base.get("requests") or not cand.get("requests"):
+            continue
+        for metric in (*LATENCY_METRICS, "throughput_rps"):
+            change = (cand[metric] - base[metric]) / base[metric] * 100 if base[metric] else 0.0
+            print(f"{name:<14} {metric:<15} {base[metric]:>10} {cand[metric]:>10} {change:>+7.1f}%")
+
+    regressions = compare(baseline, candidate, args.max_regression, args.min_delta_ms, args.max_error_increase)
+    if regressions:
+        print("\nRegressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print("\nNo regressions")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the workload and report per-endpoint latency")
+    run.add_argument("--url", help="Target an already running app instead of starting one")
+    run.add_argument("--port", type=int, default=8765, help="Port for the app started by the harness")
+    run.add_argument("--members", type=int, default=10000, help="Members to seed before the run")
+    run.add_argument("--concurrency", type=int, default=20)
+    run.add_argument("--duration", type=float, default=60.0, help="Measured seconds")
+    run.add_argument("--warmup", type=float, default=10.0, help="Unmeasured seconds before the run")
+    run.add_argument("--mix", default=DEFAULT_MIX, help="Operation weights")
+    run.add_argument("--ses-latency-ms", type=float, default=20.0, help="Simulated SES call latency")
+    run.add_argument("--seed", type=int, default=1)
+    run.add_argument("--json", help="Write the results to this file")
+
+    diff = commands.add_parser("compare", help="Fail when the candidate regressed against the baseline")
+    diff.add_argument("baseline")
+    diff.add_argument("candidate")
+    diff.add_argument("--max-regression", type=float, default=10.0, help="Allowed change in percent")
+    diff.add_argument("--min-delta-ms", type=float, default=1.0, help="Ignore latency changes smaller than this")
+    diff.add_argument("--max-error-increase", type=float, default=0.01, help="Allowed error rate increase")
+
+    serve_parser = commands.add_parser("serve", help=argparse.SUPPRESS)
+    serve_parser.add_argument("--port", type=int, required=True)
+    serve_parser.add_argument("--ses-latency-ms", type=float, default=20.0)
+
+    args = parser.parse_args()
+    if args.command == "run":
+        command_run(args)
+    elif args.command == "compare":
+        command_compare(args)
+    else:
+        serve(args.port, args.ses_latency_ms)
+
+
+if __name__ == "__main__":
+    main()
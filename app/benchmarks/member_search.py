@@ -0,0 +1,139 @@
+"""
+GET /members/search latency on a large synthetic members table
+
+Tops the members table up to --rows members with realistic first/last names (generated
+server-side with generate_series), runs ANALYZE, then times search_members for a mix of
+exact, partial and misspelled queries. Reports p50/p95/p99 and exits non-zero if p95 is
+above --target-ms. Run from app/ against the docker-compose database:
+    python -m benchmarks.member_search --rows 1000000 --queries 500
+"""
+import argparse
+import json
+import random
+import sys
+import time
+
+from sqlalchemy import text
+
+from database.database import SessionLocal, get_engine
+from database.init_db import init_db
+from seed import FIRST_NAMES, LAST_NAMES
+from services.member_service import SEARCH_DEFAULT_LIMIT, SEARCH_DEFAULT_THRESHOLD, search_members
+
+
+def seed(connection, rows: int) -> int:
+    """Insert synthetic members until the table holds at least rows rows"""
+    existing = connection.execute(text("SELECT count(*) FROM members")).scalar()
+    missing = rows - existing
+    if missing > 0:
+        # A numeric suffix on some names keeps the value distribution from being too uniform
+        connection.execute(
+            text(
+                """
+                INSERT INTO members (id, "firstName", "lastName", email, phone, age, "isEmployee", "createdAt")
+                SELECT gen_random_uuid(), f.name || CASE WHEN n % 7 = 0 THEN chr(65 + n % 26) ELSE '' END,
+                       l.name, lower(f.name) || '.' || lower(l.name) || '.' || n || '.' || substr(md5(random()::text), 1, 6) || '@example.com',
+                       NULL, 18 + n % 60, n % 10 = 0, now() - n * interval '1 second'
+                FROM generate_series(1, :missing) AS n
+                CROSS JOIN LATERAL (SELECT (:first_names)[1 + (n * 7919) % cardinality(:first_names)] AS name) f
+                CROSS JOIN LATERAL (SELECT (:last_names)[1 + (n * 104729) % cardinality(:last_names)] AS name) l
+                """
+            ),
+            {"missing": missing, "first_names": FIRST_NAMES, "last_names": LAST_NAMES},
+        )
+    connection.execute(text("ANALYZE members"))
+    return max(missing, 0)
+
+
+def misspell(rng: random.Random, word: str) -> str:
+    if len(word) < 4:
+        return word
+    i = rng.randrange(1, len(word) - 1)
+    edit = rng.choice(["drop", "swap", "double"])
+    if edit == "drop":
+        return word[:i] + word[i + 1:]
+    if edit == "swap":
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    return word[:i] + word[i] + word[i:]
+
+
+def make_queries(count: int, seed_value: int) -> list:
+    rng = random.Random(seed_value)
+    queries = []
+    for _ in range(count):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        kind = rng.choice(["first", "last", "full", "partial", "misspelled", "email"])
+        if kind == "first":
+            queries.append(first)
+        elif kind == "last":
+            queries.append(last)
+        elif kind == "full":
+            queries.append(f"{first} {last}")
+        elif kind == "partial":
+            queries.append(first[:max(3, len(first) - 2)].lower())
+        elif kind == "misspelled":
+            queries.append(misspell(rng, first if rng.random() < 0.5 else last))
+        else:
+            queries.append(f"{first.lower()}.{last.lower()}")
+    return queries
+
+
+def percentile(values: list, pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Minimum rows in members")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=SEARCH_DEFAULT_LIMIT)
+    parser.add_argument("--threshold", type=float, default=SEARCH_DEFAULT_THRESHOLD)
+    parser.add_argument("--target-ms", type=float, default=50.0, help="Fail if p95 exceeds this")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    init_db()
+    with get_engine().begin() as connection:
+        inserted = seed(connection, args.rows)
+    print(f"Seeded {inserted} synthetic members")
+
+    queries = make_queries(args.queries, args.seed)
+    db = SessionLocal()
+    try:
+        for q in queries[:20]:  # warm the buffer cache and connection
+            search_members(db, q, args.limit, args.threshold)
+            db.rollback()
+        latencies = []
+        hits = 0
+        for q in queries:
+            start = time.perf_counter()
+            results = search_members(db, q, args.limit, args.threshold)
+            latencies.append((time.perf_counter() - start) * 1000)
+            db.rollback()
+            hits += bool(results)
+    finally:
+        db.close()
+
+    report = {
+        "rows": args.rows,
+        "queries": len(queries),
+        "queries_with_results": hits,
+        "p50_ms": round(percentile(latencies, 0.50), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+        "max_ms": round(max(latencies), 2),
+        "target_ms": args.target_ms,
+    }
+    print(json.dumps(report, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    if report["p95_ms"] > args.target_ms:
+        print(f"FAIL: p95 {report['p95_ms']} ms is above the {args.target_ms} ms target")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
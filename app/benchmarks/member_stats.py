@@ -0,0 +1,71 @@
+"""
+GET /members/stats: summary-table read vs a full aggregate over members
+
+Tops the members table up to --rows synthetic members (COPY, then a reconcile so the
+summary matches), then times:
+- get_member_stats, which sums the member_stats rows
+- the same aggregate computed straight from members (what reconcile scans)
+It also checks that both give the same numbers, and exits non-zero if they differ.
+Run from app/ against the docker-compose database:
+    python -m benchmarks.member_stats --rows 1000000 --repeats 50
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+
+from database.database import SessionLocal
+from database.init_db import init_db
+from seed import seed_synthetic_members
+from services.member_stats_service import actual_counts_query, get_member_stats, summarize
+
+
+def _timed(function, repeats: int):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = function()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return result, {
+        "p50_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Top members up to this many rows")
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    init_db()
+    seed_synthetic_members(count=args.rows)
+
+    db = SessionLocal()
+    try:
+        summary, summary_timing = _timed(lambda: get_member_stats(db), args.repeats)
+        scanned, scan_timing = _timed(lambda: summarize(db.execute(actual_counts_query()).all()), max(args.repeats // 10, 3))
+    finally:
+        db.close()
+
+    report = {
+        "members": scanned["total"],
+        "summary_table": summary_timing,
+        "full_scan": scan_timing,
+        "speedup_p50": round(scan_timing["p50_ms"] / max(summary_timing["p50_ms"], 0.001), 1),
+        "consistent": summary == scanned,
+    }
+    print(json.dumps(report, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    if not report["consistent"]:
+        print("member_stats disagrees with members; run python -m services.member_stats_service")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+EXPLAIN check that GET /members name filters use the name indexes at scale
+
+Tops the members table up to --rows synthetic members with generate_series, runs ANALYZE,
+then EXPLAINs the exact query get_members issues for each match mode and filter combination.
+Exits non-zero if any of them plans a sequential scan or misses the name indexes.
+Run from app/ against the docker-compose database:
+    python -m benchmarks.name_lookup_plans --rows 1000000
+"""
+import argparse
+import json
+import sys
+import time
+
+from sqlalchemy import text
+
+from database.database import get_engine
+from database.db_model import Member as MemberTable
+from database.init_db import init_db
+from services.member_service import NAME_MATCH_MODES, _members_query
+
+NAME_INDEXES = {
+    "exact": {"ix_members_lastName_firstName", "ix_members_firstName"},
+    "ci": {"ix_members_lower_lastName_firstName", "ix_members_lower_firstName"},
+    "prefix": {"ix_members_lower_lastName_firstName", "ix_members_lower_firstName"},
+}
+# (firstName, lastName) per match mode; the values exist in the synthetic data
+CASES = {
+    "exact": [("First42", "Last7"), (None, "Last7"), ("First42", None)],
+    "ci": [("first42", "LAST7"), (None, "last7"), ("FIRST42", None)],
+    "prefix": [("first499", "last19"), (None, "last199"), ("first4999", None)],
+}
+
+
+def seed(connection, rows: int) -> int:
+    """Insert synthetic members until the table holds at least rows rows"""
+    existing = connection.execute(text("SELECT count(*) FROM members")).scalar()
+    missing = rows - existing
+    if missing > 0:
+        connection.execute(
+            text(
+                """
+                INSERT INTO members (id, "firstName", "lastName", email, phone, age, "isEmployee", "createdAt")
+                SELECT gen_random_uuid(), 'First' || (n % 5000), 'Last' || (n % 2000),
+                       'plan-check-' || n || '-' || md5(random()::text) || '@example.com',
+                       NULL, 18 + n % 60, n % 10 = 0, now() - n * interval '1 second'
+                FROM generate_series(1, :missing) AS n
+                """
+            ),
+            {"missing": missing},
+        )
+    connection.execute(text("ANALYZE members"))
+    return max(missing, 0)
+
+
+def plan_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def explain(connection, match: str, first_name, last_name) -> dict:
+    compiled = _members_query(first_name, last_name, 100, None, match).compile(dialect=connection.dialect)
+    start = time.perf_counter()
+    result = connection.exec_driver_sql(f"EXPLAIN (ANALYZE, FORMAT JSON) {compiled}", compiled.params).scalar()
+    elapsed = time.perf_counter() - start
+    plan = (json.loads(result) if isinstance(result, str) else result)[0]["Plan"]
+    nodes = list(plan_nodes(plan))
+    indexes = sorted({node["Index Name"] for node in nodes if "Index Name" in node})
+    seq_scans = [node for node in nodes if node["Node Type"] == "Seq Scan" and node.get("Relation Name") == MemberTable.__tablename__]
+    ok = not seq_scans and bool(NAME_INDEXES[match] & set(indexes))
+    return {
+        "match": match,
+        "firstName": first_name,
+        "lastName": last_name,
+        "indexes": indexes,
+        "seq_scan": bool(seq_scans),
+        "ms": round(elapsed * 1000, 2),
+        "ok": ok,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Minimum rows in members")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    init_db()
+    with get_engine().begin() as connection:
+        inserted = seed(connection, args.rows)
+    print(f"Seeded {inserted} synthetic members")
+
+    results = []
+    with get_engine().connect() as connection:
+        for match in NAME_MATCH_MODES:
+            for first_name, last_name in CASES[match]:
+                result = explain(connection, match, first_name, last_name)
+                results.append(result)
+                status = "ok  " if result["ok"] else "FAIL"
+                print(
+                    f"{status} match={match:<6} firstName={first_name!s:<8} lastName={last_name!s:<6} "
+                    f"{result['ms']:>8} ms  {', '.join(result['indexes']) or 'no index'}"
+                    f"{'  (seq scan)' if result['seq_scan'] else ''}"
+                )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if not all(result["ok"] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
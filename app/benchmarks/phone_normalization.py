@@ -0,0 +1,147 @@
+"""
+Phone validation + normalisation cost: original validate-then-sanitize (up to four
+libphonenumber parses) vs the single-parse, memoised normalize_phone_number
+
+Results are first checked against a frozen copy of the original functions; any mismatch
+aborts the run. Run from app/:
+    python -m benchmarks.phone_normalization --rows 20000 --distinct 2000
+"""
+import argparse
+import json
+import random
+import re
+import time
+
+from utils.sanitization import _normalize_phone_number, normalize_phone_number, normalize_phone_numbers_batch
+
+
+def reference_validate_phone_number(phone: str) -> bool:
+    """validate_phone_number before the single-parse normaliser (equivalence oracle)"""
+    if not phone:
+        return True
+    import phonenumbers
+    from phonenumbers import NumberParseException
+    try:
+        parsed = phonenumbers.parse(phone, "SG")
+        return phonenumbers.is_valid_number(parsed)
+    except NumberParseException:
+        try:
+            parsed = phonenumbers.parse(phone, None)
+            return phonenumbers.is_valid_number(parsed)
+        except NumberParseException:
+            return False
+
+
+def reference_sanitize_phone_number(phone: str) -> str:
+    """sanitize_phone_number before the single-parse normaliser (equivalence oracle)"""
+    if not phone:
+        return phone
+    import phonenumbers
+    from phonenumbers import NumberParseException
+    try:
+        parsed = phonenumbers.parse(phone, "SG")
+        if phonenumbers.is_valid_number(parsed):
+            return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+    except NumberParseException:
+        try:
+            parsed = phonenumbers.parse(phone, None)
+            if phonenumbers.is_valid_number(parsed):
+                return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+        except NumberParseException:
+            pass
+    if phone.startswith('+'):
+        return '+' + re.sub(r'\D', '', phone)
+    return re.sub(r'\D', '', phone)
+
+
+def reference_validator(phone: str):
+    """MemberCreate.validate_and_sanitize_phone as it was: validate, then sanitize"""
+    if not reference_validate_phone_number(phone):
+        return None
+    return reference_sanitize_phone_number(phone)
+
+
+def random_phone(rng: random.Random) -> str:
+    roll = rng.random()
+    if roll < 0.4:
+        return f"{rng.choice('89')}{rng.randint(0, 9999999):07d}"
+    if roll < 0.55:
+        return f"+65 {rng.choice('689')}{rng.randint(0, 999):03d} {rng.randint(0, 9999):04d}"
+    if roll < 0.7:
+        return f"+1 ({rng.randint(200, 999)}) {rng.randint(200, 999)}-{rng.randint(0, 9999):04d}"
+    if roll < 0.8:
+        return f"+44 7{rng.randint(0, 999999999):09d}"
+    if roll < 0.9:
+        return "".join(rng.choice("0123456789+-() x") for _ in range(rng.randint(0, 16)))
+    return rng.choice(["", "abc", "+", "12", "+6512345678", "00000000", "tel:+6581234567"])
+
+
+def check_equivalence(phones: list) -> int:
+    for phone in phones:
+        expected = (reference_validate_phone_number(phone), reference_sanitize_phone_number(phone))
+        if normalize_phone_number(phone) != expected:
+            raise AssertionError(f"Mismatch for {phone!r}: expected {expected!r}, got {normalize_phone_number(phone)!r}")
+    if normalize_phone_numbers_batch(phones) != [normalize_phone_number(phone) for phone in phones]:
+        raise AssertionError("normalize_phone_numbers_batch differs from normalize_phone_number")
+    return len(phones)
+
+
+def _time(fn, phones: list) -> float:
+    start = time.perf_counter()
+    fn(phones)
+    return time.perf_counter() - start
+
+
+def run(rows: int, distinct: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    pool = [random_phone(rng) for _ in range(distinct)]
+    phones = [rng.choice(pool) for _ in range(rows)]
+
+    _normalize_phone_number.cache_clear()
+    timings = {
+        "reference": _time(lambda values: [reference_validator(v) for v in values], phones),
+        "single_parse_uncached": _time(
+            lambda values: [_normalize_phone_number.__wrapped__(v, "SG") for v in values if v], phones
+        ),
+        "normalize_phone_number": _time(lambda values: [normalize_phone_number(v) for v in values], phones),
+        "normalize_phone_numbers_batch": _time(normalize_phone_numbers_batch, phones),
+    }
+    return {
+        "rows": rows,
+        "distinct": distinct,
+        "phones_per_sec": {key: round(rows / elapsed) for key, elapsed in timings.items()},
+        "us_per_phone": {key: round(elapsed / rows * 1e6, 2) for key, elapsed in timings.items()},
+        "cache": _normalize_phone_number.cache_info()._asdict(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--distinct", type=int, nargs="+", default=[20000, 2000], help="Distinct phones in the input")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    checked = check_equivalence([random_phone(rng) for _ in range(5000)])
+    print(f"Equivalence: {checked} inputs identical to the original validate + sanitize")
+
+    results = []
+    print(f"{'rows':>7} {'distinct':>8} {'reference us':>13} {'1-parse us':>11} {'cached us':>10} {'batch us':>9}")
+    for distinct in args.distinct:
+        result = run(args.rows, distinct, args.seed)
+        results.append(result)
+        cost = result["us_per_phone"]
+        print(
+            f"{result['rows']:>7} {result['distinct']:>8} {cost['reference']:>13} {cost['single_parse_uncached']:>11} "
+            f"{cost['normalize_phone_number']:>10} {cost['normalize_phone_numbers_batch']:>9}"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"equivalence_cases": checked, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Connection count vs concurrency for each DB_POOL_PROFILE
+
+Each worker thread plays one request stream. For the lambda and rds_proxy profiles every
+worker gets its own engine, the way each Lambda execution environment does; the server
+profile shares one engine between all workers like a uvicorn process. Peak connections
+are sampled from pg_stat_activity. Run from app/ against the docker-compose database:
+    python -m benchmarks.pool_profiles --concurrency 1 10 50 --requests 50
+"""
+import argparse
+import json
+import threading
+import time
+
+from sqlalchemy import text
+
+from database.database import POOL_PROFILES, create_database_engine, get_engine
+
+APPLICATION_NAME = "membership-pool-bench"
+
+
+def _sample_connections(stop: threading.Event, peak: list):
+    with get_engine().connect() as monitor:
+        while not stop.is_set():
+            count = monitor.execute(
+                text("SELECT count(*) FROM pg_stat_activity WHERE application_name = :name"),
+                {"name": APPLICATION_NAME},
+            ).scalar()
+            peak[0] = max(peak[0], count)
+            monitor.rollback()
+            time.sleep(0.02)
+
+
+def _worker(engine, requests: int, latencies: list):
+    for _ in range(requests):
+        start = time.perf_counter()
+        with engine.connect() as connection:
+            connection.execute(text("SELECT pg_sleep(0.005)"))
+            connection.execute(text("SELECT id FROM members LIMIT 1")).first()
+        latencies.append(time.perf_counter() - start)
+
+
+def run(profile: str, concurrency: int, requests: int) -> dict:
+    connect_args = {"application_name": APPLICATION_NAME}
+    if profile == "server":
+        shared = create_database_engine(profile=profile, connect_args=connect_args)
+        engines = [shared] * concurrency
+    else:
+        engines = [create_database_engine(profile=profile, connect_args=connect_args) for _ in range(concurrency)]
+
+    stop = threading.Event()
+    peak = [0]
+    sampler = threading.Thread(target=_sample_connections, args=(stop, peak))
+    sampler.start()
+
+    latencies = []
+    workers = [threading.Thread(target=_worker, args=(engine, requests, latencies)) for engine in engines]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    sampler.join()
+    for engine in set(engines):
+        engine.dispose()
+
+    latencies.sort()
+    return {
+        "profile": profile,
+        "concurrency": concurrency,
+        "peak_connections": peak[0],
+        "requests_per_sec": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--profiles", nargs="+", default=list(POOL_PROFILES), choices=list(POOL_PROFILES))
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 10, 50])
+    parser.add_argument("--requests", type=int, default=50, help="Requests per worker")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'profile':<10} {'concurrency':>11} {'peak conns':>10} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for profile in args.profiles:
+        for concurrency in args.concurrency:
+            result = run(profile, concurrency, args.requests)
+            results.append(result)
+            print(
+                f"{result['profile']:<10} {result['concurrency']:>11} {result['peak_connections']:>10} "
+                f"{result['requests_per_sec']:>9} {result['p50_ms']:>8} {result['p99_ms']:>8}"
+            )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
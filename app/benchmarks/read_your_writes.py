@@ -0,0 +1,80 @@
+"""
+Read-your-writes check against the docker-compose primary + streaming replica
+
+Pauses WAL replay on the replica, creates a member through the app, then checks that:
+- The creating client reads it back (its reads are pinned to the primary)
+- The replica does not have it yet, and another client is still routed to the replica
+Replay is then resumed and the script waits for the replica to catch up. Exits non-zero
+if any check fails. Start the replica and run from app/:
+    docker-compose --profile replica up -d
+    DB_READ_HOST=localhost DB_READ_PORT=5433 python -m benchmarks.read_your_writes
+"""
+import json
+import os
+import sys
+import time
+import uuid
+
+# The member cache would answer the read-back without touching either database
+os.environ["MEMBER_CACHE_BACKEND"] = "none"
+os.environ.setdefault("OUTBOX_DISPATCHER", "false")
+# Sample the lag once while the replica is caught up, so routing here depends only on pins
+os.environ.setdefault("DB_REPLICA_LAG_CHECK_INTERVAL", "300")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from database.database import ReadSessionLocal, get_read_engine
+from database.db_model import Member as MemberTable
+from database.routing import get_read_router
+from main import app
+
+
+def replica_has(member_id) -> bool:
+    db = ReadSessionLocal()
+    try:
+        return db.get(MemberTable, member_id) is not None
+    finally:
+        db.close()
+
+
+def main():
+    if not os.getenv("DB_READ_HOST"):
+        print("Set DB_READ_HOST (and DB_READ_PORT) to the replica")
+        sys.exit(2)
+    with get_read_engine().connect() as connection:
+        if not connection.execute(text("SELECT pg_is_in_recovery()")).scalar():
+            print("DB_READ_HOST is not a streaming replica")
+            sys.exit(2)
+
+    headers = {"X-API-Key": os.getenv("API_KEY") or "dev-api-key-12345"}
+    checks = {}
+    with TestClient(app) as client, get_read_engine().connect().execution_options(isolation_level="AUTOCOMMIT") as replica:
+        get_read_router().lag_monitor.lag()
+        replica.execute(text("SELECT pg_wal_replay_pause()"))
+        try:
+            created = client.post("/members", headers=headers, json={
+                "firstName": "Replica", "lastName": "Check", "email": f"ryw-{uuid.uuid4().hex[:12]}@example.com",
+            })
+            checks["create_201"] = created.status_code == 201
+            member_id = uuid.UUID(created.json()["id"])
+
+            checks["writer_reads_own_write"] = client.get(f"/members/{member_id}", headers=headers).status_code == 200
+            checks["replica_is_behind"] = not replica_has(member_id)
+            checks["other_client_uses_replica"] = get_read_router().use_replica("other-client")
+        finally:
+            replica.execute(text("SELECT pg_wal_replay_resume()"))
+
+        deadline = time.monotonic() + 30
+        while not replica_has(member_id) and time.monotonic() < deadline:
+            time.sleep(0.2)
+        checks["replica_catches_up"] = replica_has(member_id)
+
+    report = {"checks": checks, "routing": get_read_router().stats()}
+    print(json.dumps(report, indent=2))
+    if not all(checks.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
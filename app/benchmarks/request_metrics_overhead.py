@@ -0,0 +1,109 @@
+"""
+Overhead of the request metrics middleware and SQL hooks
+
+Drives a throwaway FastAPI app directly through ASGI (no HTTP client in the loop) with a
+route that runs a few queries against in-memory SQLite and renders a JSON response, and
+compares per-request cost with instrumentation off, on, and on with EMF log lines.
+Run from app/:
+    python -m benchmarks.request_metrics_overhead --requests 5000 --queries 3
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import time
+
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from utils.request_metrics import RequestMetricsMiddleware, install_query_metrics
+from utils.serialization import json_response
+
+
+def build_app(queries: int, instrumented: bool, log: bool) -> FastAPI:
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    if instrumented:
+        install_query_metrics(engine)
+
+    app = FastAPI()
+
+    @app.get("/members/{id}")
+    async def member(id: str):
+        with engine.connect() as connection:
+            for _ in range(queries):
+                connection.execute(text("SELECT 1")).scalar()
+        return json_response({"id": id, "firstName": "John", "lastName": "Tan", "email": "john@example.com"})
+
+    if instrumented:
+        app.add_middleware(RequestMetricsMiddleware, log=log)
+    return app
+
+
+async def _request(app, path: str) -> int:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "headers": [], "client": ("127.0.0.1", 1234), "server": ("test", 80),
+    }
+    status = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await app(scope, receive, send)
+    return status[0]
+
+
+async def _run(app, requests: int) -> float:
+    for _ in range(200):  # warm up
+        await _request(app, "/members/warmup")
+    start = time.perf_counter()
+    for i in range(requests):
+        await _request(app, f"/members/{i}")
+    return time.perf_counter() - start
+
+
+def run(requests: int, queries: int) -> dict:
+    variants = {
+        "off": build_app(queries, instrumented=False, log=False),
+        "on": build_app(queries, instrumented=True, log=False),
+        "on_with_emf_log": build_app(queries, instrumented=True, log=True),
+    }
+    per_request_us = {}
+    for name, app in variants.items():
+        # EMF lines go to stdout; keep them out of the report
+        with contextlib.redirect_stdout(io.StringIO()):
+            elapsed = asyncio.run(_run(app, requests))
+        per_request_us[name] = round(elapsed / requests * 1e6, 1)
+    return {
+        "requests": requests,
+        "queries_per_request": queries,
+        "us_per_request": per_request_us,
+        "overhead_us": {
+            name: round(value - per_request_us["off"], 1) for name, value in per_request_us.items() if name != "off"
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=3, help="SQL statements per request")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    result = run(args.requests, args.queries)
+    print(json.dumps(result, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Name sanitization throughput: the original bleach-per-call pipeline vs utils.sanitization
+
+Before timing, the current functions are checked against a frozen copy of the original
+implementation on randomly generated inputs (markup, entities, control characters,
+unicode whitespace, long strings); any mismatch aborts the run. Run from app/:
+    python -m benchmarks.sanitization --rows 20000 --cases 50000
+"""
+import argparse
+import json
+import random
+import re
+import time
+
+from utils.sanitization import sanitize_name, sanitize_names_batch, sanitize_string
+
+
+def reference_sanitize_string(value: str, max_length: int = 255) -> str:
+    """sanitize_string before the fast path (kept verbatim as the equivalence oracle)"""
+    if not value:
+        return value
+    value = value.strip()
+    if len(value) > max_length:
+        value = value[:max_length]
+    value = re.sub(r'[\x00-\x08\x0b-\x0c\x0e-\x1f\x7f]', '', value)
+    value = re.sub(r'\s+', ' ', value)
+    import bleach
+    value = bleach.clean(value, tags=[], attributes={}, strip=True)
+    return value
+
+
+def reference_sanitize_name(name: str) -> str:
+    """sanitize_name before the fast path (kept verbatim as the equivalence oracle)"""
+    if not name:
+        return name
+    name = reference_sanitize_string(name, max_length=100)
+    name = re.sub(r"[^\w\s\-'.]", '', name, flags=re.UNICODE)
+    return name.strip()
+
+
+PLAIN_NAMES = [
+    "John", "Mary", "Wei Ling", "Muhammad", "Siti", "O'Neil", "Mary-Jane", "Tan", "Lim",
+    "José", "Zoë", "Nguyễn", "李", "St. John", "van der Berg", "Ng", "Kumar", "Rajesh",
+]
+FRAGMENTS = [
+    "<", ">", "&", "&amp;", "&lt;", "&#39;", "&nbsp;", "<b>", "</b>", "<script>alert(1)</script>",
+    "<img src=x onerror=alert(1)>", "<!-- c -->", "<a href='x'>", "'", '"', "-", ".", "_", "0",
+    " ", "  ", "\t", "\n", "\r\n", "\x00", "\x01", "\x0b", "\x0c", "\x1c", "\x1f", "\x7f",
+    "\x85", "\xa0", " ", "　", "﻿", "\ud800", "@", "#", "%", ";", "/", "\\",
+]
+
+
+def random_input(rng: random.Random) -> str:
+    parts = []
+    for _ in range(rng.randint(0, 12)):
+        roll = rng.random()
+        if roll < 0.4:
+            parts.append(rng.choice(PLAIN_NAMES))
+        elif roll < 0.8:
+            parts.append(rng.choice(FRAGMENTS))
+        else:
+            parts.append(chr(rng.randint(0, 0x2FFF)))
+    value = "".join(parts)
+    if rng.random() < 0.05:
+        # Exercise truncation at the 100/255 limits, including whitespace at the cut
+        value = (value + " ") * rng.randint(20, 60)
+    return value
+
+
+def check_equivalence(cases: int, seed: int) -> int:
+    rng = random.Random(seed)
+    inputs = [random_input(rng) for _ in range(cases)] + PLAIN_NAMES + FRAGMENTS + ["", "   "]
+    for value in inputs:
+        expected = (reference_sanitize_string(value), reference_sanitize_name(value))
+        actual = (sanitize_string(value), sanitize_name(value))
+        if actual != expected:
+            raise AssertionError(f"Mismatch for {value!r}: expected {expected!r}, got {actual!r}")
+    batch = sanitize_names_batch(inputs)
+    if batch != [reference_sanitize_name(value) for value in inputs]:
+        raise AssertionError("sanitize_names_batch differs from per-name sanitize_name")
+    return len(inputs)
+
+
+def _time(fn, names: list) -> float:
+    start = time.perf_counter()
+    fn(names)
+    return time.perf_counter() - start
+
+
+def run(rows: int, dirty_ratio: float, seed: int) -> dict:
+    rng = random.Random(seed)
+    names = [
+        random_input(rng) if rng.random() < dirty_ratio else rng.choice(PLAIN_NAMES)
+        for _ in range(rows)
+    ]
+    timings = {
+        "reference": _time(lambda values: [reference_sanitize_name(v) for v in values], names),
+        "sanitize_name": _time(lambda values: [sanitize_name(v) for v in values], names),
+        "sanitize_names_batch": _time(sanitize_names_batch, names),
+    }
+    return {
+        "rows": rows,
+        "dirty_ratio": dirty_ratio,
+        "names_per_sec": {key: round(rows / elapsed) for key, elapsed in timings.items()},
+        "speedup_vs_reference": {
+            key: round(timings["reference"] / elapsed, 1) for key, elapsed in timings.items()
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--dirty-ratio", type=float, nargs="+", default=[0.0, 0.05, 0.5])
+    parser.add_argument("--cases", type=int, default=20000, help="Random equivalence cases")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    checked = check_equivalence(args.cases, args.seed)
+    print(f"Equivalence: {checked} inputs identical to the original implementation")
+
+    results = []
+    print(f"{'dirty':>6} {'reference/s':>12} {'name/s':>10} {'batch/s':>10} {'speedup':>8}")
+    for dirty_ratio in args.dirty_ratio:
+        result = run(args.rows, dirty_ratio, args.seed)
+        results.append(result)
+        rates = result["names_per_sec"]
+        print(
+            f"{dirty_ratio:>6} {rates['reference']:>12} {rates['sanitize_name']:>10} "
+            f"{rates['sanitize_names_batch']:>10} {result['speedup_vs_reference']['sanitize_names_batch']:>7}x"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"equivalence_cases": checked, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+List response cost: validate-and-revalidate + stdlib JSON vs model_construct + orjson
+
+Both paths serve the same in-memory ORM rows through a throwaway FastAPI app, so the
+numbers cover only row conversion, response validation and JSON rendering (no database).
+The "before" route reproduces the original flow: model_validate(from_attributes) in the
+service, Member(**row.__dict__) in the route, then response_model validation and the
+stdlib encoder. Run from app/:
+    python -m benchmarks.serialization --rows 1000 10000 --repeat 5
+"""
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from database.db_model import Member as MemberTable
+from models.member_model import Member, MembersResponse
+from utils.serialization import json_response, member_from_row, member_payload
+
+
+def make_rows(count: int) -> list:
+    start = datetime(2025, 1, 1)
+    return [
+        MemberTable(
+            id=uuid.uuid4(),
+            firstName=f"First{i}",
+            lastName=f"Last{i}",
+            email=f"member{i}@example.com",
+            phone="+6581234567",
+            age=20 + i % 50,
+            isEmployee=i % 2 == 0,
+            createdAt=start + timedelta(seconds=i, microseconds=i),
+        )
+        for i in range(count)
+    ]
+
+
+def build_app(rows: list) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/before", response_model=MembersResponse)
+    def before():
+        results = [Member.model_validate(row, from_attributes=True) for row in rows]
+        members = [Member(**member.__dict__) for member in results]
+        return MembersResponse(message="Members retrieved successfully", members=members, next_cursor=None)
+
+    @app.get("/after", response_model=MembersResponse)
+    def after():
+        results = [member_from_row(row) for row in rows]
+        return json_response({
+            "message": "Members retrieved successfully",
+            "members": [member_payload(member) for member in results],
+            "next_cursor": None,
+        })
+
+    return app
+
+
+def run(rows: int, repeat: int) -> dict:
+    client = TestClient(build_app(make_rows(rows)))
+    bodies = {}
+    timings = {}
+    for path in ("before", "after"):
+        client.get(f"/{path}")  # warm up
+        elapsed = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            response = client.get(f"/{path}")
+            elapsed.append(time.perf_counter() - start)
+        bodies[path] = response.json()
+        timings[path] = min(elapsed)
+    if bodies["before"] != bodies["after"]:
+        raise AssertionError("Response bodies differ between the two paths")
+    return {
+        "rows": rows,
+        "before_ms": round(timings["before"] * 1000, 2),
+        "after_ms": round(timings["after"] * 1000, 2),
+        "speedup": round(timings["before"] / timings["after"], 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5, help="Requests per path; the fastest is reported")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'rows':>7} {'before ms':>10} {'after ms':>9} {'speedup':>8}")
+    for rows in args.rows:
+        result = run(rows, args.repeat)
+        results.append(result)
+        print(f"{result['rows']:>7} {result['before_ms']:>10} {result['after_ms']:>9} {result['speedup']:>7}x")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Insert throughput and primary-key index growth: UUIDv4 vs UUIDv7 member ids
+
+For each id version, loads --rows rows into a scratch table shaped like members (uuid
+primary key + createdAt + row-sized payload) in committed batches. It reports:
+- Throughput overall and per tenth of the load. Random v4 keys slow down once the
+  primary-key index no longer fits in shared_buffers
+- Primary-key index and heap size
+- WAL volume, since random leaf writes cause extra full-page images
+- Leaf density, when the pgstattuple extension can be created
+Run from app/ against the docker-compose database:
+    python -m benchmarks.uuid_insert --rows 10000000 --batch 10000
+    python -m benchmarks.uuid_insert --rows 1000000 --method insert
+"""
+import argparse
+import io
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+
+from database.database import get_engine
+from utils.ids import uuid7
+
+GENERATORS = {"v4": uuid.uuid4, "v7": uuid7}
+PAYLOAD = "x" * 80  # roughly the width of the name/email/phone columns
+
+
+def _table(version: str) -> str:
+    return f"bench_member_ids_{version}"
+
+
+def _scalar(cursor, sql: str, *params):
+    cursor.execute(sql, params)
+    return cursor.fetchone()[0]
+
+
+def load(raw, version: str, rows: int, batch: int, method: str) -> dict:
+    from psycopg2.extras import execute_values
+
+    table = _table(version)
+    generate = GENERATORS[version]
+    cursor = raw.cursor()
+    cursor.execute(f"DROP TABLE IF EXISTS {table}")
+    cursor.execute(f'CREATE TABLE {table} (id uuid PRIMARY KEY, "createdAt" timestamp NOT NULL, payload text NOT NULL)')
+    raw.commit()
+
+    wal_start = _scalar(cursor, "SELECT pg_current_wal_lsn()")
+    segment_rows = max(rows // 10, batch)
+    segments, segment_started, segment_loaded = [], time.perf_counter(), 0
+    started = time.perf_counter()
+    for offset in range(0, rows, batch):
+        size = min(batch, rows - offset)
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        values = [(generate(), now, PAYLOAD) for _ in range(size)]
+        if method == "copy":
+            buffer = io.StringIO("".join(f"{member_id}\t{created}\t{payload}\n" for member_id, created, payload in values))
+            cursor.copy_expert(f'COPY {table} (id, "createdAt", payload) FROM STDIN', buffer)
+        else:
+            execute_values(cursor, f'INSERT INTO {table} (id, "createdAt", payload) VALUES %s', values, page_size=size)
+        raw.commit()
+
+        segment_loaded += size
+        if segment_loaded >= segment_rows or offset + size >= rows:
+            segments.append(round(segment_loaded / (time.perf_counter() - segment_started)))
+            segment_started, segment_loaded = time.perf_counter(), 0
+    elapsed = time.perf_counter() - started
+
+    result = {
+        "seconds": round(elapsed, 1),
+        "rows_per_second": round(rows / elapsed),
+        "rows_per_second_by_tenth": segments,
+        "pkey_index_mb": round(_scalar(cursor, "SELECT pg_relation_size(%s)", f"{table}_pkey") / 2**20, 1),
+        "heap_mb": round(_scalar(cursor, "SELECT pg_relation_size(%s)", table) / 2**20, 1),
+        "wal_mb": round(float(_scalar(cursor, "SELECT pg_wal_lsn_diff(pg_current_wal_lsn(), %s)", wal_start)) / 2**20, 1),
+    }
+    try:
+        result["pkey_leaf_density_pct"] = _scalar(cursor, "SELECT avg_leaf_density FROM pgstatindex(%s)", f"{table}_pkey")
+    except Exception:
+        raw.rollback()
+    raw.commit()
+    cursor.close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--batch", type=int, default=10_000, help="Rows per committed batch")
+    parser.add_argument("--method", choices=["copy", "insert"], default="copy",
+                        help="COPY, or multi-row INSERT like POST /members:batch")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch tables")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    raw = get_engine().raw_connection()
+    try:
+        cursor = raw.cursor()
+        try:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pgstattuple")
+            raw.commit()
+        except Exception:
+            raw.rollback()
+        results = {}
+        for version in GENERATORS:
+            print(f"Loading {args.rows} rows with {version} ids...")
+            results[version] = load(raw, version, args.rows, args.batch, args.method)
+            if not args.keep:
+                cursor.execute(f"DROP TABLE {_table(version)}")
+                raw.commit()
+    finally:
+        raw.close()
+
+    report = {
+        "rows": args.rows,
+        "batch": args.batch,
+        "method": args.method,
+        "results": results,
+        "v7_vs_v4_throughput": round(results["v7"]["rows_per_second"] / results["v4"]["rows_per_second"], 2),
+    }
+    print(json.dumps(report, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Database credential caching with rotation-aware reconnects
+- CredentialProvider: TTL cache around a credential fetch, refreshed single-flight
+- SecretsManagerCredentials: fetches the RDS secret from AWS Secrets Manager
+- LocalSecretsClient: in-memory stand-in for the Secrets Manager client, used by the local
+  rotation check (python -m benchmarks.credential_rotation)
+- install_credential_refresh: engine hook that injects current credentials into every new
+  connection and re-fetches the secret once when the database rejects them
+"""
+import json
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+from sqlalchemy import event
+
+
+class CredentialProvider:
+    """
+    Cache credentials for ttl seconds and refresh them with a single fetch
+    - Concurrent callers that find the cache expired wait for one refresh instead of
+      each calling Secrets Manager
+    - invalidate() only expires the exact credentials a caller saw fail, so a burst of
+      auth failures after a rotation still results in a single re-fetch
+    """
+
+    def __init__(self, fetch: Callable[[], dict], ttl: float = 300.0):
+        self._fetch = fetch
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._credentials = None
+        self._expires_at = 0.0
+        self.fetch_count = 0
+
+    def get(self) -> dict:
+        credentials = self._credentials
+        if credentials is not None and time.monotonic() < self._expires_at:
+            return credentials
+        with self._lock:
+            # Another thread may have refreshed while we waited for the lock
+            if self._credentials is not None and time.monotonic() < self._expires_at:
+                return self._credentials
+            self._credentials = self._fetch()
+            self._expires_at = time.monotonic() + self.ttl
+            self.fetch_count += 1
+            return self._credentials
+
+    def invalidate(self, stale: Optional[dict] = None) -> None:
+        with self._lock:
+            if stale is None or self._credentials is stale:
+                self._expires_at = 0.0
+
+
+class SecretsManagerCredentials:
+    """Credential fetch backed by a Secrets Manager secret holding username/password"""
+
+    def __init__(self, secret_id: str, client=None):
+        self.secret_id = secret_id
+        self._client = client
+
+    def _get_client(self):
+        if self._client is None:
+            # Imported here so local runs never pay for boto3
+            import boto3
+            self._client = boto3.client('secretsmanager')
+        return self._client
+
+    def __call__(self) -> dict:
+        try:
+            response = self._get_client().get_secret_value(SecretId=self.secret_id)
+            secret = json.loads(response['SecretString'])
+        except Exception as e:
+            raise Exception(f"Failed to retrieve database credentials from Secrets Manager: {e}")
+        return {
+            'username': secret['username'],
+            'password': secret['password'],
+            'host': os.environ.get("DB_HOST"),
+            'port': os.environ.get("DB_PORT"),
+            'dbname': os.environ.get("DB_NAME")
+        }
+
+
+class LocalSecretsClient:
+    """In-memory stand-in for the subset of the boto3 Secrets Manager client used here"""
+
+    def __init__(self, secrets: Optional[dict] = None):
+        self._secrets = dict(secrets or {})
+        self.call_count = 0
+
+    def put_secret_value(self, SecretId: str, SecretString: str) -> None:
+        self._secrets[SecretId] = SecretString
+
+    def get_secret_value(self, SecretId: str) -> dict:
+        self.call_count += 1
+        if SecretId not in self._secrets:
+            raise KeyError(f"Secret not found: {SecretId}")
+        return {'SecretString': self._secrets[SecretId]}
+
+
+def _is_auth_failure(error: Exception) -> bool:
+    """Password rejected by Postgres, as raised by psycopg2 or asyncpg"""
+    return (
+        type(error).__name__ == "InvalidPasswordError"
+        or "password authentication failed" in str(error)
+    )
+
+
+def install_credential_refresh(engine, provider: CredentialProvider) -> None:
+    """
+    Open every new pooled connection with the provider's current credentials
+    - Pooled connections are unaffected by a rotation; only new connections use the secret
+    - On an authentication failure the secret is re-fetched once and the connect retried
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "do_connect")
+    def _connect_with_current_credentials(dialect, conn_rec, cargs, cparams):
+        credentials = provider.get()
+        cparams["user"] = credentials["username"]
+        cparams["password"] = credentials["password"]
+        try:
+            return dialect.connect(*cargs, **cparams)
+        except Exception as e:
+            if not _is_auth_failure(e):
+                raise
+            print("Database rejected cached credentials, re-fetching secret (rotation?)")
+            provider.invalidate(credentials)
+            credentials = provider.get()
+            cparams["user"] = credentials["username"]
+            cparams["password"] = credentials["password"]
+            return dialect.connect(*cargs, **cparams)
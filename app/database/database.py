@@ -1,54 +1,264 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import URL
+from sqlalchemy.pool import NullPool
+from sqlalchemy.orm import Session, sessionmaker
+from fastapi import Request
 from dotenv import load_dotenv
+from database.credentials import CredentialProvider, SecretsManagerCredentials, install_credential_refresh
 import os
-import json
-import boto3
+import time
 
 load_dotenv()
 
+def _fetch_local_credentials():
+    # Running locally - use environment variables from .env
+    return {
+        'username': os.environ.get("DB_USER"),
+        'password': os.environ.get("DB_PASSWORD"),
+        'host': os.environ.get("DB_HOST"),
+        'port': os.environ.get("DB_PORT"),
+        'dbname': os.environ.get("DB_NAME")
+    }
+
+_credential_provider = None
+
+def get_credential_provider() -> CredentialProvider:
+    """
+    Get or create the credential provider singleton
+    - Lambda: Secrets Manager, cached for DB_SECRET_TTL seconds (default 300)
+    - Local: environment variables from .env
+    """
+    global _credential_provider
+    if _credential_provider is None:
+        # Check if running in AWS Lambda
+        if os.getenv("AWS_LAMBDA_FUNCTION_NAME"):
+            secret_arn = os.environ.get("DB_SECRET_ARN")
+            if not secret_arn:
+                raise ValueError("DB_SECRET_ARN environment variable not found")
+            fetch = SecretsManagerCredentials(secret_arn)
+        else:
+            fetch = _fetch_local_credentials
+        _credential_provider = CredentialProvider(fetch, ttl=float(os.getenv("DB_SECRET_TTL", "300")))
+    return _credential_provider
+
 def get_database_credentials():
     """Get database credentials from AWS Secrets Manager (Lambda) or environment variables (local dev)"""
-    # Check if running in AWS Lambda
-    if os.getenv("AWS_LAMBDA_FUNCTION_NAME"):
-        # Running in AWS Lambda - use Secrets Manager
-        secret_arn = os.environ.get("DB_SECRET_ARN")
-        if not secret_arn:
-            raise ValueError("DB_SECRET_ARN environment variable not found")
-
-        secrets_client = boto3.client('secretsmanager')
+    return get_credential_provider().get()
+
+def _database_url(driver: str, host: str = None, port: str = None) -> URL:
+    # The password is supplied per connection by install_credential_refresh, so a
+    # rotated secret takes effect without rebuilding the engine
+    db_creds = get_database_credentials()
+    port = port or db_creds['port']
+    return URL.create(
+        f"postgresql+{driver}",
+        username=db_creds['username'],
+        host=host or db_creds['host'],
+        port=int(port) if port else None,
+        database=db_creds['dbname'],
+    )
+
+# Connection pool profiles, selected with DB_POOL_PROFILE
+# - lambda: one persistent connection per container (a container serves one request at a
+#   time); liveness is only checked after the connection sat idle, e.g. while frozen
+# - rds_proxy: no client-side pool, RDS Proxy multiplexes connections; no pre-ping
+# - server: sized QueuePool for long-running local/container deployments
+POOL_PROFILES = {
+    "lambda": lambda: {
+        "pool_size": 1,
+        "max_overflow": 0,
+        "pool_pre_ping": False,
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "900")),
+    },
+    "rds_proxy": lambda: {
+        "poolclass": NullPool,
+        "pool_pre_ping": False,
+    },
+    "server": lambda: {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_pre_ping": True,
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    },
+}
+
+def get_pool_profile() -> str:
+    default = "lambda" if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else "server"
+    profile = os.getenv("DB_POOL_PROFILE", default).lower()
+    if profile not in POOL_PROFILES:
+        raise ValueError(f"Unknown DB_POOL_PROFILE '{profile}', expected one of: {', '.join(POOL_PROFILES)}")
+    return profile
+
+def install_idle_liveness_check(engine, idle_seconds: float) -> None:
+    """
+    Ping a pooled connection on checkout only if it has been idle longer than idle_seconds
+    Replaces pool_pre_ping's round trip on every checkout with one that only runs after
+    a pause long enough for the server or network to have dropped the connection.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "checkin")
+    def _record_checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(sync_engine, "checkout")
+    def _ping_if_idle(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
         try:
-            response = secrets_client.get_secret_value(SecretId=secret_arn)
-            secret = json.loads(response['SecretString'])
-            return {
-                'username': secret['username'],
-                'password': secret['password'],
-                'host': os.environ.get("DB_HOST"),
-                'port': os.environ.get("DB_PORT"),
-                'dbname': os.environ.get("DB_NAME")
-            }
-        except Exception as e:
-            raise Exception(f"Failed to retrieve database credentials from Secrets Manager: {e}")
+            cursor = dbapi_connection.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+        except Exception:
+            # The pool discards this connection and retries the checkout with a new one
+            raise exc.DisconnectionError()
+
+def create_database_engine(driver: str = "psycopg2", profile: str = None, host: str = None, port: str = None, **engine_kwargs):
+    """Build an engine for the given pool profile with credential refresh installed; host/port override the credentials'"""
+    profile = profile or get_pool_profile()
+    kwargs = {**POOL_PROFILES[profile](), **engine_kwargs}
+    url = _database_url(driver, host, port)
+    if driver == "asyncpg":
+        from sqlalchemy.ext.asyncio import create_async_engine
+        engine = create_async_engine(url, **kwargs)
     else:
-        # Running locally - use environment variables from .env
-        return {
-            'username': os.environ.get("DB_USER"),
-            'password': os.environ.get("DB_PASSWORD"),
-            'host': os.environ.get("DB_HOST"),
-            'port': os.environ.get("DB_PORT"),
-            'dbname': os.environ.get("DB_NAME")
-        }
-
-# Get database credentials
-db_creds = get_database_credentials()
-DATABASE_URL = f"postgresql+psycopg2://{db_creds['username']}:{db_creds['password']}@{db_creds['host']}:{db_creds['port']}/{db_creds['dbname']}"
-
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-def get_db():
+        engine = create_engine(url, **kwargs)
+    install_credential_refresh(engine, get_credential_provider())
+    from utils.request_metrics import REQUEST_METRICS_ENABLED, install_query_metrics
+    if REQUEST_METRICS_ENABLED:
+        install_query_metrics(engine)
+    if profile == "lambda":
+        install_idle_liveness_check(engine, float(os.getenv("DB_POOL_IDLE_PING", "60")))
+    return engine
+
+# Credentials and engines are resolved on first use rather than at import, so a cold
+# start only pays for Secrets Manager and connection setup when a request needs the DB.
+_engine = None
+_async_engine = None
+
+def get_engine():
+    global _engine
+    if _engine is None:
+        _engine = create_database_engine("psycopg2")
+        SessionLocal.configure(bind=_engine)
+    return _engine
+
+class LazySessionmaker(sessionmaker):
+    """sessionmaker that builds its engine when the first session is opened"""
+
+    def __init__(self, engine_getter=get_engine, **kw):
+        super().__init__(**kw)
+        self.engine_getter = engine_getter
+
+    def __call__(self, **local_kw):
+        self.engine_getter()
+        return super().__call__(**local_kw)
+
+SessionLocal = LazySessionmaker(autocommit=False, autoflush=False)
+
+# Optional streaming read replica, enabled with DB_READ_HOST (and DB_READ_PORT). It uses
+# the primary's credentials and pool profile; without it the reader is the primary.
+_read_engine = None
+
+def get_read_engine():
+    global _read_engine
+    if not os.getenv("DB_READ_HOST"):
+        return get_engine()
+    if _read_engine is None:
+        _read_engine = create_database_engine("psycopg2", host=os.getenv("DB_READ_HOST"), port=os.getenv("DB_READ_PORT"))
+        ReadSessionLocal.configure(bind=_read_engine)
+    return _read_engine
+
+ReadSessionLocal = LazySessionmaker(get_read_engine, autocommit=False, autoflush=False)
+
+# Unpooled engine for long-lived LISTEN connections (see services/change_feed_service.py),
+# so a listener never holds one of the request pool's connections
+_listen_engine = None
+
+def create_listen_connection():
+    """Dedicated autocommit connection to the primary; closing it closes the socket"""
+    global _listen_engine
+    if _listen_engine is None:
+        _listen_engine = create_database_engine("psycopg2", profile="rds_proxy")
+    connection = _listen_engine.raw_connection()
+    connection.driver_connection.autocommit = True
+    return connection
+
+@event.listens_for(Session, "after_commit")
+def _pin_client_after_write(session):
+    # Sessions opened by get_db carry the client key; pin that client to the primary
+    if "client_key" in session.info:
+        from database.routing import get_read_router
+        get_read_router().record_write(session.info["client_key"])
+
+# Optional asyncpg-backed engine, enabled with DB_ASYNC=true. The sync engine above
+# stays available so both paths can be benchmarked on the same box.
+ASYNC_DB_ENABLED = os.getenv("DB_ASYNC", "false").lower() == "true"
+AsyncSessionLocal = None
+AsyncReadSessionLocal = None
+_async_read_engine = None
+
+def get_async_engine():
+    global _async_engine, AsyncSessionLocal
+    if not ASYNC_DB_ENABLED:
+        raise RuntimeError("Async database engine is disabled (set DB_ASYNC=true)")
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+        _async_engine = create_database_engine("asyncpg")
+        AsyncSessionLocal = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_engine
+
+def get_async_read_engine():
+    global _async_read_engine, AsyncReadSessionLocal
+    if not os.getenv("DB_READ_HOST"):
+        get_async_engine()
+        AsyncReadSessionLocal = AsyncSessionLocal
+        return _async_engine
+    if _async_read_engine is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+        get_async_engine()
+        _async_read_engine = create_database_engine("asyncpg", host=os.getenv("DB_READ_HOST"), port=os.getenv("DB_READ_PORT"))
+        AsyncReadSessionLocal = async_sessionmaker(_async_read_engine, autoflush=False, expire_on_commit=False)
+    return _async_read_engine
+
+def get_db(request: Request = None):
+    """Session on the primary; a commit pins the calling client to the primary for reads"""
+    from database.routing import client_key
     db = SessionLocal()
+    db.info["client_key"] = client_key(request)
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def get_read_db(request: Request = None):
+    """
+    Session for read-only routes
+    - The replica, unless this client wrote within the read-your-writes window or the
+      replica is lagging or unreachable; the primary otherwise
+    - info["replica"] tells the services the rows may be slightly stale
+    """
+    from database.routing import client_key, get_read_router
+    use_replica = get_read_router().use_replica(client_key(request))
+    db = ReadSessionLocal() if use_replica else SessionLocal()
+    db.info["replica"] = use_replica
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db(request: Request = None):
+    from database.routing import client_key
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
+        db.info["client_key"] = client_key(request)
+        yield db
+
+async def get_async_read_db(request: Request = None):
+    from database.routing import client_key, get_read_router
+    use_replica = get_read_router().use_replica(client_key(request))
+    get_async_read_engine()
+    async with (AsyncReadSessionLocal if use_replica else AsyncSessionLocal)() as db:
+        db.info["replica"] = use_replica
+        yield db
@@ -1,15 +1,15 @@
-from sqlalchemy import Column, String, Integer, Boolean, DateTime
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Integer, BigInteger, SmallInteger, Boolean, DateTime, Text, Index, func, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime, timezone
-import uuid
+from utils.ids import new_member_id
 
 Base = declarative_base()
 
 class Member(Base):
     __tablename__ = "members"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=new_member_id)
     firstName = Column(String, nullable=False)
     lastName = Column(String, nullable=False)
     email = Column(String, nullable=False, unique=True)
@@ -17,3 +17,81 @@ class Member(Base):
     age = Column(Integer)
     isEmployee = Column(Boolean, default=False)
     createdAt = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    # Id of the inserting transaction, the commit-safe position in GET /members/changes
+    # (0 for members that predate the column)
+    xid = Column(BigInteger, nullable=False, server_default=text("pg_current_xact_id()::text::bigint"))
+
+    __table_args__ = (
+        # Keyset pagination order for GET /members
+        Index("ix_members_createdAt_id", "createdAt", "id"),
+        # GET /members/changes order
+        Index("ix_members_xid_id", "xid", "id"),
+        # GET /members?match=exact: lastName (+ firstName), or firstName alone
+        Index("ix_members_lastName_firstName", "lastName", "firstName"),
+        Index("ix_members_firstName", "firstName"),
+        # match=ci and match=prefix compare lower(...); text_pattern_ops serves both = and
+        # LIKE 'abc%' regardless of the database collation
+        Index(
+            "ix_members_lower_lastName_firstName",
+            func.lower(lastName).label("lower_lastName"),
+            func.lower(firstName).label("lower_firstName"),
+            postgresql_ops={"lower_lastName": "text_pattern_ops", "lower_firstName": "text_pattern_ops"},
+        ),
+        Index(
+            "ix_members_lower_firstName",
+            func.lower(firstName).label("lower_firstName"),
+            postgresql_ops={"lower_firstName": "text_pattern_ops"},
+        ),
+        # GET /members/search: pg_trgm similarity (%) and ILIKE '%...%' (needs the pg_trgm extension)
+        Index("ix_members_firstName_trgm", "firstName", postgresql_using="gin", postgresql_ops={"firstName": "gin_trgm_ops"}),
+        Index("ix_members_lastName_trgm", "lastName", postgresql_using="gin", postgresql_ops={"lastName": "gin_trgm_ops"}),
+        Index("ix_members_email_trgm", "email", postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"}),
+    )
+
+
+class NotificationOutbox(Base):
+    """Notifications written in the same transaction as the change they announce"""
+    __tablename__ = "notification_outbox"
+    __table_args__ = (
+        # Dispatcher scan: due rows that are still pending
+        Index("ix_notification_outbox_status_next_attempt", "status", "next_attempt_at"),
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    event_type = Column(String, nullable=False)
+    payload = Column(JSONB, nullable=False)
+    status = Column(String, nullable=False, default="pending")  # pending | sent | failed | skipped
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    last_error = Column(Text)
+    created_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    sent_at = Column(DateTime)
+
+
+class IdempotencyKey(Base):
+    """Stored responses for POST requests sent with an Idempotency-Key header"""
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        # Expiry purge scan
+        Index("ix_idempotency_keys_created_at", "created_at"),
+    )
+
+    key = Column(String, primary_key=True)  # "<client>:<Idempotency-Key header>"
+    fingerprint = Column(String, nullable=False)  # SHA-256 of the request body
+    status_code = Column(Integer)
+    response = Column(JSONB)
+    created_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+
+
+class MemberStat(Base):
+    """
+    Member counts per age bucket and employee flag, summed by GET /members/stats
+    - Written in the same transaction as the members they count
+    - slot spreads each bucket over a few rows so concurrent inserts rarely share a row lock
+    """
+    __tablename__ = "member_stats"
+
+    age_bucket = Column(Integer, primary_key=True)  # lower bound of the age range, -1 for no age
+    is_employee = Column(Boolean, primary_key=True)
+    slot = Column(SmallInteger, primary_key=True)
+    count = Column(BigInteger, nullable=False, default=0)
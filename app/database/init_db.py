@@ -0,0 +1,84 @@
+from sqlalchemy import inspect, text
+from database.database import SessionLocal, get_engine
+from database.db_model import Base
+
+# Whether an index exists, is valid, and is still being built by some backend
+INDEX_STATE_SQL = text(
+    """
+    SELECT i.indisvalid AS valid,
+           EXISTS (SELECT 1 FROM pg_stat_progress_create_index p WHERE p.index_relid = i.indexrelid) AS building
+    FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid
+    WHERE c.relname = :name AND c.relkind = 'i' AND pg_table_is_visible(c.oid)
+    """
+)
+
+def _create_index_concurrently(connection, index):
+    # Only for this statement: create_all builds indexes on new tables inside a transaction
+    options = index.dialect_options["postgresql"]
+    options["concurrently"] = True
+    try:
+        index.create(connection)
+    finally:
+        options["concurrently"] = False
+
+def build_missing_indexes(engine, tables):
+    """
+    Add indexes declared on tables that already existed (create_all only indexes new tables)
+    - CREATE INDEX CONCURRENTLY on an autocommit connection, so the table keeps taking writes
+    - An invalid leftover of an interrupted build is dropped (DROP INDEX CONCURRENTLY) and
+      rebuilt; one that is still building, e.g. after the invoking Lambda timed out, is left
+      to finish and picked up by the next run
+    """
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        quote = connection.dialect.identifier_preparer.quote
+        for table in tables:
+            for index in table.indexes:
+                state = connection.execute(INDEX_STATE_SQL, {"name": index.name}).first()
+                if state is not None and state.valid:
+                    continue
+                if state is not None and state.building:
+                    print(f"Index {index.name} is still being built; skipping")
+                    continue
+                if state is not None:
+                    connection.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {quote(index.name)}"))
+                print(f"Creating index {index.name} concurrently...")
+                _create_index_concurrently(connection, index)
+
+def add_member_xid(engine):
+    """
+    Add members.xid to a table created before the change feed used it
+    - Existing rows get a constant 0 and the volatile default is set afterwards; both are
+      catalog-only changes, so neither rewrites the table
+    """
+    with engine.begin() as connection:
+        connection.execute(text("ALTER TABLE members ADD COLUMN IF NOT EXISTS xid bigint NOT NULL DEFAULT 0"))
+        connection.execute(text("ALTER TABLE members ALTER COLUMN xid SET DEFAULT pg_current_xact_id()::text::bigint"))
+
+def init_db():
+    """
+    Create any missing tables and indexes
+    Runs at local startup and as a one-off deploy step in Lambda, never on the request path
+    """
+    engine = get_engine()
+    with engine.begin() as connection:
+        # Trigram indexes for member search; pg_trgm is a trusted extension (PG13+, RDS)
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    existing = set(inspect(engine).get_table_names())
+    Base.metadata.create_all(bind=engine)
+    if "members" in existing and "xid" not in {column["name"] for column in inspect(engine).get_columns("members")}:
+        print("Adding members.xid...")
+        add_member_xid(engine)
+    # create_all skips tables that already exist, so add indexes introduced since then
+    build_missing_indexes(engine, [table for table in Base.metadata.sorted_tables if table.name in existing])
+    if "member_stats" not in existing:
+        # Backfill the summary for members that predate it
+        from services.member_stats_service import reconcile_member_stats
+        db = SessionLocal()
+        try:
+            reconcile_member_stats(db)
+        finally:
+            db.close()
+    print("Database schema is up to date.")
+
+if __name__ == "__main__":
+    init_db()
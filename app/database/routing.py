@@ -0,0 +1,199 @@
+"""
+Reader/writer routing between the primary and a streaming read replica
+- Reads served through get_read_db go to the replica (DB_READ_HOST) unless that client
+  wrote recently: a commit through get_db pins the client to the primary for
+  max(DB_READ_YOUR_WRITES_SECONDS, current replica lag)
+- ReplicaLagMonitor samples replay lag on the replica at most every
+  DB_REPLICA_LAG_CHECK_INTERVAL seconds; above DB_REPLICA_MAX_LAG, or while the replica
+  cannot be reached, every read goes to the primary
+- Pins are kept in the shared key/value store at DB_READ_YOUR_WRITES_URL (default
+  MEMBER_CACHE_URL) so they hold across Lambda containers and uvicorn workers; without
+  one they fall back to process memory and cover a single process
+"""
+import hashlib
+import math
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+from sqlalchemy import text
+
+from services.cache_service import CacheBackend, LRUCache, SharedCache
+
+# Zero when the replica has replayed everything it received, so an idle primary does not
+# read as a growing lag; zero on a primary so DB_READ_HOST can point at one in development
+REPLICA_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+def client_key(request) -> Optional[str]:
+    """
+    Identify "the same client" for read-your-writes pins, most specific first
+    - The Cognito sub from API Gateway's authorizer claims, then the bearer token
+    - Then the API key, then the address. One API key is shared by every API-key client,
+      so a write by any of them pins all of them to the primary for the window; under
+      steady API-key writes the replica is then rarely used
+    """
+    if request is None:
+        return None
+    from utils.auth import gateway_claims
+    claims = gateway_claims(request)
+    if claims and claims.get("sub"):
+        return "sub:" + claims["sub"]
+    credential = request.headers.get("authorization") or request.headers.get("x-api-key")
+    if credential:
+        return hashlib.sha256(credential.encode()).hexdigest()[:32]
+    return request.client.host if request.client else None
+
+
+def measure_replica_lag(engine) -> float:
+    with engine.connect() as connection:
+        return float(connection.execute(REPLICA_LAG_SQL).scalar())
+
+
+class ReplicaLagMonitor:
+    """
+    Cached replica lag in seconds, refreshed at most every check_interval seconds
+    - One caller refreshes while concurrent callers keep using the previous sample
+    - None means the last check failed (replica unreachable)
+    """
+
+    def __init__(self, measure: Callable[[], float], check_interval: float = 5.0):
+        self.measure = measure
+        self.check_interval = check_interval
+        self._lag = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def lag(self) -> Optional[float]:
+        checked_at = self._checked_at
+        if checked_at is not None and time.monotonic() - checked_at < self.check_interval:
+            return self._lag
+        # The first check blocks; later ones only run if no other caller is refreshing
+        if not self._lock.acquire(blocking=checked_at is None):
+            return self._lag
+        try:
+            if self._checked_at is None or time.monotonic() - self._checked_at >= self.check_interval:
+                try:
+                    self._lag = self.measure()
+                except Exception as e:
+                    print(f"Replica lag check failed: {e}")
+                    self._lag = None
+                self._checked_at = time.monotonic()
+            return self._lag
+        finally:
+            self._lock.release()
+
+
+class ReadRouter:
+    """Decides per read whether the replica is safe for a client"""
+
+    def __init__(self, lag_monitor: Optional[ReplicaLagMonitor], pin_seconds: float = 5.0,
+                 max_lag: float = 30.0, pins: Optional[CacheBackend] = None):
+        self.lag_monitor = lag_monitor
+        self.pin_seconds = pin_seconds
+        self.max_lag = max_lag
+        # client key -> wall-clock time of its last commit; other containers read these too.
+        # Pins older than max_lag never matter: beyond that lag every read uses the primary
+        self._pins = pins if pins is not None else LRUCache(max_size=10000, ttl=self.pin_ttl)
+        self.last_write_at = None
+        self.replica_reads = 0
+        self.primary_reads = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.lag_monitor is not None
+
+    @property
+    def pin_ttl(self) -> float:
+        return max(self.pin_seconds, self.max_lag)
+
+    def record_write(self, key: Optional[str]) -> None:
+        self.last_write_at = time.monotonic()
+        if key is not None and self.enabled:
+            try:
+                self._pins.set(key, time.time())
+            except Exception as e:
+                # The write has committed; the client may briefly read a stale replica
+                print(f"Read-your-writes pin failed: {e}")
+
+    def _window(self, lag: float) -> float:
+        return max(self.pin_seconds, lag)
+
+    def use_replica(self, key: Optional[str]) -> bool:
+        use = self._use_replica(key)
+        if use:
+            self.replica_reads += 1
+        else:
+            self.primary_reads += 1
+        return use
+
+    def _use_replica(self, key: Optional[str]) -> bool:
+        if not self.enabled:
+            return False
+        lag = self.lag_monitor.lag()
+        if lag is None or lag > self.max_lag:
+            return False
+        if key is None:
+            return True
+        try:
+            written_at = self._pins.get(key)
+        except Exception as e:
+            print(f"Read-your-writes pin lookup failed: {e}")
+            return False
+        return written_at is None or time.time() - written_at > self._window(lag)
+
+    def replica_may_be_stale(self) -> bool:
+        """True while this process's latest write may not have reached the replica yet"""
+        if self.last_write_at is None:
+            return False
+        lag = self.lag_monitor.lag() if self.enabled else 0.0
+        return time.monotonic() - self.last_write_at <= self._window(self.max_lag if lag is None else lag)
+
+    def stats(self) -> dict:
+        return {
+            "replica": self.enabled,
+            "replica_lag_seconds": self.lag_monitor._lag if self.enabled else None,
+            "pins": self._pins.stats()["backend"],
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+        }
+
+
+def _build_pin_store(ttl: float) -> CacheBackend:
+    url = os.getenv("DB_READ_YOUR_WRITES_URL") or os.getenv("MEMBER_CACHE_URL")
+    if not url:
+        return LRUCache(max_size=10000, ttl=ttl)
+    # Optional dependency, only needed when a real shared store is configured
+    import redis
+    return SharedCache(redis.Redis.from_url(url), ttl=math.ceil(ttl), prefix="membership:pin:")
+
+
+_read_router = None
+
+
+def get_read_router() -> ReadRouter:
+    """Get or create the ReadRouter singleton; without DB_READ_HOST every read uses the primary"""
+    global _read_router
+    if _read_router is None:
+        lag_monitor = None
+        pins = None
+        pin_seconds = float(os.getenv("DB_READ_YOUR_WRITES_SECONDS", "5"))
+        max_lag = float(os.getenv("DB_REPLICA_MAX_LAG", "30"))
+        if os.getenv("DB_READ_HOST"):
+            from database.database import get_read_engine
+            lag_monitor = ReplicaLagMonitor(
+                lambda: measure_replica_lag(get_read_engine()),
+                check_interval=float(os.getenv("DB_REPLICA_LAG_CHECK_INTERVAL", "5")),
+            )
+            pins = _build_pin_store(max(pin_seconds, max_lag))
+        _read_router = ReadRouter(lag_monitor, pin_seconds=pin_seconds, max_lag=max_lag, pins=pins)
+    return _read_router
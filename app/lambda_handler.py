@@ -1,9 +1,48 @@
 from mangum import Mangum
 from main import app
+from utils.compression import lambda_response
 
 # Lambda handler for FastAPI with optimizations
-lambda_handler = Mangum(
+asgi_handler = Mangum(
     app,
     lifespan="off",  # Disable lifespan events for Lambda
     text_mime_types=["application/json", "application/x-amz-json-1.0"]
-)
\ No newline at end of file
+)
+
+def outbox_handler(event, context):
+    """Drain the notification outbox, invoked on a schedule (see OutboxDispatch in api-stack.yaml)"""
+    from services.outbox_service import drain_outbox
+    counts = drain_outbox()
+    print(f"Outbox dispatch: {counts}")
+    return {"status": "ok", "action": "dispatch_outbox", **counts}
+
+def lambda_handler(event, context):
+    # Maintenance invocations that bypass API Gateway, e.g.
+    #   aws lambda invoke --function-name <fn> --payload '{"action": "init_db"}' out.json
+    if event.get("action") == "init_db":
+        from database.init_db import init_db
+        init_db()
+        return {"status": "ok", "action": "init_db"}
+    if event.get("action") == "dispatch_outbox":
+        return outbox_handler(event, context)
+    if event.get("action") == "purge_idempotency_keys":
+        from database.database import SessionLocal
+        from services.idempotency_service import purge_expired_keys
+        db = SessionLocal()
+        try:
+            deleted = purge_expired_keys(db)
+        finally:
+            db.close()
+        return {"status": "ok", "action": "purge_idempotency_keys", "deleted": deleted}
+    if event.get("action") == "reconcile_member_stats":
+        from database.database import SessionLocal
+        from services.member_stats_service import reconcile_member_stats
+        db = SessionLocal()
+        try:
+            result = reconcile_member_stats(db)
+        finally:
+            db.close()
+        print(f"Member stats reconcile: {result}")
+        return {"status": "ok", "action": "reconcile_member_stats", **result}
+    # Compressed bodies go back base64 encoded; oversized responses fail with a clear error
+    return lambda_response(asgi_handler(event, context))
@@ -1,32 +1,62 @@
+import asyncio
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from routes import members
+from database.database import ASYNC_DB_ENABLED
+from utils.compression import COMPRESSION_ENABLED, CompressionMiddleware
+from utils.request_metrics import REQUEST_METRICS_ENABLED, RequestMetricsMiddleware
 
-app = FastAPI(title="Membership API", version="1.0.0")
-
-@app.get("/health")
-def health_check():
-    return {"status": "healthy", "service": "membership-api", "environment": "lambda" if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else "local"}
-
-app.include_router(members.router)
-
-# Only create tables and seed data in LOCAL development env
-if os.getenv("AWS_LAMBDA_FUNCTION_NAME") is None:
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Only create tables and seed data in LOCAL development env. Lambda runs Mangum with
+    # lifespan="off", so no DDL happens on a cold start; the schema is applied once per
+    # deploy via the init_db action in lambda_handler.py.
     try:
-        from database.db_model import Base
-        from database.database import engine
-        from seed import seed_sample_member
-        Base.metadata.create_all(bind=engine)
+        from database.init_db import init_db
+        from seed import seed_sample_member, seed_synthetic_members
+        init_db()
         seed_sample_member()
+        # SEED_MEMBERS=N tops the table up to N synthetic members (COPY, resumable)
+        seed_synthetic_members()
     except Exception as e:
         print(f"Database initialization failed: {e}")
-else:
-    # In Lambda, we need to ensure tables exist
-    try:
-        from database.db_model import Base
-        from database.database import engine
-        Base.metadata.create_all(bind=engine)
-    except Exception as e:
-        print(f"Database connection failed in Lambda: {e}")
 
+    # Send queued notifications in the background; in Lambda the scheduled
+    # dispatch_outbox event does this instead
+    dispatcher = None
+    if os.getenv("OUTBOX_DISPATCHER", "true").lower() == "true":
+        from services.outbox_service import run_dispatcher
+        dispatcher = asyncio.create_task(run_dispatcher(float(os.getenv("OUTBOX_POLL_INTERVAL", "2"))))
+    yield
+    if dispatcher is not None:
+        dispatcher.cancel()
 
+app = FastAPI(title="Membership API", version="1.0.0", lifespan=lifespan)
+
+# gzip/br response compression (COMPRESSION=false to disable). Added first so the metrics
+# middleware wraps it and the time spent compressing shows up in Server-Timing
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# Server-Timing header + CloudWatch EMF log line per request (REQUEST_METRICS=false to disable)
+if REQUEST_METRICS_ENABLED:
+    app.add_middleware(RequestMetricsMiddleware)
+
+@app.get("/health")
+def health_check():
+    from database.routing import get_read_router
+    from services.cache_service import get_member_cache
+    cache = get_member_cache()
+    return {
+        "status": "healthy",
+        "service": "membership-api",
+        "environment": "lambda" if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else "local",
+        "cache": cache.stats() if cache is not None else None,
+        "read_routing": get_read_router().stats(),
+    }
+
+if ASYNC_DB_ENABLED:
+    from routes import members_async
+    app.include_router(members_async.router)
+app.include_router(members.router)
@@ -5,11 +5,12 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Literal, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, EmailStr, Field, field_validator, ValidationError
-from utils.sanitization import sanitize_name, validate_phone_number, sanitize_phone_number
+from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator, ValidationError, ValidationInfo
+from utils.request_metrics import phase
+from utils.sanitization import sanitize_name, normalize_phone_number
 
 
 class MemberCreate(BaseModel):
@@ -20,26 +21,36 @@ class MemberCreate(BaseModel):
     age: Optional[int] = Field(None, ge=0, le=150, description="Age between 0 and 150")
     isEmployee: Optional[bool] = None
 
+    @model_validator(mode='wrap')
+    @classmethod
+    def time_validation(cls, data, handler):
+        """Attribute the whole validation (including sanitizers) to the request's validation phase"""
+        with phase("validation"):
+            return handler(data)
+
     @field_validator('firstName', 'lastName')
     @classmethod
-    def sanitize_names(cls, v: str) -> str:
-        """Sanitize name fields to prevent XSS"""
+    def sanitize_names(cls, v: str, info: ValidationInfo) -> str:
+        """Sanitize name fields to prevent XSS (batch imports pass pre-sanitized names via context)"""
         if not v or not v.strip():
             raise ValueError('Name cannot be empty or whitespace only')
-        sanitized = sanitize_name(v)
+        sanitized_names = (info.context or {}).get('sanitized_names')
+        sanitized = sanitized_names[v] if sanitized_names and v in sanitized_names else sanitize_name(v)
         if not sanitized:
             raise ValueError('Name contains invalid characters')
         return sanitized
 
     @field_validator('phone')
     @classmethod
-    def validate_and_sanitize_phone(cls, v: Optional[str]) -> Optional[str]:
-        """Validate and sanitize phone number"""
+    def validate_and_sanitize_phone(cls, v: Optional[str], info: ValidationInfo) -> Optional[str]:
+        """Validate and sanitize phone number with a single parse (batch imports pass results via context)"""
         if v is None:
             return v
-        if not validate_phone_number(v):
+        normalized_phones = (info.context or {}).get('normalized_phones')
+        is_valid, normalized = normalized_phones[v] if normalized_phones and v in normalized_phones else normalize_phone_number(v)
+        if not is_valid:
             raise ValueError('Invalid phone number format. Use format: +1234567890 or 1234567890')
-        return sanitize_phone_number(v)
+        return normalized
 
     @field_validator('age')
     @classmethod
@@ -64,6 +75,51 @@ class Member(BaseModel):
 class MembersResponse(BaseModel):
     message: str = Field(..., example='Members retrieved successfully')
     members: List[Member]
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, null on the last page")
+
+
+class MemberChangesResponse(BaseModel):
+    message: str = Field(..., example='Member changes retrieved successfully')
+    members: List[Member]
+    next_since: Optional[str] = Field(None, description="Watermark to pass as since on the next call; null until the feed has a first member")
+    has_more: bool = Field(..., description="More changes are ready; call again without waiting")
+
+
+class AgeBucket(BaseModel):
+    min_age: int
+    max_age: int
+    count: int
+
+
+class MemberStatsResponse(BaseModel):
+    total: int
+    employees: int
+    non_employees: int
+    age_histogram: List[AgeBucket] = Field(..., description="Members per 10-year age range; empty ranges are omitted")
+    age_unknown: int = Field(..., description="Members without an age")
+
+
+class MemberSearchResult(Member):
+    score: float = Field(..., description="Trigram similarity of the best matching field, 0-1")
+
+
+class MemberSearchResponse(BaseModel):
+    message: str = Field(..., example='Members retrieved successfully')
+    members: List[MemberSearchResult]
+
+
+class BatchMemberResult(BaseModel):
+    index: int = Field(..., description="Position of the item in the submitted batch")
+    status: Literal['created', 'error']
+    id: Optional[UUID] = None
+    error: Optional[str] = None
+
+
+class BatchMembersResponse(BaseModel):
+    message: str = Field(..., example='Batch processed')
+    created: int
+    failed: int
+    results: List[BatchMemberResult]
 
 
 class ErrorResponse(BaseModel):
@@ -1,71 +1,247 @@
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from uuid import UUID
-from typing import Optional
-from database.database import get_db
-from models.member_model import MemberCreate, Member, MembersResponse, ErrorResponse
-from services.member_service import create_member, get_members, get_member_by_id
-from utils.auth import verify_api_key
-import jwt
+from typing import Literal, Optional
+from database.database import get_db, get_read_db
+from database.routing import client_key
+from models.member_model import MemberCreate, Member, MembersResponse, MemberChangesResponse, MemberSearchResponse, MemberStatsResponse, BatchMembersResponse, ErrorResponse
+from services.member_service import (
+    SEARCH_DEFAULT_LIMIT,
+    SEARCH_DEFAULT_THRESHOLD,
+    SEARCH_MAX_LIMIT,
+    DuplicateEmailError,
+    create_member,
+    create_member_idempotent,
+    create_members_batch,
+    get_member_by_id,
+    get_members,
+    page_cursor,
+    search_members,
+)
+from services.change_feed_service import CHANGES_MAX_WAIT, wait_for_changes
+from services.member_stats_service import get_member_stats
+from services.idempotency_service import IDEMPOTENCY_KEY_MAX_LENGTH, IdempotencyKeyReusedError, scoped_key
+from services.export_service import EXPORT_MEDIA_TYPES, EXPORT_PAGE_SIZE, EXPORT_MAX_PAGE_SIZE, render_batches, stream_members
+from utils.auth import get_cognito_user_email, verify_api_key
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursorError
+from utils.serialization import json_response, member_payload, members_page_response
+import json
 import os
 
 router = APIRouter()
 
-def get_cognito_user_email(request: Request) -> Optional[str]:
-    """Extract email from Cognito JWT token"""
-    try:
-        auth_header = request.headers.get('Authorization', '')
-        if not auth_header.startswith('Bearer '):
-            return None
-
-        token = auth_header.replace('Bearer ', '')
-        # Decode without verification (API Gateway already verified it)
-        decoded = jwt.decode(token, options={"verify_signature": False})
-        return decoded.get('email')
-    except Exception as e:
-        print(f"Failed to extract email from token: {str(e)}")
-        return None
-
-@router.post("/members", response_model=Member, status_code=201)
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "10000"))
+
+@router.post("/members", response_model=Member, status_code=201, responses={409: {"model": ErrorResponse}, 422: {"model": ErrorResponse}})
 def create_member_route(
     member: MemberCreate,
     request: Request,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=IDEMPOTENCY_KEY_MAX_LENGTH, description="Retries with the same key replay the original response"),
     db: Session = Depends(get_db),
-    api_key: str = Depends(verify_api_key)
+    api_key: str = Depends(verify_api_key),
+    cognito_email: Optional[str] = Depends(get_cognito_user_email)
 ):
-    # Extract Cognito user email from JWT token
-    cognito_email = get_cognito_user_email(request)
-    db_member = create_member(db, member, cognito_email)
-    return Member(**db_member.__dict__)
+    if idempotency_key:
+        try:
+            result = create_member_idempotent(db, member, scoped_key(client_key(request), idempotency_key), cognito_email)
+        except IdempotencyKeyReusedError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        # Replays return the original status and body, including an original 409
+        headers = {"Idempotent-Replayed": "true"} if result.replayed else None
+        return json_response(result.body, status_code=result.status_code, headers=headers)
+    try:
+        db_member = create_member(db, member, cognito_email)
+    except DuplicateEmailError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return json_response(member_payload(db_member), status_code=201)
+
+def parse_batch_body(body: bytes, content_type: str) -> list:
+    """Parse a batch body sent either as a JSON array or as NDJSON (one object per line)"""
+    try:
+        if content_type.startswith("application/x-ndjson"):
+            items = []
+            for line_number, line in enumerate(body.splitlines(), start=1):
+                if not line.strip():
+                    continue
+                try:
+                    items.append(json.loads(line))
+                except ValueError:
+                    raise HTTPException(status_code=400, detail=f"Invalid JSON on line {line_number}")
+            return items
+        items = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Request body must be a JSON array or NDJSON")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Request body must be a JSON array or NDJSON")
+    return items
+
+@router.post(
+    "/members:batch",
+    response_model=BatchMembersResponse,
+    responses={400: {"model": ErrorResponse}},
+    openapi_extra={"requestBody": {"required": True, "content": {
+        "application/json": {"schema": {"type": "array", "items": {"$ref": "#/components/schemas/MemberCreate"}}},
+        "application/x-ndjson": {"schema": {"type": "string"}},
+    }}},
+)
+async def create_members_batch_route(
+    request: Request,
+    db: Session = Depends(get_db),
+    api_key: str = Depends(verify_api_key),
+    cognito_email: Optional[str] = Depends(get_cognito_user_email)
+):
+    items = parse_batch_body(await request.body(), request.headers.get("content-type", ""))
+    if not items:
+        raise HTTPException(status_code=400, detail="Batch is empty")
+    if len(items) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"Batch exceeds {MAX_BATCH_SIZE} members")
+
+    # Body parsing needs the event loop; the blocking inserts go to the threadpool
+    results = await run_in_threadpool(create_members_batch, db, items, cognito_email)
+    created = sum(1 for result in results if result["status"] == "created")
+    return json_response({
+        "message": "Batch processed",
+        "created": created,
+        "failed": len(results) - created,
+        "results": [
+            {"index": result["index"], "status": result["status"], "id": result.get("id"), "error": result.get("error")}
+            for result in results
+        ],
+    })
 
 @router.get("/members", response_model=MembersResponse, responses={404: {"model": ErrorResponse}})
 def list_members_route(
     firstName: Optional[str] = None,
     lastName: Optional[str] = None,
-    db: Session = Depends(get_db),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    match: Literal["exact", "ci", "prefix"] = Query("exact", description="Name matching: exact, case-insensitive, or case-insensitive prefix"),
+    order: Literal["createdAt", "id"] = Query("createdAt", description="Page order: createdAt, or id (time-ordered for UUIDv7 ids)"),
+    db: Session = Depends(get_read_db),
     request: Request = None,
     api_key: str = Depends(verify_api_key)
 ):
-    allowed = {"firstName", "lastName"}
+    allowed = {"firstName", "lastName", "limit", "cursor", "match", "order"}
     for param in request.query_params:
         if param not in allowed:
             raise HTTPException(status_code=400, detail=f"Invalid query parameter: {param}")
 
-    results = get_members(db, firstName, lastName)
+    try:
+        results, next_cursor = get_members(db, firstName, lastName, limit, cursor, match, order)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     if not results:
         raise HTTPException(status_code=404, detail="No members found for the given query.")
-    members = [Member(**member.__dict__) for member in results]
-    return MembersResponse(message="Members retrieved successfully", members=members)
+    return members_page_response(results, next_cursor, lambda member: page_cursor(member, order))
+
+# Must be registered before /members/{id} so "export"/"search"/"changes"/"stats" are not parsed as an id
+@router.get("/members/export", responses={200: {"content": {"application/x-ndjson": {}, "text/csv": {}}}, 400: {"model": ErrorResponse}})
+def export_members_route(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    limit: Optional[int] = Query(None, ge=1, le=EXPORT_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    request: Request = None,
+    api_key: str = Depends(verify_api_key)
+):
+    allowed = {"format", "limit", "cursor"}
+    for param in request.query_params:
+        if param not in allowed:
+            raise HTTPException(status_code=400, detail=f"Invalid query parameter: {param}")
+
+    media_type = EXPORT_MEDIA_TYPES[export_format]
+    headers = {"Content-Disposition": f"attachment; filename=members.{export_format}"}
+
+    # Mangum buffers the whole body in Lambda, so fall back to bounded pages there;
+    # clients follow X-Next-Cursor until it is absent
+    if os.getenv("AWS_LAMBDA_FUNCTION_NAME") and limit is None:
+        limit = EXPORT_PAGE_SIZE
+
+    if limit is None and cursor is None:
+        return StreamingResponse(stream_members(export_format), media_type=media_type, headers=headers)
+
+    try:
+        results, next_cursor = get_members(db, limit=limit or EXPORT_PAGE_SIZE, cursor=cursor, use_cache=False)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return StreamingResponse(render_batches([results], export_format), media_type=media_type, headers=headers)
+
+# Async so long-polls wait on the event loop instead of holding a threadpool worker;
+# the sync session's queries run in the threadpool
+@router.get("/members/changes", response_model=MemberChangesResponse, responses={400: {"model": ErrorResponse}})
+async def member_changes_route(
+    since: Optional[str] = Query(None, description="Watermark (next_since) from the previous call; omit to start from the first member"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    wait: float = Query(0, ge=0, le=CHANGES_MAX_WAIT, description="Seconds to wait for a new member when there is none yet (long-poll)"),
+    db: Session = Depends(get_db),
+    request: Request = None,
+    api_key: str = Depends(verify_api_key)
+):
+    allowed = {"since", "limit", "wait"}
+    for param in request.query_params:
+        if param not in allowed:
+            raise HTTPException(status_code=400, detail=f"Invalid query parameter: {param}")
+
+    # The primary, not the replica: a lagging replica could let the watermark skip rows
+    try:
+        results, next_since, has_more = await wait_for_changes(db, since, limit, wait)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return json_response({
+        "message": "Member changes retrieved successfully",
+        "members": [member_payload(member) for member in results],
+        "next_since": next_since,
+        "has_more": has_more,
+    })
+
+@router.get("/members/stats", response_model=MemberStatsResponse, responses={400: {"model": ErrorResponse}})
+def member_stats_route(
+    db: Session = Depends(get_read_db),
+    request: Request = None,
+    api_key: str = Depends(verify_api_key)
+):
+    for param in request.query_params:
+        raise HTTPException(status_code=400, detail=f"Invalid query parameter: {param}")
+
+    # Sums the member_stats summary rows, never the members table
+    return json_response(get_member_stats(db))
+
+@router.get("/members/search", response_model=MemberSearchResponse, responses={400: {"model": ErrorResponse}})
+def search_members_route(
+    q: str = Query(..., min_length=1, max_length=100, description="Partial or misspelled name or email"),
+    limit: int = Query(SEARCH_DEFAULT_LIMIT, ge=1, le=SEARCH_MAX_LIMIT),
+    threshold: float = Query(SEARCH_DEFAULT_THRESHOLD, ge=0.0, le=1.0, description="Minimum trigram similarity"),
+    db: Session = Depends(get_read_db),
+    request: Request = None,
+    api_key: str = Depends(verify_api_key)
+):
+    allowed = {"q", "limit", "threshold"}
+    for param in request.query_params:
+        if param not in allowed:
+            raise HTTPException(status_code=400, detail=f"Invalid query parameter: {param}")
+
+    q = q.strip()
+    if not q:
+        raise HTTPException(status_code=400, detail="Search query cannot be empty")
+    results = search_members(db, q, limit, threshold)
+    return json_response({
+        "message": "Members retrieved successfully",
+        "members": [{**member_payload(member), "score": round(score, 4)} for member, score in results],
+    })
 
 @router.get("/members/{id}", response_model=Member)
 def get_member_route(
     id: UUID,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     api_key: str = Depends(verify_api_key)
 ):
     db_member = get_member_by_id(db, id)
     if not db_member:
         raise HTTPException(status_code=404, detail="Member not found")
-    return Member(**db_member.__dict__)
\ No newline at end of file
+    return json_response(member_payload(db_member))
\ No newline at end of file
@@ -0,0 +1,78 @@
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID
+from typing import Literal, Optional
+from database.database import get_async_db, get_async_read_db
+from database.routing import client_key
+from models.member_model import MemberCreate, Member, MembersResponse, ErrorResponse
+from services.idempotency_service import IDEMPOTENCY_KEY_MAX_LENGTH, IdempotencyKeyReusedError, scoped_key
+from services.member_service import DuplicateEmailError, create_member_async, create_member_idempotent_async, get_members_async, get_member_by_id_async, page_cursor
+from utils.auth import get_cognito_user_email, verify_api_key
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursorError
+from utils.serialization import json_response, member_payload, members_page_response
+
+# Async counterparts of the core routes in routes/members.py, served on the event loop
+# instead of the threadpool. Included ahead of the sync router when DB_ASYNC=true.
+router = APIRouter()
+
+@router.post("/members", response_model=Member, status_code=201, responses={409: {"model": ErrorResponse}, 422: {"model": ErrorResponse}})
+async def create_member_route(
+    member: MemberCreate,
+    request: Request,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=IDEMPOTENCY_KEY_MAX_LENGTH, description="Retries with the same key replay the original response"),
+    db: AsyncSession = Depends(get_async_db),
+    api_key: str = Depends(verify_api_key),
+    cognito_email: Optional[str] = Depends(get_cognito_user_email)
+):
+    if idempotency_key:
+        try:
+            result = await create_member_idempotent_async(db, member, scoped_key(client_key(request), idempotency_key), cognito_email)
+        except IdempotencyKeyReusedError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        # Replays return the original status and body, including an original 409
+        headers = {"Idempotent-Replayed": "true"} if result.replayed else None
+        return json_response(result.body, status_code=result.status_code, headers=headers)
+    try:
+        db_member = await create_member_async(db, member, cognito_email)
+    except DuplicateEmailError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return json_response(member_payload(db_member), status_code=201)
+
+@router.get("/members", response_model=MembersResponse, responses={404: {"model": ErrorResponse}})
+async def list_members_route(
+    firstName: Optional[str] = None,
+    lastName: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    match: Literal["exact", "ci", "prefix"] = Query("exact", description="Name matching: exact, case-insensitive, or case-insensitive prefix"),
+    order: Literal["createdAt", "id"] = Query("createdAt", description="Page order: createdAt, or id (time-ordered for UUIDv7 ids)"),
+    db: AsyncSession = Depends(get_async_read_db),
+    request: Request = None,
+    api_key: str = Depends(verify_api_key)
+):
+    allowed = {"firstName", "lastName", "limit", "cursor", "match", "order"}
+    for param in request.query_params:
+        if param not in allowed:
+            raise HTTPException(status_code=400, detail=f"Invalid query parameter: {param}")
+
+    try:
+        results, next_cursor = await get_members_async(db, firstName, lastName, limit, cursor, match, order)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if not results:
+        raise HTTPException(status_code=404, detail="No members found for the given query.")
+    return members_page_response(results, next_cursor, lambda member: page_cursor(member, order))
+
+# ":uuid" keeps this from shadowing literal /members/<name> routes on the sync router
+@router.get("/members/{id:uuid}", response_model=Member)
+async def get_member_route(
+    id: UUID,
+    db: AsyncSession = Depends(get_async_read_db),
+    api_key: str = Depends(verify_api_key)
+):
+    db_member = await get_member_by_id_async(db, id)
+    if not db_member:
+        raise HTTPException(status_code=404, detail="Member not found")
+    return json_response(member_payload(db_member))
@@ -1,6 +1,13 @@
-from database.database import SessionLocal
+from database.database import SessionLocal, get_engine
 from database.db_model import Member
-from datetime import datetime
+from services.member_stats_service import reconcile_member_stats, record_members_created
+from utils.ids import MEMBER_ID_VERSION, uuid7_from_parts
+from datetime import datetime, timedelta, timezone
+import io
+from itertools import islice
+import os
+import random
+import time
 import uuid
 
 # mock sample data for database seed (testing)
@@ -18,8 +25,179 @@ def seed_sample_member():
             createdAt=datetime.fromisoformat("2025-09-27T06:42:55.811443")
         )
         db.add(sample_member)
+        record_members_created(db, [sample_member])
         db.commit()
         print("Sample member added.")
     else:
         print("Database already has members.")
-    db.close()
\ No newline at end of file
+    db.close()
+
+
+# Synthetic members for local load/scale testing
+FIRST_NAMES = [
+    "John", "Mary", "Wei", "Ling", "Muhammad", "Siti", "Ahmad", "Nur", "Rajesh", "Priya",
+    "David", "Sarah", "Michael", "Jessica", "Daniel", "Rachel", "Kumar", "Aisha", "Jun", "Mei",
+    "Kevin", "Grace", "Ethan", "Chloe", "Ryan", "Natalie", "Hui", "Xin", "Arjun", "Deepa",
+    "Benjamin", "Charlotte", "Lucas", "Sophia", "Isaac", "Hannah", "Zhi", "Yan", "Farah", "Hafiz",
+]
+LAST_NAMES = [
+    "Tan", "Lim", "Lee", "Ng", "Ong", "Wong", "Goh", "Chua", "Chan", "Koh",
+    "Teo", "Ang", "Yeo", "Tay", "Ho", "Low", "Toh", "Sim", "Chong", "Chia",
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Wilson", "Taylor",
+    "Abdullah", "Rahman", "Ismail", "Hassan", "Singh", "Kaur", "Nair", "Pillai", "Menon", "Reddy",
+]
+EMAIL_DOMAINS = ["gmail.com", "yahoo.com", "hotmail.com", "outlook.com", "icloud.com", "singnet.com.sg"]
+
+# (weight, prefix, second digits or None, remaining digits); every prefix produces numbers that
+# phonenumbers accepts as valid, stored in E.164 like the API does
+PHONE_FORMATS = [
+    (45, "+659", "0123478", 6),  # SG mobile
+    (25, "+658", "12345678", 6),  # SG mobile
+    (6, "+601", "269", 7),  # MY mobile
+    (4, "+447", "45", 8),  # UK mobile
+    (4, "+1", None, 6),  # US, area code picked below
+    (3, "+614", "0", 7),  # AU mobile
+    (3, "+91", "789", 9),  # IN mobile
+]
+US_AREA_CODES = ["212", "415", "646", "917"]
+NO_PHONE_RATE = 0.1
+EMPLOYEE_RATE = 0.08
+# createdAt of a synthetic load is spread evenly over this window, ending when it runs
+SYNTHETIC_WINDOW = timedelta(days=3 * 365)
+SYNTHETIC_BLOCK_SIZE = 10_000
+SYNTHETIC_COLUMNS = ("id", "firstName", "lastName", "email", "phone", "age", "isEmployee", "createdAt")
+
+
+def _phone(rng: random.Random) -> str:
+    if rng.random() < NO_PHONE_RATE:
+        return None
+    _, prefix, second, digits = rng.choices(PHONE_FORMATS, weights=[f[0] for f in PHONE_FORMATS])[0]
+    if second is None:
+        return f"{prefix}{rng.choice(US_AREA_CODES)}{rng.randint(2, 9)}{rng.randrange(10 ** 6):06d}"
+    return f"{prefix}{rng.choice(second)}{rng.randrange(10 ** digits):0{digits}d}"
+
+
+def generate_members(start: int, count: int, seed: int = 1, total: int = None, end: datetime = None):
+    """
+    Yield synthetic member rows (tuples in SYNTHETIC_COLUMNS order) for indexes start..start+count-1
+    - Apart from createdAt (and the time bits of UUIDv7 ids), row i depends only on (seed, i),
+      so a table can be topped up later with the same data
+    - Emails embed the index and are unique
+    - createdAt rises with i, spaced so that total rows (default start+count) fill
+      SYNTHETIC_WINDOW ending at end (default now, naive UTC); no row is ever in the future
+    - ids follow MEMBER_ID_VERSION; UUIDv7 ids carry the row's createdAt
+    - Ages 18-79 peaking around 30; ~8% employees; ~10% without a phone
+    """
+    stop = start + count
+    total = max(total or stop, stop)
+    end = end or datetime.now(timezone.utc).replace(tzinfo=None)
+    step = SYNTHETIC_WINDOW.total_seconds() / total
+    block = start // SYNTHETIC_BLOCK_SIZE
+    while block * SYNTHETIC_BLOCK_SIZE < stop:
+        rng = random.Random(seed * 1_000_003 + block)
+        for i in range(block * SYNTHETIC_BLOCK_SIZE, (block + 1) * SYNTHETIC_BLOCK_SIZE):
+            id_bits = rng.getrandbits(128)
+            row = (
+                id_bits,
+                rng.choice(FIRST_NAMES),
+                rng.choice(LAST_NAMES),
+                rng.choice(EMAIL_DOMAINS),
+                _phone(rng),
+                int(rng.triangular(18, 80, 30)),
+                rng.random() < EMPLOYEE_RATE,
+                end - timedelta(seconds=(total - i - rng.random()) * step),
+            )
+            if start <= i < stop:
+                id_bits, first_name, last_name, domain, phone, age, is_employee, created_at = row
+                if MEMBER_ID_VERSION == 7:
+                    member_id = uuid7_from_parts(int(created_at.replace(tzinfo=timezone.utc).timestamp() * 1000), id_bits >> 116, id_bits)
+                else:
+                    member_id = uuid.UUID(int=id_bits, version=4)
+                email = f"{first_name.lower()}.{last_name.lower()}.{i}@{domain}"
+                yield member_id, first_name, last_name, email, phone, age, is_employee, created_at
+        block += 1
+
+
+def _copy_text(rows) -> io.StringIO:
+    """Rows as COPY text format; generated values never contain tabs or backslashes"""
+    buffer = io.StringIO()
+    buffer.writelines(
+        f"{member_id}\t{first}\t{last}\t{email}\t{phone or chr(92) + 'N'}\t{age}\t{'t' if employee else 'f'}\t{created.isoformat()}\n"
+        for member_id, first, last, email, phone, age, employee, created in rows
+    )
+    buffer.seek(0)
+    return buffer
+
+
+def _secondary_indexes():
+    return [index for index in Member.__table__.indexes if not index.unique]
+
+
+def seed_synthetic_members(count: int = None, seed: int = None, chunk_size: int = None, defer_indexes: bool = True) -> int:
+    """
+    Top the members table up to count rows with synthetic members loaded via COPY
+    - Defaults come from SEED_MEMBERS (0 = off), SEED_RANDOM_SEED and SEED_CHUNK_SIZE
+    - Each chunk is committed separately, so an interrupted load resumes where it stopped
+    - When the table is empty, secondary indexes are dropped during the load and rebuilt after
+    Returns the number of members inserted.
+    """
+    count = int(os.getenv("SEED_MEMBERS", "0")) if count is None else count
+    seed = int(os.getenv("SEED_RANDOM_SEED", "1")) if seed is None else seed
+    chunk_size = int(os.getenv("SEED_CHUNK_SIZE", "100000")) if chunk_size is None else chunk_size
+
+    engine = get_engine()
+    with engine.connect() as connection:
+        start = connection.exec_driver_sql("SELECT count(*) FROM members").scalar()
+    missing = count - start
+    if missing <= 0:
+        return 0
+
+    # A load that fails part-way leaves them dropped until init_db recreates them
+    indexes = _secondary_indexes() if defer_indexes and start == 0 else []
+    for index in indexes:
+        index.drop(engine, checkfirst=True)
+
+    began = time.perf_counter()
+    columns = ", ".join(f'"{column}"' for column in SYNTHETIC_COLUMNS)
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        rows = generate_members(start, missing, seed, total=count)
+        for offset in range(0, missing, chunk_size):
+            size = min(chunk_size, missing - offset)
+            cursor.execute("SET LOCAL synchronous_commit = off")
+            cursor.copy_expert(f"COPY members ({columns}) FROM STDIN", _copy_text(islice(rows, size)))
+            raw.commit()
+            print(f"Seeded {start + offset + size}/{count} members")
+        cursor.close()
+    finally:
+        raw.close()
+
+    with engine.begin() as connection:
+        connection.exec_driver_sql("SET LOCAL maintenance_work_mem = '512MB'")
+        for index in indexes:
+            index.create(connection, checkfirst=True)
+        connection.exec_driver_sql("ANALYZE members")
+    # COPY bypasses the insert paths that keep member_stats current
+    db = SessionLocal()
+    try:
+        reconcile_member_stats(db)
+    finally:
+        db.close()
+    print(f"Seeded {missing} synthetic members in {time.perf_counter() - began:.1f}s")
+    return missing
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load synthetic members into the local database with COPY")
+    parser.add_argument("--members", type=int, required=True, help="Target row count for the members table")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--keep-indexes", action="store_true", help="Maintain indexes during the load")
+    args = parser.parse_args()
+
+    from database.init_db import init_db
+    init_db()
+    seed_synthetic_members(args.members, args.seed, args.chunk_size, defer_indexes=not args.keep_indexes)
@@ -0,0 +1,260 @@
+"""
+Read-through caching for member lookups
+- LRUCache: bounded in-process cache with TTL, lives as long as the (warm) Lambda container
+- SharedCache: adapter over a Redis-style key/value client shared between containers
+- LocalKeyValueStore: in-memory stand-in for that client in local dev and tests
+"""
+import json
+import os
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+from uuid import UUID
+
+from models.member_model import Member
+from utils.serialization import member_from_json
+
+
+class CacheBackend(ABC):
+    """Minimal interface every cache backend implements; values are JSON-compatible"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: Any) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    @abstractmethod
+    def stats(self) -> dict:
+        ...
+
+
+class LRUCache(CacheBackend):
+    """Thread-safe LRU bounded to max_size entries, each expiring ttl seconds after it was set"""
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class LocalKeyValueStore:
+    """In-memory stand-in for the subset of the redis-py client used by SharedCache"""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._data.get(name)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[name]
+                return None
+            return value
+
+    def set(self, name: str, value: bytes, ex: Optional[int] = None) -> None:
+        with self._lock:
+            self._data[name] = (time.monotonic() + ex if ex else None, value)
+
+    def delete(self, *names: str) -> None:
+        with self._lock:
+            for name in names:
+                self._data.pop(name, None)
+
+    def flushdb(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class SharedCache(CacheBackend):
+    """
+    Cache stored in a key/value service shared by all containers
+    - Values are JSON-encoded; entries expire server-side after ttl seconds
+    - Evictions happen inside the store and are not visible here
+    """
+
+    def __init__(self, client, ttl: int = 60, prefix: str = "membership:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw)
+
+    def set(self, key: str, value: Any) -> None:
+        self.client.set(self.prefix + key, json.dumps(value).encode(), ex=self.ttl)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def clear(self) -> None:
+        self.client.flushdb()
+
+    def stats(self) -> dict:
+        return {"backend": "shared", "hits": self.hits, "misses": self.misses, "evictions": 0}
+
+
+class MemberCache:
+    """
+    Member-specific read-through helpers on top of a CacheBackend
+    - By-id entries never go stale: members are not updated after create
+    - List entries are keyed by a generation token that every create replaces,
+      which invalidates all cached pages at once
+    """
+
+    LIST_GENERATION_KEY = "members:list:generation"
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    def _record(self, cached) -> None:
+        if cached is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+    def get_member(self, member_id: UUID) -> Optional[Member]:
+        cached = self.backend.get(f"members:id:{member_id}")
+        self._record(cached)
+        return member_from_json(cached) if cached is not None else None
+
+    def set_member(self, member: Member) -> None:
+        self.backend.set(f"members:id:{member.id}", member.model_dump(mode="json"))
+
+    def list_key(self, first_name, last_name, limit, cursor, match="exact", order="createdAt") -> str:
+        """
+        Key for one page of a list query under the current generation
+        - Resolve it before querying the database so a page read concurrently with a
+          create is stored under the old generation and never served afterwards
+        """
+        generation = self.backend.get(self.LIST_GENERATION_KEY)
+        if generation is None:
+            # Expired or evicted: start a fresh generation rather than reusing an old one
+            generation = self.invalidate_lists()
+        return f"members:list:{generation}:{json.dumps([first_name, last_name, limit, cursor, match, order])}"
+
+    def get_list(self, key: str) -> Optional[Tuple[List[Member], Optional[str]]]:
+        cached = self.backend.get(key)
+        self._record(cached)
+        if cached is None:
+            return None
+        return [member_from_json(member) for member in cached["members"]], cached["next_cursor"]
+
+    def set_list(self, key: str, members: List[Member], next_cursor: Optional[str]) -> None:
+        self.backend.set(
+            key,
+            {"members": [member.model_dump(mode="json") for member in members], "next_cursor": next_cursor},
+        )
+
+    def invalidate_lists(self) -> str:
+        generation = uuid.uuid4().hex
+        self.backend.set(self.LIST_GENERATION_KEY, generation)
+        return generation
+
+    def stats(self) -> dict:
+        # Backend counters also include generation-key lookups, report member lookups only
+        return {**self.backend.stats(), "hits": self.hits, "misses": self.misses}
+
+
+def _build_backend() -> Optional[CacheBackend]:
+    backend = os.getenv("MEMBER_CACHE_BACKEND", "memory").lower()
+    ttl = int(os.getenv("MEMBER_CACHE_TTL", "60"))
+    if backend == "memory":
+        return LRUCache(max_size=int(os.getenv("MEMBER_CACHE_MAX_SIZE", "1024")), ttl=ttl)
+    if backend == "shared":
+        cache_url = os.getenv("MEMBER_CACHE_URL")
+        if cache_url:
+            # Optional dependency, only needed when a real shared store is configured
+            import redis
+            client = redis.Redis.from_url(cache_url)
+        else:
+            client = LocalKeyValueStore()
+        return SharedCache(client, ttl=ttl)
+    return None
+
+
+# Singleton instance
+_member_cache = None
+_member_cache_initialised = False
+
+def get_member_cache() -> Optional[MemberCache]:
+    """Get or create the member cache singleton, None when MEMBER_CACHE_BACKEND=none"""
+    global _member_cache, _member_cache_initialised
+    if not _member_cache_initialised:
+        backend = _build_backend()
+        _member_cache = MemberCache(backend) if backend is not None else None
+        _member_cache_initialised = True
+    return _member_cache
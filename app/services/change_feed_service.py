@@ -0,0 +1,197 @@
+"""
+Incremental change feed for GET /members/changes
+- Members are returned in (xid, id) order after an opaque watermark, served by
+  ix_members_xid_id; xid is the id of the transaction that inserted the member
+- Only members whose xid is below the xmin of the current snapshot are returned. Every
+  transaction below xmin has already committed or rolled back, so no member can later
+  appear behind a watermark a consumer has moved past, however long its insert took
+- Inserts send NOTIFY member_changes in their transaction (delivered on commit). Long-poll
+  requests wait on one shared LISTEN connection per process instead of re-querying, and
+  still re-check every CHANGES_RECHECK_SECONDS in case a notification was missed or a
+  member was held back behind an older transaction still in progress
+"""
+import asyncio
+import base64
+import json
+import os
+import select as select_module
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+from uuid import UUID
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import BigInteger, String, cast, func, select, tuple_
+from sqlalchemy.orm import Session
+
+from database.db_model import Member as MemberTable
+from models.member_model import Member
+from utils.pagination import DEFAULT_PAGE_SIZE, InvalidCursorError
+from utils.serialization import member_from_row
+
+CHANGES_CHANNEL = "member_changes"
+CHANGES_RECHECK_SECONDS = float(os.getenv("CHANGES_RECHECK_SECONDS", "5"))
+# API Gateway gives up on an integration after 29 seconds
+CHANGES_MAX_WAIT = 20
+
+# Oldest transaction still running; xid8 has no cast to bigint, text does
+_SNAPSHOT_XMIN = cast(cast(func.pg_snapshot_xmin(func.pg_current_snapshot()), String), BigInteger)
+
+
+def notify_statement(count: int = 1):
+    """pg_notify for the feed; run it in the inserting transaction so it fires only on commit"""
+    return select(func.pg_notify(CHANGES_CHANNEL, str(count)))
+
+
+def encode_watermark(xid: int, member_id: UUID) -> str:
+    """URL-safe base64 of the (xid, id) position of the last member returned, padding stripped"""
+    payload = json.dumps({"x": xid, "i": str(member_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_watermark(watermark: str) -> Tuple[int, UUID]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode((watermark + "=" * (-len(watermark) % 4)).encode()))
+        return int(payload["x"]), UUID(payload["i"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError(f"Invalid watermark: {watermark}") from e
+
+
+def _changes_query(since: Optional[str], limit: int):
+    query = select(MemberTable).where(MemberTable.xid < _SNAPSHOT_XMIN)
+    if since:
+        query = query.where(tuple_(MemberTable.xid, MemberTable.id) > tuple_(*decode_watermark(since)))
+    # One extra row tells the consumer whether to call again straight away
+    return query.order_by(MemberTable.xid, MemberTable.id).limit(limit + 1)
+
+
+def get_changes(db: Session, since: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[Member], Optional[str], bool]:
+    """
+    Members created after the since watermark, oldest first
+    - Returns (members, next_since, has_more); next_since is the watermark to send next and
+      stays equal to since when nothing is new (None until the feed has a first member)
+    """
+    rows = db.execute(_changes_query(since, limit)).scalars().all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if not rows:
+        return [], since, False
+    return [member_from_row(row) for row in rows], encode_watermark(rows[-1].xid, rows[-1].id), has_more
+
+
+class ChangeListener:
+    """
+    One LISTEN connection per process, shared by every long-poll request
+    - A daemon thread waits on the connection and bumps a generation counter for each batch
+      of notifications; waiters note the generation before querying, so a notification that
+      arrives between their query and their wait still wakes them
+    - The connection is reopened after errors, e.g. when a frozen Lambda container thaws
+    """
+
+    def __init__(self, connect: Callable, channel: str = CHANGES_CHANNEL, retry_interval: float = 5.0):
+        self.connect = connect
+        self.channel = channel
+        self.retry_interval = retry_interval
+        self.generation = 0
+        self.listening = threading.Event()
+        self._lock = threading.Lock()
+        self._waiters = []
+        self._thread = None
+
+    def start(self, timeout: float = 2.0) -> bool:
+        """Start the listener thread if needed; True once LISTEN is active"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="change-listener", daemon=True)
+                self._thread.start()
+        return self.listening.wait(timeout)
+
+    def _wake(self) -> None:
+        with self._lock:
+            self.generation += 1
+            waiters, self._waiters = self._waiters, []
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(lambda future=future: future.done() or future.set_result(True))
+
+    def _run(self) -> None:
+        while True:
+            connection = None
+            try:
+                connection = self.connect()
+                raw = connection.driver_connection
+                raw.cursor().execute(f"LISTEN {self.channel}")
+                self.listening.set()
+                while True:
+                    # The timeout only bounds how long a dead socket goes unnoticed
+                    if select_module.select([raw], [], [], 30) == ([], [], []):
+                        raw.cursor().execute("SELECT 1")
+                    else:
+                        raw.poll()
+                    if raw.notifies:
+                        raw.notifies.clear()
+                        self._wake()
+            except Exception as e:
+                print(f"Change listener error: {e}")
+            finally:
+                self.listening.clear()
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+            # Changes may have been missed while disconnected; let waiters re-query
+            self._wake()
+            time.sleep(self.retry_interval)
+
+    async def wait(self, generation: int, timeout: float) -> bool:
+        """Wait until the generation moves past generation; False on timeout"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            if self.generation != generation:
+                return True
+            self._waiters.append((loop, future))
+        try:
+            await asyncio.wait_for(future, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self._lock:
+                if (loop, future) in self._waiters:
+                    self._waiters.remove((loop, future))
+
+
+_change_listener = None
+
+
+def get_change_listener() -> ChangeListener:
+    """Get or create the ChangeListener singleton; its thread starts on the first long-poll"""
+    global _change_listener
+    if _change_listener is None:
+        from database.database import create_listen_connection
+        _change_listener = ChangeListener(create_listen_connection)
+    return _change_listener
+
+
+async def wait_for_changes(db: Session, since: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE,
+                           wait: float = 0.0) -> Tuple[List[Member], Optional[str], bool]:
+    """
+    get_changes, waiting up to wait seconds for a first new member when there is none yet
+    - The session is rolled back before each wait so no pooled connection is held while idle
+    - If LISTEN is unavailable the wait degrades to re-checking every CHANGES_RECHECK_SECONDS
+    """
+    listener = None
+    if wait > 0:
+        listener = get_change_listener()
+        await run_in_threadpool(listener.start)
+    deadline = time.monotonic() + wait
+    while True:
+        generation = listener.generation if listener is not None else 0
+        members, next_since, has_more = await run_in_threadpool(get_changes, db, since, limit)
+        remaining = deadline - time.monotonic()
+        if members or remaining <= 0:
+            return members, next_since, has_more
+        # Ends the snapshot too, so the next query sees a newer xmin
+        await run_in_threadpool(db.rollback)
+        await listener.wait(generation, min(remaining, CHANGES_RECHECK_SECONDS))
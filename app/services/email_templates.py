@@ -0,0 +1,267 @@
+"""
+Notification email templates, parsed once at import and rendered per member
+- HTML bodies escape every interpolated value; subject and text bodies are plain text
+- Each template can also be published to SES for send_bulk_templated_email
+"""
+import hashlib
+import html
+from string import Formatter
+from typing import Dict, List, Tuple
+
+from models.member_model import Member
+
+
+class CompiledTemplate:
+    """A {field} template split into literal/field parts once, so rendering is a single join"""
+
+    def __init__(self, source: str, escape: bool = False):
+        self.source = source
+        self.escape = escape
+        self._parts: List[Tuple[str, str]] = [
+            (literal, field) for literal, field, _, _ in Formatter().parse(source)
+        ]
+        self.fields = {field for _, field in self._parts if field}
+
+    def render(self, values: Dict[str, str]) -> str:
+        out = []
+        for literal, field in self._parts:
+            out.append(literal)
+            if field:
+                value = values[field]
+                out.append(html.escape(value) if self.escape else value)
+        return "".join(out)
+
+    def to_ses(self, suffix: str = "") -> str:
+        """
+        SES (Handlebars) form of the template
+        - Triple braces output values verbatim; HTML parts reference pre-escaped *_html values
+        """
+        return "".join(
+            literal + ("{{{" + field + suffix + "}}}" if field else "") for literal, field in self._parts
+        )
+
+
+class EmailTemplate:
+    def __init__(self, name: str, subject: str, text: str, html: str):
+        self.subject = CompiledTemplate(subject)
+        self.text = CompiledTemplate(text)
+        self.html = CompiledTemplate(html, escape=True)
+        digest = hashlib.sha256("\0".join([subject, text, html]).encode()).hexdigest()[:10]
+        # Content-addressed name: an edited template is published under a new SES name
+        self.ses_name = f"membership-{name}-{digest}"
+
+    def render(self, values: Dict[str, str]) -> Tuple[str, str, str]:
+        return self.subject.render(values), self.text.render(values), self.html.render(values)
+
+    def ses_template(self) -> dict:
+        return {
+            "TemplateName": self.ses_name,
+            "SubjectPart": self.subject.to_ses(),
+            "TextPart": self.text.to_ses(),
+            "HtmlPart": self.html.to_ses(suffix="_html"),
+        }
+
+
+def member_fields(member: Member) -> Dict[str, str]:
+    """Template values for a member, matching what the notification emails always displayed"""
+    return {
+        "first_name": member.firstName,
+        "name": f"{member.firstName} {member.lastName}",
+        "email": str(member.email),
+        "phone": member.phone or 'Not provided',
+        "age": str(member.age or 'Not provided'),
+        "employee": 'Yes' if member.isEmployee else 'No',
+        "created_at": str(member.createdAt),
+        "member_id": str(member.id),
+    }
+
+
+def ses_replacement_data(values: Dict[str, str]) -> Dict[str, str]:
+    """Replacement data for an SES templated send: raw values plus HTML-escaped *_html copies"""
+    return {**values, **{f"{key}_html": html.escape(value) for key, value in values.items()}}
+
+
+COGNITO_USER_NOTIFICATION = EmailTemplate(
+    name="cognito-user-notification",
+    subject="Member Registration Successful: {name}",
+    text="""
+Hi,
+
+You have successfully registered a new member.
+
+Member Details:
+- Name: {name}
+- Email: {email}
+- Phone: {phone}
+- Age: {age}
+- Employee: {employee}
+- Registration Date: {created_at}
+- Member ID: {member_id}
+
+Thank you for using the Membership API.
+""",
+    html="""
+<html>
+<head></head>
+<body>
+  <h2>Member Registration Successful</h2>
+  <p>Hi,</p>
+  <p>You have successfully registered a new member.</p>
+
+  <h3>Member Details:</h3>
+  <table style="border-collapse: collapse; border: 1px solid #ddd;">
+    <tr style="background-color: #f2f2f2;">
+      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Name</strong></td>
+      <td style="padding: 12px; border: 1px solid #ddd;">{name}</td>
+    </tr>
+    <tr>
+      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Email</strong></td>
+      <td style="padding: 12px; border: 1px solid #ddd;">{email}</td>
+    </tr>
+    <tr style="background-color: #f2f2f2;">
+      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Phone</strong></td>
+      <td style="padding: 12px; border: 1px solid #ddd;">{phone}</td>
+    </tr>
+    <tr>
+      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Age</strong></td>
+      <td style="padding: 12px; border: 1px solid #ddd;">{age}</td>
+    </tr>
+    <tr style="background-color: #f2f2f2;">
+      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Employee</strong></td>
+      <td style="padding: 12px; border: 1px solid #ddd;">{employee}</td>
+    </tr>
+    <tr>
+      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Registration Date</strong></td>
+      <td style="padding: 12px; border: 1px solid #ddd;">{created_at}</td>
+    </tr>
+    <tr style="background-color: #f2f2f2;">
+      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Member ID</strong></td>
+      <td style="padding: 12px; border: 1px solid #ddd;">{member_id}</td>
+    </tr>
+  </table>
+
+  <p style="margin-top: 20px;">Thank you for using the Membership API.</p>
+</body>
+</html>
+""",
+)
+
+WELCOME_MEMBER = EmailTemplate(
+    name="welcome-member",
+    subject="Welcome to Our Membership, {first_name}!",
+    text="""
+Hi {first_name},
+
+Thank you for registering! We're excited to have you as a member.
+
+Your registration details:
+- Name: {name}
+- Email: {email}
+- Phone: {phone}
+- Member ID: {member_id}
+
+If you have any questions, please don't hesitate to reach out.
+
+Best regards,
+The Membership Team
+""",
+    html="""
+<html>
+<head></head>
+<body>
+  <h2>Welcome to Our Membership!</h2>
+  <p>Hi {first_name},</p>
+  <p>Thank you for registering! We're excited to have you as a member.</p>
+
+  <h3>Your Registration Details:</h3>
+  <table style="border-collapse: collapse; border: 1px solid #ddd;">
+    <tr style="background-color: #f2f2f2;">
+      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Name</strong></td>
+      <td style="padding: 12px; border: 1px solid #ddd;">{name}</td>
+    </tr>
+    <tr>
+      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Email</strong></td>
+      <td style="padding: 12px; border: 1px solid #ddd;">{email}</td>
+    </tr>
+    <tr style="background-color: #f2f2f2;">
+      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Phone</strong></td>
+      <td style="padding: 12px; border: 1px solid #ddd;">{phone}</td>
+    </tr>
+    <tr>
+      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Member ID</strong></td>
+      <td style="padding: 12px; border: 1px solid #ddd;">{member_id}</td>
+    </tr>
+  </table>
+
+  <p style="margin-top: 20px;">If you have any questions, please don't hesitate to reach out.</p>
+  <p>Best regards,<br>The Membership Team</p>
+</body>
+</html>
+""",
+)
+
+ADMIN_NOTIFICATION = EmailTemplate(
+    name="admin-notification",
+    subject="New Member Registration: {name}",
+    text="""
+New Member Registration
+
+Name: {name}
+Email: {email}
+Phone: {phone}
+Age: {age}
+Employee: {employee}
+Registration Date: {created_at}
+Member ID: {member_id}
+
+---
+This is an automated notification from the Membership API.
+""",
+    html="""
+<html>
+<head></head>
+<body>
+  <h2>New Member Registration</h2>
+  <table style="border-collapse: collapse; border: 1px solid #ddd;">
+    <tr style="background-color: #f2f2f2;">
+      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Name</strong></td>
+      <td style="padding: 12px; border: 1px solid #ddd;">{name}</td>
+    </tr>
+    <tr>
+      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Email</strong></td>
+      <td style="padding: 12px; border: 1px solid #ddd;">{email}</td>
+    </tr>
+    <tr style="background-color: #f2f2f2;">
+      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Phone</strong></td>
+      <td style="padding: 12px; border: 1px solid #ddd;">{phone}</td>
+    </tr>
+    <tr>
+      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Age</strong></td>
+      <td style="padding: 12px; border: 1px solid #ddd;">{age}</td>
+    </tr>
+    <tr style="background-color: #f2f2f2;">
+      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Employee</strong></td>
+      <td style="padding: 12px; border: 1px solid #ddd;">{employee}</td>
+    </tr>
+    <tr>
+      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Registration Date</strong></td>
+      <td style="padding: 12px; border: 1px solid #ddd;">{created_at}</td>
+    </tr>
+    <tr style="background-color: #f2f2f2;">
+      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Member ID</strong></td>
+      <td style="padding: 12px; border: 1px solid #ddd;">{member_id}</td>
+    </tr>
+  </table>
+  <p style="color: #666; font-size: 12px; margin-top: 20px;">
+    This is an automated notification from the Membership API.
+  </p>
+</body>
+</html>
+""",
+)
+
+TEMPLATES = {
+    "cognito_user_notification": COGNITO_USER_NOTIFICATION,
+    "welcome_member": WELCOME_MEMBER,
+    "admin_notification": ADMIN_NOTIFICATION,
+}
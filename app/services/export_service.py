@@ -0,0 +1,87 @@
+"""
+Streaming bulk export of the members table as NDJSON or CSV
+"""
+import csv
+import io
+import json
+import os
+from typing import Iterable, Iterator
+from sqlalchemy import select
+from database.database import SessionLocal
+from database.db_model import Member as MemberTable
+
+EXPORT_COLUMNS = ["id", "firstName", "lastName", "email", "phone", "age", "isEmployee", "createdAt"]
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+# Page size used when the response cannot be streamed (Mangum buffers bodies in Lambda)
+EXPORT_PAGE_SIZE = int(os.getenv("EXPORT_PAGE_SIZE", "5000"))
+EXPORT_MAX_PAGE_SIZE = 10000
+
+
+def _row_values(row) -> list:
+    """Column values in EXPORT_COLUMNS order, works for ORM objects and Core rows alike"""
+    return [getattr(row, column) for column in EXPORT_COLUMNS]
+
+
+def _render_ndjson(batch: Iterable) -> str:
+    lines = []
+    for row in batch:
+        record = dict(zip(EXPORT_COLUMNS, _row_values(row)))
+        record["id"] = str(record["id"])
+        if record["createdAt"] is not None:
+            record["createdAt"] = record["createdAt"].isoformat()
+        lines.append(json.dumps(record, separators=(",", ":")))
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def _render_csv(batch: Iterable) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in batch:
+        values = _row_values(row)
+        if values[-1] is not None:
+            values[-1] = values[-1].isoformat()
+        writer.writerow(values)
+    return buffer.getvalue()
+
+
+def _csv_header() -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(EXPORT_COLUMNS)
+    return buffer.getvalue()
+
+
+def render_batches(batches: Iterable[Iterable], export_format: str) -> Iterator[str]:
+    """Render batches of member rows into response chunks, one chunk per batch"""
+    render = _render_csv if export_format == "csv" else _render_ndjson
+    if export_format == "csv":
+        yield _csv_header()
+    for batch in batches:
+        chunk = render(batch)
+        if chunk:
+            yield chunk
+
+
+def stream_members(export_format: str) -> Iterator[str]:
+    """
+    Stream every member through a server-side cursor
+    - Selects plain columns so no ORM objects accumulate in the session
+    - stream_results/yield_per keep only EXPORT_BATCH_SIZE rows in memory at a time
+    - Owns its session: the request's get_db session is closed before the body is streamed
+    """
+    db = SessionLocal()
+    try:
+        statement = (
+            select(*[getattr(MemberTable, column) for column in EXPORT_COLUMNS])
+            .order_by(MemberTable.createdAt, MemberTable.id)
+            .execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE)
+        )
+        result = db.execute(statement)
+        yield from render_batches(result.partitions(), export_format)
+    finally:
+        db.close()
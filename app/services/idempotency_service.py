@@ -0,0 +1,105 @@
+"""
+Idempotency-Key support for POST /members
+- The key is claimed with INSERT ... ON CONFLICT in the same transaction as the member and
+  its outbox row, and the response is stored before that transaction commits. A retry
+  therefore finds either the complete original response or no record at all; a concurrent
+  retry waits on the key's unique index until the first request commits or rolls back
+- Keys are scoped to the calling client and expire IDEMPOTENCY_KEY_TTL_HOURS after first use
+- Reusing a key with a different request body is rejected
+"""
+import hashlib
+import os
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple, Optional
+
+import orjson
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from database.db_model import IdempotencyKey
+
+IDEMPOTENCY_KEY_TTL = timedelta(hours=float(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24")))
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+IDEMPOTENCY_PURGE_BATCH_SIZE = int(os.getenv("IDEMPOTENCY_PURGE_BATCH_SIZE", "5000"))
+
+
+class IdempotencyKeyReusedError(ValueError):
+    """Raised when a key comes back with a different request body"""
+
+
+class StoredResponse(NamedTuple):
+    status_code: int
+    body: dict
+    replayed: bool
+
+
+def scoped_key(client: Optional[str], idempotency_key: str) -> str:
+    """Storage key: the same header value from two clients names two different requests"""
+    return f"{client or 'anonymous'}:{idempotency_key}"
+
+
+def request_fingerprint(payload: dict) -> str:
+    return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def claim_statement(key: str, fingerprint: str):
+    """
+    INSERT the key, returning it when this request now owns it
+    - An expired record is taken over as if it did not exist
+    - Returns no row when a live record exists (the caller then reads it)
+    """
+    now = datetime.now(timezone.utc)
+    statement = pg_insert(IdempotencyKey).values(key=key, fingerprint=fingerprint, created_at=now)
+    return statement.on_conflict_do_update(
+        index_elements=[IdempotencyKey.key],
+        set_={"fingerprint": fingerprint, "status_code": None, "response": None, "created_at": now},
+        where=IdempotencyKey.created_at < now - IDEMPOTENCY_KEY_TTL,
+    ).returning(IdempotencyKey.key)
+
+
+def stored_statement(key: str):
+    return select(IdempotencyKey.fingerprint, IdempotencyKey.status_code, IdempotencyKey.response).where(IdempotencyKey.key == key)
+
+
+def replay(record, key: str, fingerprint: str) -> StoredResponse:
+    """The stored response for an existing record, or an error if it belongs to another request"""
+    if record.fingerprint != fingerprint:
+        raise IdempotencyKeyReusedError(f"Idempotency-Key {key.split(':', 1)[-1]} was already used with a different request")
+    return StoredResponse(record.status_code, record.response, replayed=True)
+
+
+def store_statement(key: str, status_code: int, body: dict):
+    return update(IdempotencyKey).where(IdempotencyKey.key == key).values(status_code=status_code, response=body)
+
+
+def json_body(body: dict) -> dict:
+    """Body as plain JSON types, exactly as orjson renders it in the live response"""
+    return orjson.loads(orjson.dumps(body))
+
+
+def claim(db: Session, key: str, fingerprint: str) -> Optional[StoredResponse]:
+    """Claim key in the caller's transaction; returns the response to replay if it was already used"""
+    if db.execute(claim_statement(key, fingerprint)).first() is not None:
+        return None
+    return replay(db.execute(stored_statement(key)).one(), key, fingerprint)
+
+
+def store(db: Session, key: str, status_code: int, body: dict) -> dict:
+    """Record the response for a claimed key in the caller's transaction (does not commit)"""
+    body = json_body(body)
+    db.execute(store_statement(key, status_code, body))
+    return body
+
+
+def purge_expired_keys(db: Session) -> int:
+    """Delete expired keys in batches, committing each batch; returns the number deleted"""
+    cutoff = datetime.now(timezone.utc) - IDEMPOTENCY_KEY_TTL
+    deleted = 0
+    while True:
+        expired = select(IdempotencyKey.key).where(IdempotencyKey.created_at < cutoff).limit(IDEMPOTENCY_PURGE_BATCH_SIZE)
+        count = db.execute(delete(IdempotencyKey).where(IdempotencyKey.key.in_(expired.scalar_subquery()))).rowcount
+        db.commit()
+        deleted += count
+        if count < IDEMPOTENCY_PURGE_BATCH_SIZE:
+            return deleted
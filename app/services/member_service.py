@@ -1,40 +1,356 @@
+import os
+from typing import TYPE_CHECKING
+from pydantic import ValidationError
+from sqlalchemy import func, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from uuid import UUID
 from database.db_model import Member as MemberTable
 from models.member_model import MemberCreate, Member
-from services.notification_service import get_notification_service
-
-def create_member(db: Session, member: MemberCreate, cognito_user_email: str = None):
-    db_member = MemberTable(
-        firstName=member.firstName,
-        lastName=member.lastName,
-        email=member.email,
-        phone=member.phone,
-        age=member.age,
-        isEmployee=member.isEmployee
+from services.cache_service import get_member_cache
+from services.change_feed_service import notify_statement
+from services.member_stats_service import record_members_created, stats_increment_statement
+from services import idempotency_service as idempotency
+from services.idempotency_service import StoredResponse, request_fingerprint
+from services.outbox_service import enqueue_member_created, enqueue_members_created
+from utils.pagination import DEFAULT_PAGE_SIZE, InvalidCursorError, encode_cursor, decode_cursor
+from utils.sanitization import normalize_phone_numbers_batch, sanitize_names_batch
+from utils.serialization import member_from_row, member_payload
+
+if TYPE_CHECKING:
+    # sqlalchemy.ext.asyncio pulls in greenlet and asyncio machinery; sync deployments never need it
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+def _member_values(member: MemberCreate) -> dict:
+    return {
+        "firstName": member.firstName,
+        "lastName": member.lastName,
+        "email": member.email,
+        "phone": member.phone,
+        "age": member.age,
+        "isEmployee": member.isEmployee,
+    }
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'body'}: {err['msg']}" for err in error.errors()
     )
-    db.add(db_member)
-    db.commit()
-    db.refresh(db_member)
 
-    # Send notification email (non-blocking - don't fail if email fails)
-    try:
-        member_obj = Member(**db_member.__dict__)
-        notification_service = get_notification_service()
-        notification_service.send_new_member_notification(member_obj, cognito_user_email)
-    except Exception as e:
-        print(f"Notification failed but member created successfully: {str(e)}")
+NAME_MATCH_MODES = ("exact", "ci", "prefix")
 
-    return db_member
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
-def get_members(db: Session, first_name: str = None, last_name: str = None):
-    query = db.query(MemberTable)
+def _name_filter(column, value: str, match: str):
+    """Name predicate shaped to use the matching index in db_model.Member"""
+    if match == "ci":
+        return func.lower(column) == func.lower(value)
+    if match == "prefix":
+        # The planner only turns LIKE into an index range for a pattern it can see; lower() on
+        # the bound value would hide it, so the pattern is lowercased here
+        return func.lower(column).like(_escape_like(value.lower()) + "%", escape="\\")
+    return column == value
+
+def _members_query(first_name: str = None, last_name: str = None, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None, match: str = "exact", order: str = "createdAt"):
+    query = select(MemberTable)
     if first_name:
-        query = query.filter(MemberTable.firstName == first_name)
+        query = query.where(_name_filter(MemberTable.firstName, first_name, match))
     if last_name:
-        query = query.filter(MemberTable.lastName == last_name)
-    results = query.all()
+        query = query.where(_name_filter(MemberTable.lastName, last_name, match))
+    if cursor:
+        created_at, member_id = decode_cursor(cursor)
+        if order == "id":
+            # UUIDv7 ids are time-ordered, so the primary key alone is the keyset
+            query = query.where(MemberTable.id > member_id)
+        elif created_at is None:
+            raise InvalidCursorError(f"Invalid cursor for order=createdAt: {cursor}")
+        else:
+            # Row-value comparison lets Postgres seek straight into ix_members_createdAt_id
+            query = query.where(tuple_(MemberTable.createdAt, MemberTable.id) > tuple_(created_at, member_id))
+    # Fetch one extra row to learn whether another page exists
+    ordering = (MemberTable.id,) if order == "id" else (MemberTable.createdAt, MemberTable.id)
+    return query.order_by(*ordering).limit(limit + 1)
+
+def _to_member(row: MemberTable) -> Member:
+    # Rows were validated on the way in; skip a second pydantic validation per row
+    return member_from_row(row)
+
+def _invalidate_member_lists():
+    cache = get_member_cache()
+    if cache is not None:
+        cache.invalidate_lists()
+
+def _list_cacheable(db) -> bool:
+    # A page read from the replica just after a write may predate it; keep it out of the
+    # cache so it is not served under the generation that write started. Single members
+    # are never updated, so by-id reads are safe to cache from either side.
+    if not db.info.get("replica"):
+        return True
+    from database.routing import get_read_router
+    return not get_read_router().replica_may_be_stale()
+
+def page_cursor(member, order: str = "createdAt") -> str:
+    """Cursor for the page that starts after member"""
+    return encode_cursor(None if order == "id" else member.createdAt, member.id)
+
+def _paginate(rows, limit: int, order: str = "createdAt"):
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, page_cursor(page[-1], order)
+
+class DuplicateEmailError(ValueError):
+    """Raised when a member with the same email already exists"""
+
+DUPLICATE_EMAIL_MESSAGE = "Member with this email already exists"
+
+def _insert_member_statement(member: MemberCreate):
+    # ON CONFLICT keeps a duplicate email from aborting the transaction at commit
+    return (
+        pg_insert(MemberTable)
+        .values(**_member_values(member))
+        .on_conflict_do_nothing(index_elements=[MemberTable.email])
+        .returning(MemberTable.id, MemberTable.createdAt)
+    )
+
+def _created_member(member: MemberCreate, row) -> Member:
+    if row is None:
+        raise DuplicateEmailError(DUPLICATE_EMAIL_MESSAGE)
+    return Member(id=row.id, createdAt=row.createdAt, **_member_values(member))
+
+def _insert_member(db: Session, member: MemberCreate, cognito_user_email: str = None) -> Member:
+    """Insert one member and queue its notification in the caller's transaction (does not commit)"""
+    created = _created_member(member, db.execute(_insert_member_statement(member)).first())
+    # The outbox dispatcher sends it, so SES latency is not part of the request
+    enqueue_member_created(db, created, cognito_user_email)
+    record_members_created(db, [created])
+    # Wakes GET /members/changes long-polls once this transaction commits
+    db.execute(notify_statement())
+    return created
+
+def create_member(db: Session, member: MemberCreate, cognito_user_email: str = None) -> Member:
+    """
+    Insert one member together with its outbox notification
+    - A duplicate email raises DuplicateEmailError; nothing is written or queued
+    """
+    try:
+        created = _insert_member(db, member, cognito_user_email)
+    except DuplicateEmailError:
+        db.rollback()
+        raise
+    db.commit()
+    _invalidate_member_lists()
+    return created
+
+def create_member_idempotent(db: Session, member: MemberCreate, idempotency_key: str, cognito_user_email: str = None) -> StoredResponse:
+    """
+    create_member under an Idempotency-Key, in one transaction
+    - A retry of the same request gets the stored response back without touching members
+      or the outbox
+    - The 201 or 409 response is stored alongside the member and its outbox row
+    """
+    fingerprint = request_fingerprint(member.model_dump(mode="json"))
+    stored = idempotency.claim(db, idempotency_key, fingerprint)
+    if stored is not None:
+        db.rollback()
+        return stored
+    try:
+        status_code, body = 201, member_payload(_insert_member(db, member, cognito_user_email))
+    except DuplicateEmailError as e:
+        status_code, body = 409, {"detail": str(e)}
+    body = idempotency.store(db, idempotency_key, status_code, body)
+    db.commit()
+    if status_code == 201:
+        _invalidate_member_lists()
+    return StoredResponse(status_code, body, replayed=False)
+
+# Rows per multi-row INSERT/transaction; 8 bind params per row keeps this well under Postgres' 65535 limit
+BATCH_CHUNK_SIZE = int(os.getenv("BATCH_CHUNK_SIZE", "1000"))
+
+def create_members_batch(db: Session, items: list, cognito_user_email: str = None):
+    """
+    Validate and insert a batch of raw member payloads, returning one result per item
+    - Each item is validated independently against MemberCreate
+    - Valid rows are inserted with one multi-row INSERT ... ON CONFLICT DO NOTHING RETURNING
+      and one commit per chunk of BATCH_CHUNK_SIZE rows
+    - Rows skipped by the email unique constraint are reported as duplicates
+    - Notifications for created rows are queued in the outbox in the same transaction and
+      go out through SES bulk templated sends
+    """
+    results = [None] * len(items)
+    valid = []
+    seen_emails = set()
+    # Sanitize names and parse phones up front so repeated values are only processed once
+    dict_items = [item for item in items if isinstance(item, dict)]
+    raw_names = [
+        item[field] for item in dict_items
+        for field in ("firstName", "lastName") if isinstance(item.get(field), str)
+    ]
+    raw_phones = [item["phone"] for item in dict_items if isinstance(item.get("phone"), str)]
+    context = {
+        "sanitized_names": dict(zip(raw_names, sanitize_names_batch(raw_names))),
+        "normalized_phones": dict(zip(raw_phones, normalize_phone_numbers_batch(raw_phones))),
+    }
+    for index, item in enumerate(items):
+        try:
+            member = MemberCreate.model_validate(item, context=context)
+        except ValidationError as e:
+            results[index] = {"index": index, "status": "error", "error": _validation_message(e)}
+            continue
+        if member.email in seen_emails:
+            results[index] = {"index": index, "status": "error", "error": "Duplicate email in batch"}
+            continue
+        seen_emails.add(member.email)
+        valid.append((index, member))
+
+    for start in range(0, len(valid), BATCH_CHUNK_SIZE):
+        chunk = valid[start:start + BATCH_CHUNK_SIZE]
+        statement = (
+            pg_insert(MemberTable)
+            .values([_member_values(member) for _, member in chunk])
+            .on_conflict_do_nothing(index_elements=[MemberTable.email])
+            .returning(MemberTable.id, MemberTable.email, MemberTable.createdAt)
+        )
+        try:
+            created = {email: (member_id, created_at) for member_id, email, created_at in db.execute(statement)}
+            created_members = [
+                Member(id=created[member.email][0], createdAt=created[member.email][1], **_member_values(member))
+                for _, member in chunk if member.email in created
+            ]
+            enqueue_members_created(db, created_members, cognito_user_email)
+            if created:
+                record_members_created(db, created_members)
+                db.execute(notify_statement(len(created)))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        if created:
+            _invalidate_member_lists()
+        for index, member in chunk:
+            if member.email in created:
+                results[index] = {"index": index, "status": "created", "id": created[member.email][0]}
+            else:
+                results[index] = {"index": index, "status": "error", "error": DUPLICATE_EMAIL_MESSAGE}
+
     return results
 
+def get_members(db: Session, first_name: str = None, last_name: str = None, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None, match: str = "exact", order: str = "createdAt", use_cache: bool = True):
+    """
+    Return one page of members and the cursor for the next page (None on the last page)
+    - use_cache=False reads straight from the database, e.g. for export pages of thousands of
+      members that would each fill a cache entry and push out the small pages worth keeping
+    """
+    cache = get_member_cache() if use_cache else None
+    if cache is not None:
+        key = cache.list_key(first_name, last_name, limit, cursor, match, order)
+        cached = cache.get_list(key)
+        if cached is not None:
+            return cached
+    rows, next_cursor = _paginate(db.execute(_members_query(first_name, last_name, limit, cursor, match, order)).scalars().all(), limit, order)
+    members = [_to_member(row) for row in rows]
+    if cache is not None and _list_cacheable(db):
+        cache.set_list(key, members, next_cursor)
+    return members, next_cursor
+
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+SEARCH_DEFAULT_THRESHOLD = 0.3
+# Below three characters pg_trgm cannot narrow ILIKE '%q%' through the index
+SEARCH_MIN_SUBSTRING_LENGTH = 3
+
+def _search_query(q: str, limit: int):
+    columns = (MemberTable.firstName, MemberTable.lastName, MemberTable.email)
+    # "%" is pg_trgm's similarity operator (threshold set per transaction); both it and ILIKE
+    # are served by the gin_trgm_ops indexes and combine as a BitmapOr
+    matches = [column.op("%")(q) for column in columns]
+    if len(q) >= SEARCH_MIN_SUBSTRING_LENGTH:
+        pattern = f"%{_escape_like(q)}%"
+        matches += [column.ilike(pattern, escape="\\") for column in columns]
+    score = func.greatest(*[func.similarity(column, q) for column in columns]).label("score")
+    return select(MemberTable, score).where(or_(*matches)).order_by(score.desc(), MemberTable.id).limit(limit)
+
+def search_members(db: Session, q: str, limit: int = SEARCH_DEFAULT_LIMIT, threshold: float = SEARCH_DEFAULT_THRESHOLD):
+    """
+    Fuzzy search over first name, last name and email, best matches first
+    - Returns (member, score) pairs; score is the best trigram similarity of the three fields
+    - threshold is the minimum similarity for a fuzzy match; substring matches always qualify
+    """
+    db.execute(select(func.set_config("pg_trgm.similarity_threshold", str(threshold), True)))
+    return [(_to_member(row), score) for row, score in db.execute(_search_query(q, limit)).all()]
+
 def get_member_by_id(db: Session, member_id: UUID):
-    return db.query(MemberTable).filter(MemberTable.id == member_id).first()
+    cache = get_member_cache()
+    if cache is not None:
+        cached = cache.get_member(member_id)
+        if cached is not None:
+            return cached
+    db_member = db.get(MemberTable, member_id)
+    if db_member is None:
+        return None
+    member = _to_member(db_member)
+    if cache is not None:
+        cache.set_member(member)
+    return member
+
+async def _insert_member_async(db: "AsyncSession", member: MemberCreate, cognito_user_email: str = None) -> Member:
+    created = _created_member(member, (await db.execute(_insert_member_statement(member))).first())
+    enqueue_member_created(db, created, cognito_user_email)
+    await db.execute(stats_increment_statement([created]))
+    await db.execute(notify_statement())
+    return created
+
+async def create_member_async(db: "AsyncSession", member: MemberCreate, cognito_user_email: str = None) -> Member:
+    try:
+        created = await _insert_member_async(db, member, cognito_user_email)
+    except DuplicateEmailError:
+        await db.rollback()
+        raise
+    await db.commit()
+    _invalidate_member_lists()
+    return created
+
+async def create_member_idempotent_async(db: "AsyncSession", member: MemberCreate, idempotency_key: str, cognito_user_email: str = None) -> StoredResponse:
+    fingerprint = request_fingerprint(member.model_dump(mode="json"))
+    if (await db.execute(idempotency.claim_statement(idempotency_key, fingerprint))).first() is None:
+        record = (await db.execute(idempotency.stored_statement(idempotency_key))).one()
+        await db.rollback()
+        return idempotency.replay(record, idempotency_key, fingerprint)
+    try:
+        status_code, body = 201, member_payload(await _insert_member_async(db, member, cognito_user_email))
+    except DuplicateEmailError as e:
+        status_code, body = 409, {"detail": str(e)}
+    body = idempotency.json_body(body)
+    await db.execute(idempotency.store_statement(idempotency_key, status_code, body))
+    await db.commit()
+    if status_code == 201:
+        _invalidate_member_lists()
+    return StoredResponse(status_code, body, replayed=False)
+
+async def get_members_async(db: "AsyncSession", first_name: str = None, last_name: str = None, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None, match: str = "exact", order: str = "createdAt"):
+    cache = get_member_cache()
+    if cache is not None:
+        key = cache.list_key(first_name, last_name, limit, cursor, match, order)
+        cached = cache.get_list(key)
+        if cached is not None:
+            return cached
+    result = await db.execute(_members_query(first_name, last_name, limit, cursor, match, order))
+    rows, next_cursor = _paginate(result.scalars().all(), limit, order)
+    members = [_to_member(row) for row in rows]
+    if cache is not None and _list_cacheable(db):
+        cache.set_list(key, members, next_cursor)
+    return members, next_cursor
+
+async def get_member_by_id_async(db: "AsyncSession", member_id: UUID):
+    cache = get_member_cache()
+    if cache is not None:
+        cached = cache.get_member(member_id)
+        if cached is not None:
+            return cached
+    db_member = await db.get(MemberTable, member_id)
+    if db_member is None:
+        return None
+    member = _to_member(db_member)
+    if cache is not None:
+        cache.set_member(member)
+    return member
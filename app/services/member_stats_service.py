@@ -0,0 +1,148 @@
+"""
+Membership statistics for GET /members/stats, kept in the member_stats summary table
+- Every insert path adds its new members to the summary in its own transaction, so the
+  counts commit or roll back together with the rows they count
+- Reads sum at most (age buckets x 2 x MEMBER_STATS_SLOTS) rows, whatever the size of members
+- reconcile_member_stats recounts members and repairs any drift, e.g. after rows were loaded
+  with COPY or deleted by hand (scheduled in Lambda, run after synthetic seeding locally)
+"""
+import os
+import random
+from collections import Counter
+from typing import Iterable, Optional
+
+from sqlalchemy import case, func, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from database.db_model import Member as MemberTable
+from database.db_model import MemberStat
+
+MEMBER_STATS_SLOTS = int(os.getenv("MEMBER_STATS_SLOTS", "8"))
+AGE_BUCKET_WIDTH = 10
+UNKNOWN_AGE_BUCKET = -1
+
+_STAT_KEY = (MemberStat.age_bucket, MemberStat.is_employee, MemberStat.slot)
+
+STATS_QUERY = (
+    select(MemberStat.age_bucket, MemberStat.is_employee, func.sum(MemberStat.count))
+    .group_by(MemberStat.age_bucket, MemberStat.is_employee)
+)
+
+
+def age_bucket(age: Optional[int]) -> int:
+    return UNKNOWN_AGE_BUCKET if age is None else age // AGE_BUCKET_WIDTH * AGE_BUCKET_WIDTH
+
+
+def _stats_upsert(counts: dict):
+    """
+    Upsert adding counts ({(age_bucket, is_employee): count}) to the summary
+    - All rows of one statement go to a single random slot, in key order, so two concurrent
+      statements lock rows in the same order and cannot deadlock on each other
+    """
+    slot = random.randrange(MEMBER_STATS_SLOTS)
+    statement = pg_insert(MemberStat).values([
+        {"age_bucket": bucket, "is_employee": is_employee, "slot": slot, "count": count}
+        for (bucket, is_employee), count in sorted(counts.items())
+    ])
+    return statement.on_conflict_do_update(
+        index_elements=list(_STAT_KEY),
+        set_={"count": MemberStat.count + statement.excluded["count"]},
+    )
+
+
+def stats_increment_statement(members: Iterable):
+    """Upsert adding members to the summary; None when there is nothing to add"""
+    counts = Counter((age_bucket(member.age), bool(member.isEmployee)) for member in members)
+    return _stats_upsert(counts) if counts else None
+
+
+def record_members_created(db: Session, members: Iterable) -> None:
+    """Count new members in the caller's transaction (does not commit)"""
+    statement = stats_increment_statement(members)
+    if statement is not None:
+        db.execute(statement)
+
+
+def record_members_deleted(db: Session, members: Iterable) -> None:
+    """Uncount deleted members (anything with age/isEmployee) in the caller's transaction"""
+    counts = Counter((age_bucket(member.age), bool(member.isEmployee)) for member in members)
+    if counts:
+        db.execute(_stats_upsert({key: -count for key, count in counts.items()}))
+
+
+def summarize(rows) -> dict:
+    """Response body from (age_bucket, is_employee, count) rows"""
+    total = employees = age_unknown = 0
+    histogram = Counter()
+    for bucket, is_employee, count in rows:
+        count = int(count)
+        total += count
+        if is_employee:
+            employees += count
+        if bucket == UNKNOWN_AGE_BUCKET:
+            age_unknown += count
+        else:
+            histogram[bucket] += count
+    return {
+        "total": total,
+        "employees": employees,
+        "non_employees": total - employees,
+        "age_histogram": [
+            {"min_age": bucket, "max_age": bucket + AGE_BUCKET_WIDTH - 1, "count": count}
+            for bucket, count in sorted(histogram.items()) if count
+        ],
+        "age_unknown": age_unknown,
+    }
+
+
+def get_member_stats(db: Session) -> dict:
+    return summarize(db.execute(STATS_QUERY).all())
+
+
+def actual_counts_query():
+    bucket = case(
+        (MemberTable.age.is_(None), UNKNOWN_AGE_BUCKET),
+        else_=MemberTable.age // AGE_BUCKET_WIDTH * AGE_BUCKET_WIDTH,
+    ).label("age_bucket")
+    is_employee = func.coalesce(MemberTable.isEmployee, False).label("is_employee")
+    # Group by output names: repeating the expressions would repeat their bind parameters
+    return select(bucket, is_employee, func.count()).group_by(text("age_bucket"), text("is_employee"))
+
+
+def reconcile_member_stats(db: Session) -> dict:
+    """
+    Recount members and add a correction for any drift; commits and returns the drift
+    - Both counts come from one REPEATABLE READ snapshot without locking anything. Inserts
+      add their members and their summary rows in one transaction, so the snapshot sees
+      both or neither of every insert, and actual - recorded is the drift alone
+    - The correction is added like any increment, so inserts that commit after the snapshot
+      keep their own counts; nothing is deleted or overwritten
+    - Run it on a fresh session: the isolation level can only be set before the transaction starts
+    """
+    connection = db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    actual = {(bucket, is_employee): count for bucket, is_employee, count in connection.execute(actual_counts_query())}
+    recorded = {(bucket, is_employee): int(count) for bucket, is_employee, count in connection.execute(STATS_QUERY)}
+    db.commit()
+    drift = {
+        key: actual.get(key, 0) - recorded.get(key, 0)
+        for key in actual.keys() | recorded.keys()
+        if actual.get(key, 0) != recorded.get(key, 0)
+    }
+    if drift:
+        db.execute(_stats_upsert(drift))
+        db.commit()
+    return {
+        "total": sum(actual.values()),
+        "buckets_repaired": len(drift),
+        "members_drift": sum(drift.values()),
+    }
+
+
+if __name__ == "__main__":
+    from database.database import SessionLocal
+    db = SessionLocal()
+    try:
+        print(reconcile_member_stats(db))
+    finally:
+        db.close()
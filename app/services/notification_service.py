@@ -1,19 +1,65 @@
 """
 Email notification service using AWS SES
 """
+import json
 import os
+import time
+import uuid
+from typing import List, Optional, Tuple
 import boto3
 from botocore.exceptions import ClientError
 from models.member_model import Member
+from services.email_templates import (
+    ADMIN_NOTIFICATION,
+    COGNITO_USER_NOTIFICATION,
+    WELCOME_MEMBER,
+    EmailTemplate,
+    member_fields,
+    ses_replacement_data,
+)
+
+# SES accepts at most 50 destinations per send_bulk_templated_email call
+SES_BULK_MAX_DESTINATIONS = 50
+
+
+class LocalSESClient:
+    """In-memory stand-in for the subset of the boto3 SES client used here (benchmarks, local dev)"""
+
+    def __init__(self, latency: float = 0.0):
+        # latency: seconds each call sleeps, to approximate the SES round trip
+        self.latency = latency
+        self.sent = 0
+        self.templates = {}
+
+    def _wait(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def create_template(self, Template: dict) -> dict:
+        self._wait()
+        self.templates[Template['TemplateName']] = Template
+        return {}
+
+    def send_email(self, **kwargs) -> dict:
+        self._wait()
+        self.sent += 1
+        return {'MessageId': f'local-{uuid.uuid4()}'}
+
+    def send_bulk_templated_email(self, Destinations: list, **kwargs) -> dict:
+        self._wait()
+        self.sent += len(Destinations)
+        return {'Status': [{'Status': 'Success', 'MessageId': f'local-{uuid.uuid4()}'} for _ in Destinations]}
 
 
 class NotificationService:
     """Service for sending email notifications via AWS SES"""
 
-    def __init__(self):
-        self.ses_client = boto3.client('ses', region_name=os.getenv('AWS_REGION_NAME', 'us-east-1'))
+    def __init__(self, ses_client=None):
+        # ses_client can be injected, e.g. a stub in tests or the outbox dispatcher
+        self.ses_client = ses_client or boto3.client('ses', region_name=os.getenv('AWS_REGION_NAME', 'us-east-1'))
         self.sender_email = os.getenv('NOTIFICATION_EMAIL', 'admin@yourdomain.com')
         self.enabled = os.getenv('ENABLE_NOTIFICATIONS', 'true').lower() == 'true'
+        self._published_templates = set()
 
     def send_new_member_notification(self, member: Member, cognito_user_email: str = None) -> bool:
         """
@@ -37,168 +83,55 @@ class NotificationService:
             # Fallback: send to admin email if no Cognito user email found
             return self._send_admin_notification(member)
 
-    def _send_cognito_user_notification(self, member: Member, cognito_email: str) -> bool:
-        """Send notification to the Cognito user who created the member"""
-        subject = f"Member Registration Successful: {member.firstName} {member.lastName}"
-
-        body_text = f"""
-Hi,
-
-You have successfully registered a new member.
-
-Member Details:
-- Name: {member.firstName} {member.lastName}
-- Email: {member.email}
-- Phone: {member.phone or 'Not provided'}
-- Age: {member.age or 'Not provided'}
-- Employee: {'Yes' if member.isEmployee else 'No'}
-- Registration Date: {member.createdAt}
-- Member ID: {member.id}
-
-Thank you for using the Membership API.
-"""
-
-        body_html = f"""
-<html>
-<head></head>
-<body>
-  <h2>Member Registration Successful</h2>
-  <p>Hi,</p>
-  <p>You have successfully registered a new member.</p>
-
-  <h3>Member Details:</h3>
-  <table style="border-collapse: collapse; border: 1px solid #ddd;">
-    <tr style="background-color: #f2f2f2;">
-      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Name</strong></td>
-      <td style="padding: 12px; border: 1px solid #ddd;">{member.firstName} {member.lastName}</td>
-    </tr>
-    <tr>
-      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Email</strong></td>
-      <td style="padding: 12px; border: 1px solid #ddd;">{member.email}</td>
-    </tr>
-    <tr style="background-color: #f2f2f2;">
-      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Phone</strong></td>
-      <td style="padding: 12px; border: 1px solid #ddd;">{member.phone or 'Not provided'}</td>
-    </tr>
-    <tr>
-      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Age</strong></td>
-      <td style="padding: 12px; border: 1px solid #ddd;">{member.age or 'Not provided'}</td>
-    </tr>
-    <tr style="background-color: #f2f2f2;">
-      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Employee</strong></td>
-      <td style="padding: 12px; border: 1px solid #ddd;">{'Yes' if member.isEmployee else 'No'}</td>
-    </tr>
-    <tr>
-      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Registration Date</strong></td>
-      <td style="padding: 12px; border: 1px solid #ddd;">{member.createdAt}</td>
-    </tr>
-    <tr style="background-color: #f2f2f2;">
-      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Member ID</strong></td>
-      <td style="padding: 12px; border: 1px solid #ddd;">{member.id}</td>
-    </tr>
-  </table>
-
-  <p style="margin-top: 20px;">Thank you for using the Membership API.</p>
-</body>
-</html>
-"""
+    def send_bulk_new_member_notifications(self, notifications: List[Tuple[Member, Optional[str]]]) -> List[bool]:
+        """
+        Send new member notifications with SES bulk templated sends
 
-        try:
-            response = self.ses_client.send_email(
-                Source=self.sender_email,
-                Destination={
-                    'ToAddresses': [cognito_email]
-                },
-                Message={
-                    'Subject': {
-                        'Data': subject,
-                        'Charset': 'UTF-8'
-                    },
-                    'Body': {
-                        'Text': {
-                            'Data': body_text,
-                            'Charset': 'UTF-8'
-                        },
-                        'Html': {
-                            'Data': body_html,
-                            'Charset': 'UTF-8'
-                        }
-                    }
-                }
-            )
+        Args:
+            notifications: (member, cognito_user_email) pairs, routed like send_new_member_notification
 
-            print(f"Notification sent to Cognito user {cognito_email}! Message ID: {response['MessageId']}")
-            return True
+        Returns:
+            List[bool]: delivery result per input pair, in order
+        """
+        if not self.enabled:
+            print("Notifications are disabled")
+            return [False] * len(notifications)
+
+        results = [False] * len(notifications)
+        by_template = {}
+        for index, (member, cognito_user_email) in enumerate(notifications):
+            if cognito_user_email:
+                template, to_address = COGNITO_USER_NOTIFICATION, cognito_user_email
+            else:
+                template, to_address = ADMIN_NOTIFICATION, self.sender_email
+            by_template.setdefault(template, []).append((index, to_address, member))
+
+        for template, destinations in by_template.items():
+            for start in range(0, len(destinations), SES_BULK_MAX_DESTINATIONS):
+                chunk = destinations[start:start + SES_BULK_MAX_DESTINATIONS]
+                for (index, _, _), sent in zip(chunk, self._send_bulk(template, chunk)):
+                    results[index] = sent
+        return results
 
-        except ClientError as e:
-            error_code = e.response['Error']['Code']
-            error_message = e.response['Error']['Message']
-            print(f"Failed to send notification to Cognito user. Error: {error_code} - {error_message}")
-            return False
-        except Exception as e:
-            print(f"Unexpected error sending notification: {str(e)}")
-            return False
+    def _send_cognito_user_notification(self, member: Member, cognito_email: str) -> bool:
+        """Send notification to the Cognito user who created the member"""
+        return self._send(COGNITO_USER_NOTIFICATION, member, cognito_email, "Notification sent to Cognito user")
 
     def _send_welcome_email_to_member(self, member: Member) -> bool:
         """Send welcome email to the new member"""
-        subject = f"Welcome to Our Membership, {member.firstName}!"
-
-        body_text = f"""
-Hi {member.firstName},
-
-Thank you for registering! We're excited to have you as a member.
-
-Your registration details:
-- Name: {member.firstName} {member.lastName}
-- Email: {member.email}
-- Phone: {member.phone or 'Not provided'}
-- Member ID: {member.id}
+        return self._send(WELCOME_MEMBER, member, member.email, "Welcome email sent to member")
 
-If you have any questions, please don't hesitate to reach out.
-
-Best regards,
-The Membership Team
-"""
-
-        body_html = f"""
-<html>
-<head></head>
-<body>
-  <h2>Welcome to Our Membership!</h2>
-  <p>Hi {member.firstName},</p>
-  <p>Thank you for registering! We're excited to have you as a member.</p>
-
-  <h3>Your Registration Details:</h3>
-  <table style="border-collapse: collapse; border: 1px solid #ddd;">
-    <tr style="background-color: #f2f2f2;">
-      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Name</strong></td>
-      <td style="padding: 12px; border: 1px solid #ddd;">{member.firstName} {member.lastName}</td>
-    </tr>
-    <tr>
-      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Email</strong></td>
-      <td style="padding: 12px; border: 1px solid #ddd;">{member.email}</td>
-    </tr>
-    <tr style="background-color: #f2f2f2;">
-      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Phone</strong></td>
-      <td style="padding: 12px; border: 1px solid #ddd;">{member.phone or 'Not provided'}</td>
-    </tr>
-    <tr>
-      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Member ID</strong></td>
-      <td style="padding: 12px; border: 1px solid #ddd;">{member.id}</td>
-    </tr>
-  </table>
-
-  <p style="margin-top: 20px;">If you have any questions, please don't hesitate to reach out.</p>
-  <p>Best regards,<br>The Membership Team</p>
-</body>
-</html>
-"""
+    def _send_admin_notification(self, member: Member) -> bool:
+        """Send notification to admin about new member"""
+        return self._send(ADMIN_NOTIFICATION, member, self.sender_email, "Email sent successfully")
 
+    def _send(self, template: EmailTemplate, member: Member, to_address: str, success_message: str) -> bool:
+        subject, body_text, body_html = template.render(member_fields(member))
         try:
             response = self.ses_client.send_email(
                 Source=self.sender_email,
                 Destination={
-                    'ToAddresses': [member.email]
+                    'ToAddresses': [to_address]
                 },
                 Message={
                     'Subject': {
@@ -218,119 +151,62 @@ The Membership Team
                 }
             )
 
-            print(f"Welcome email sent to {member.email}! Message ID: {response['MessageId']}")
+            print(f"{success_message} ({to_address})! Message ID: {response['MessageId']}")
             return True
 
         except ClientError as e:
-            error_code = e.response['Error']['Code']
-            error_message = e.response['Error']['Message']
-            print(f"Failed to send welcome email to member. Error: {error_code} - {error_message}")
+            self._log_client_error(e)
             return False
         except Exception as e:
-            print(f"Unexpected error sending welcome email: {str(e)}")
+            print(f"Unexpected error sending email: {str(e)}")
             return False
 
-    def _send_admin_notification(self, member: Member) -> bool:
-        """Send notification to admin about new member"""
-        subject = f"New Member Registration: {member.firstName} {member.lastName}"
-
-        body_text = f"""
-New Member Registration
-
-Name: {member.firstName} {member.lastName}
-Email: {member.email}
-Phone: {member.phone or 'Not provided'}
-Age: {member.age or 'Not provided'}
-Employee: {'Yes' if member.isEmployee else 'No'}
-Registration Date: {member.createdAt}
-Member ID: {member.id}
-
----
-This is an automated notification from the Membership API.
-"""
-
-        body_html = f"""
-<html>
-<head></head>
-<body>
-  <h2>New Member Registration</h2>
-  <table style="border-collapse: collapse; border: 1px solid #ddd;">
-    <tr style="background-color: #f2f2f2;">
-      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Name</strong></td>
-      <td style="padding: 12px; border: 1px solid #ddd;">{member.firstName} {member.lastName}</td>
-    </tr>
-    <tr>
-      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Email</strong></td>
-      <td style="padding: 12px; border: 1px solid #ddd;">{member.email}</td>
-    </tr>
-    <tr style="background-color: #f2f2f2;">
-      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Phone</strong></td>
-      <td style="padding: 12px; border: 1px solid #ddd;">{member.phone or 'Not provided'}</td>
-    </tr>
-    <tr>
-      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Age</strong></td>
-      <td style="padding: 12px; border: 1px solid #ddd;">{member.age or 'Not provided'}</td>
-    </tr>
-    <tr style="background-color: #f2f2f2;">
-      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Employee</strong></td>
-      <td style="padding: 12px; border: 1px solid #ddd;">{'Yes' if member.isEmployee else 'No'}</td>
-    </tr>
-    <tr>
-      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Registration Date</strong></td>
-      <td style="padding: 12px; border: 1px solid #ddd;">{member.createdAt}</td>
-    </tr>
-    <tr style="background-color: #f2f2f2;">
-      <td style="padding: 12px; border: 1px solid #ddd;"><strong>Member ID</strong></td>
-      <td style="padding: 12px; border: 1px solid #ddd;">{member.id}</td>
-    </tr>
-  </table>
-  <p style="color: #666; font-size: 12px; margin-top: 20px;">
-    This is an automated notification from the Membership API.
-  </p>
-</body>
-</html>
-"""
+    def _publish_template(self, template: EmailTemplate) -> None:
+        """Create the SES template once per container; names are content-addressed so existing ones are current"""
+        if template.ses_name in self._published_templates:
+            return
+        try:
+            self.ses_client.create_template(Template=template.ses_template())
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'AlreadyExists':
+                raise
+        self._published_templates.add(template.ses_name)
 
+    def _send_bulk(self, template: EmailTemplate, chunk: List[Tuple[int, str, Member]]) -> List[bool]:
         try:
-            response = self.ses_client.send_email(
+            self._publish_template(template)
+            response = self.ses_client.send_bulk_templated_email(
                 Source=self.sender_email,
-                Destination={
-                    'ToAddresses': [self.sender_email]
-                },
-                Message={
-                    'Subject': {
-                        'Data': subject,
-                        'Charset': 'UTF-8'
-                    },
-                    'Body': {
-                        'Text': {
-                            'Data': body_text,
-                            'Charset': 'UTF-8'
-                        },
-                        'Html': {
-                            'Data': body_html,
-                            'Charset': 'UTF-8'
-                        }
+                Template=template.ses_name,
+                DefaultTemplateData=json.dumps({}),
+                Destinations=[
+                    {
+                        'Destination': {'ToAddresses': [to_address]},
+                        'ReplacementTemplateData': json.dumps(ses_replacement_data(member_fields(member))),
                     }
-                }
+                    for _, to_address, member in chunk
+                ],
             )
-
-            print(f"Email sent successfully! Message ID: {response['MessageId']}")
-            return True
+            statuses = response['Status']
+            sent = [status.get('Status') == 'Success' for status in statuses]
+            print(f"Bulk notification sent: {sum(sent)}/{len(chunk)} accepted by SES")
+            return sent
 
         except ClientError as e:
-            error_code = e.response['Error']['Code']
-            error_message = e.response['Error']['Message']
-            print(f"Failed to send email. Error: {error_code} - {error_message}")
+            self._log_client_error(e)
+            return [False] * len(chunk)
+        except Exception as e:
+            print(f"Unexpected error sending bulk email: {str(e)}")
+            return [False] * len(chunk)
 
-            # Don't fail the API request if email fails - just log it
-            if error_code == 'MessageRejected':
-                print("Email address not verified in SES. Please verify the sender email in AWS SES console.")
+    def _log_client_error(self, e: ClientError) -> None:
+        error_code = e.response['Error']['Code']
+        error_message = e.response['Error']['Message']
+        print(f"Failed to send email. Error: {error_code} - {error_message}")
 
-            return False
-        except Exception as e:
-            print(f"Unexpected error sending email: {str(e)}")
-            return False
+        # Don't fail the API request if email fails - just log it
+        if error_code == 'MessageRejected':
+            print("Email address not verified in SES. Please verify the sender email in AWS SES console.")
 
 
 # Singleton instance
@@ -0,0 +1,176 @@
+"""
+Transactional outbox for member notifications
+- enqueue_member_created: called inside the create transaction, so the notification is
+  stored if and only if the member row is committed
+- A session with info["outbox_skip"] set (benchmarks, bulk tooling) still writes its rows, at
+  the same cost, but as "skipped" so no dispatcher ever sends them
+- dispatch_pending: drains due rows in batches and sends them through NotificationService's
+  bulk templated path, retrying failures with exponential backoff (at-least-once delivery)
+"""
+import asyncio
+import os
+import random
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from database.db_model import NotificationOutbox
+from models.member_model import Member
+from utils.request_metrics import phase
+
+MEMBER_CREATED = "member_created"
+
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "50"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+OUTBOX_BACKOFF_BASE = float(os.getenv("OUTBOX_BACKOFF_BASE", "5"))
+OUTBOX_BACKOFF_MAX = float(os.getenv("OUTBOX_BACKOFF_MAX", "3600"))
+
+
+def _initial_status(db: Session) -> str:
+    return "skipped" if db.info.get("outbox_skip") else "pending"
+
+
+def enqueue_member_created(db: Session, member: Member, cognito_user_email: Optional[str] = None) -> NotificationOutbox:
+    """Add a member_created notification to the caller's transaction (does not commit)"""
+    with phase("notification"):
+        entry = NotificationOutbox(
+            event_type=MEMBER_CREATED,
+            payload={"member": member.model_dump(mode="json"), "cognito_user_email": cognito_user_email},
+            status=_initial_status(db),
+        )
+        db.add(entry)
+    return entry
+
+
+def enqueue_members_created(db: Session, members: List[Member], cognito_user_email: Optional[str] = None) -> None:
+    """Bulk variant of enqueue_member_created for batch imports (one executemany, does not commit)"""
+    if not members:
+        return
+    status = _initial_status(db)
+    db.execute(insert(NotificationOutbox), [
+        {
+            "event_type": MEMBER_CREATED,
+            "payload": {"member": member.model_dump(mode="json"), "cognito_user_email": cognito_user_email},
+            "status": status,
+        }
+        for member in members
+    ])
+
+
+def _backoff(attempts: int) -> timedelta:
+    # Full jitter keeps retries from a burst of failures from lining up
+    delay = min(OUTBOX_BACKOFF_MAX, OUTBOX_BACKOFF_BASE * (2 ** (attempts - 1)))
+    return timedelta(seconds=random.uniform(delay / 2, delay))
+
+
+def _deliver(entries: list, notification_service) -> dict:
+    """Send a batch of entries, returning {entry id: error or None}"""
+    outcomes = {}
+    member_entries = []
+    for entry in entries:
+        if entry.event_type == MEMBER_CREATED:
+            member_entries.append(entry)
+        else:
+            outcomes[entry.id] = f"Unknown outbox event type: {entry.event_type}"
+    if not member_entries:
+        return outcomes
+
+    try:
+        # One SES call per 50 notifications instead of one per member
+        sent = notification_service.send_bulk_new_member_notifications([
+            (Member.model_validate(entry.payload["member"]), entry.payload.get("cognito_user_email"))
+            for entry in member_entries
+        ])
+    except Exception as e:
+        sent = [False] * len(member_entries)
+        print(f"Bulk notification send failed: {e}")
+    for entry, delivered in zip(member_entries, sent):
+        outcomes[entry.id] = None if delivered else "Notification service reported a failed send"
+    return outcomes
+
+
+def dispatch_pending(db: Session, batch_size: int = OUTBOX_BATCH_SIZE, notification_service=None) -> dict:
+    """
+    Send one batch of due notifications and record the outcome of each
+    - Rows are claimed with FOR UPDATE SKIP LOCKED so concurrent dispatchers never share a row
+    - A crash between sending and committing re-sends that batch: delivery is at-least-once
+    """
+    if notification_service is None:
+        from services.notification_service import get_notification_service
+        notification_service = get_notification_service()
+
+    now = datetime.now(timezone.utc)
+    entries = db.execute(
+        select(NotificationOutbox)
+        .where(NotificationOutbox.status == "pending", NotificationOutbox.next_attempt_at <= now)
+        .order_by(NotificationOutbox.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).scalars().all()
+
+    counts = {"claimed": len(entries), "sent": 0, "retrying": 0, "failed": 0, "skipped": 0}
+    if not notification_service.enabled:
+        for entry in entries:
+            entry.status = "skipped"
+        counts["skipped"] = len(entries)
+        db.commit()
+        return counts
+
+    outcomes = _deliver(entries, notification_service)
+    for entry in entries:
+        error = outcomes[entry.id]
+        if error is None:
+            entry.status = "sent"
+            entry.sent_at = datetime.now(timezone.utc)
+            counts["sent"] += 1
+            continue
+
+        entry.attempts += 1
+        entry.last_error = error
+        if entry.attempts >= OUTBOX_MAX_ATTEMPTS:
+            entry.status = "failed"
+            counts["failed"] += 1
+            print(f"Outbox entry {entry.id} failed permanently after {entry.attempts} attempts: {error}")
+        else:
+            entry.next_attempt_at = datetime.now(timezone.utc) + _backoff(entry.attempts)
+            counts["retrying"] += 1
+
+    db.commit()
+    return counts
+
+
+def drain(db: Session, max_batches: int = 20, notification_service=None) -> dict:
+    """Dispatch batches until nothing is due or max_batches is reached"""
+    totals = {"claimed": 0, "sent": 0, "retrying": 0, "failed": 0, "skipped": 0}
+    for _ in range(max_batches):
+        counts = dispatch_pending(db, notification_service=notification_service)
+        for key, value in counts.items():
+            totals[key] += value
+        if counts["claimed"] < OUTBOX_BATCH_SIZE:
+            break
+    return totals
+
+
+def drain_outbox() -> dict:
+    """Drain the outbox with a dedicated session (scheduler / background task entry point)"""
+    from database.database import SessionLocal
+    db = SessionLocal()
+    try:
+        return drain(db)
+    finally:
+        db.close()
+
+
+async def run_dispatcher(interval: float):
+    """Local/container background loop; Lambda uses the scheduled dispatch_outbox event instead"""
+    while True:
+        try:
+            counts = await run_in_threadpool(drain_outbox)
+            if counts["claimed"]:
+                print(f"Outbox dispatch: {counts}")
+        except Exception as e:
+            print(f"Outbox dispatch failed: {e}")
+        await asyncio.sleep(interval)
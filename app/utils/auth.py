@@ -1,6 +1,9 @@
 import os
-from fastapi import HTTPException, Security, status
-from fastapi.security import APIKeyHeader
+from typing import Optional
+from fastapi import Depends, HTTPException, Request, Security, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.security import APIKeyHeader, HTTPAuthorizationCredentials, HTTPBearer
+from utils.request_metrics import phase
 
 # API Key header scheme for local development
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
@@ -19,13 +22,73 @@ async def verify_api_key(api_key: str = Security(api_key_header)):
     """
     if os.getenv("AWS_LAMBDA_FUNCTION_NAME"):
         return None
-    expected_key = get_api_key()
+    with phase("auth"):
+        expected_key = get_api_key()
 
-    if api_key is None or api_key != expected_key:
+        if api_key is None or api_key != expected_key:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or missing API key",
+                headers={"WWW-Authenticate": "ApiKey"},
+            )
+
+    return api_key
+
+
+# Cognito bearer tokens, verified locally when there is no API Gateway authorizer in front
+bearer_scheme = HTTPBearer(auto_error=False)
+
+_token_verifier = None
+_token_verifier_built = False
+
+def get_token_verifier():
+    """Get or create the token verifier singleton (None when no user pool is configured)"""
+    global _token_verifier, _token_verifier_built
+    if not _token_verifier_built:
+        from utils.jwt_verifier import build_token_verifier
+        _token_verifier = build_token_verifier()
+        _token_verifier_built = True
+    return _token_verifier
+
+def gateway_claims(request: Request) -> Optional[dict]:
+    """Claims API Gateway's Cognito authorizer already verified (present under Mangum)"""
+    event = request.scope.get("aws.event") or {}
+    return ((event.get("requestContext") or {}).get("authorizer") or {}).get("claims")
+
+async def verify_cognito_token(
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Security(bearer_scheme),
+) -> Optional[dict]:
+    """
+    Verified claims of the caller's Cognito token, or None when no bearer token is sent
+    - Behind API Gateway the authorizer's claims are used as-is
+    - Otherwise the signature is checked against the user pool JWKS (cached) and the
+      claims are cached per token until exp; an invalid token is rejected with 401
+    - Without a configured user pool tokens cannot be verified and are ignored
+    """
+    claims = gateway_claims(request)
+    if claims:
+        return claims
+    if credentials is None:
+        return None
+
+    verifier = get_token_verifier()
+    if verifier is None:
+        print("COGNITO_USER_POOL_ID not configured, ignoring unverified bearer token")
+        return None
+
+    from utils.jwt_verifier import InvalidTokenError
+    try:
+        # Signature checks are CPU-bound; cache hits return immediately
+        with phase("auth"):
+            return await run_in_threadpool(verifier.verify, credentials.credentials)
+    except InvalidTokenError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or missing API key",
-            headers={"WWW-Authenticate": "ApiKey"},
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"},
         )
 
-    return api_key
+async def get_cognito_user_email(claims: Optional[dict] = Depends(verify_cognito_token)) -> Optional[str]:
+    """Email of the verified Cognito caller, if any"""
+    return claims.get("email") if claims else None
@@ -0,0 +1,233 @@
+"""
+Response compression and the Lambda response size limit
+- CompressionMiddleware: pure ASGI middleware that compresses responses with br or gzip,
+  picked from the client's Accept-Encoding.
+  Bodies under COMPRESSION_MIN_SIZE bytes, non-text content types and responses that
+  already carry a Content-Encoding are sent unchanged
+- lambda_response(response): post-processes Mangum's API Gateway response so compressed
+  bodies are always returned base64 encoded, and replaces a response that would exceed
+  the 6 MB Lambda payload limit with a clear 500 instead of an opaque gateway error
+
+Compression happens here rather than in API Gateway because the Lambda limit applies to
+what the function returns, before any gateway-side compression.
+"""
+import base64
+import gzip
+import os
+import zlib
+from typing import Optional
+
+import brotli
+import orjson
+
+from utils.request_metrics import phase
+
+COMPRESSION_ENABLED = os.getenv("COMPRESSION", "true").lower() == "true"
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+# 11 is far too slow for per-request compression; 4-5 is about gzip's speed at a better ratio
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+COMPRESSIBLE_TYPES = (b"application/json", b"application/x-ndjson", b"text/")
+
+# Synchronous invocation payload limit; the whole API Gateway response object counts
+LAMBDA_MAX_RESPONSE_BYTES = 6 * 1024 * 1024
+# Room for the status code, headers and JSON envelope around the body
+LAMBDA_RESPONSE_OVERHEAD = 16 * 1024
+# Largest uncompressed JSON body that still fits once it is compressed (which can only
+# shrink it) and base64 encoded (+1/3)
+LAMBDA_MAX_BODY_BYTES = (LAMBDA_MAX_RESPONSE_BYTES - LAMBDA_RESPONSE_OVERHEAD) * 3 // 4
+
+
+# Encodings this process produces, most preferred first
+ENCODINGS = ("br", "gzip")
+
+
+def negotiate_encoding(accept_encoding: str, encodings: tuple) -> Optional[str]:
+    """
+    Pick a content coding from an Accept-Encoding header value
+    - The highest q-value wins; ties go to the earlier entry in encodings
+    - "*" covers any coding not listed explicitly; q=0 refuses a coding
+    - None means send the body uncompressed
+    """
+    weights = {}
+    for entry in accept_encoding.split(","):
+        name, _, params = entry.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name] = q
+
+    best, best_q = None, 0.0
+    for encoding in encodings:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class _StreamCompressor:
+    """Incremental compressor for streamed bodies; each chunk is flushed so NDJSON rows arrive as they are produced"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+        else:
+            # wbits 31: deflate with a gzip header and trailer
+            self._compressor = zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def chunk(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+def _header(headers: list, name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _add_vary(headers: list) -> list:
+    vary = _header(headers, b"vary")
+    if vary is None:
+        return headers + [(b"vary", b"Accept-Encoding")]
+    if b"accept-encoding" in vary.lower() or vary.strip() == b"*":
+        return headers
+    return [(k, v) for k, v in headers if k.lower() != b"vary"] + [(b"vary", vary + b", Accept-Encoding")]
+
+
+class CompressionMiddleware:
+    """
+    Compress HTTP responses the client accepts compressed
+    - The response start is held back until the first body chunk, so the size threshold
+      and Content-Length can be applied to single-chunk responses
+    - Streamed responses (more_body) are compressed chunk by chunk without Content-Length
+    - Vary: Accept-Encoding is set on every compressible response, compressed or not
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings = ENCODINGS
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = _header(scope.get("headers", []), b"accept-encoding")
+        encoding = negotiate_encoding(accept_encoding.decode("latin-1"), self.encodings) if accept_encoding else None
+
+        start = None
+        compressor = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, compressor, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                content_type = _header(headers, b"content-type") or b""
+                if not content_type.startswith(COMPRESSIBLE_TYPES) or _header(headers, b"content-encoding") is not None:
+                    passthrough = True
+                    await send(message)
+                    return
+                headers = _add_vary(headers)
+                if encoding is None:
+                    passthrough = True
+                    await send({**message, "headers": headers})
+                    return
+                start = {**message, "headers": headers}
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is None and not more_body:
+                # The whole body in one message
+                passthrough = True
+                if len(body) < self.minimum_size:
+                    await send(start)
+                    await send(message)
+                    return
+                with phase("compression"):
+                    compressed = compress(body, encoding)
+                headers = [(k, v) for k, v in start["headers"] if k.lower() != b"content-length"]
+                headers += [(b"content-encoding", encoding.encode()), (b"content-length", str(len(compressed)).encode())]
+                await send({**start, "headers": headers})
+                await send({"type": "http.response.body", "body": compressed})
+                return
+
+            if compressor is None:
+                compressor = _StreamCompressor(encoding)
+                headers = [(k, v) for k, v in start["headers"] if k.lower() != b"content-length"]
+                headers.append((b"content-encoding", encoding.encode()))
+                await send({**start, "headers": headers})
+
+            with phase("compression"):
+                data = compressor.chunk(body) if body else b""
+                if not more_body:
+                    data += compressor.finish()
+            if data or not more_body:
+                await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
+
+
+def lambda_response(response: dict) -> dict:
+    """
+    Final touches on Mangum's response before it is returned to API Gateway
+    - Mangum decides base64 by content type and returns any body that happens to decode as
+      UTF-8 as text, which API Gateway would then corrupt for compressed bytes
+    - Oversized responses become a 500 naming the limit instead of a Lambda invocation error
+    """
+    headers = {**(response.get("multiValueHeaders") or {}), **(response.get("headers") or {})}
+    encoded = any(key.lower() == "content-encoding" for key in headers)
+    if encoded and not response.get("isBase64Encoded"):
+        response["body"] = base64.b64encode(response["body"].encode("utf-8")).decode("ascii")
+        response["isBase64Encoded"] = True
+
+    size = len(response.get("body") or "") + LAMBDA_RESPONSE_OVERHEAD
+    if size > LAMBDA_MAX_RESPONSE_BYTES:
+        print(f"Response of {size} bytes exceeds the Lambda payload limit of {LAMBDA_MAX_RESPONSE_BYTES} bytes")
+        return {
+            "statusCode": 500,
+            "headers": {"content-type": "application/json"},
+            "isBase64Encoded": False,
+            "body": orjson.dumps({
+                "detail": (
+                    f"Response too large: about {size} bytes exceeds the {LAMBDA_MAX_RESPONSE_BYTES} byte "
+                    "Lambda payload limit. Request a smaller page (limit) or send Accept-Encoding: gzip."
+                ),
+            }).decode(),
+        }
+    return response
@@ -0,0 +1,62 @@
+"""
+Member ID generation
+- MEMBER_ID_VERSION=7 (default): time-ordered UUIDv7 (RFC 9562). New rows append to the right
+  edge of the primary-key B-tree, and ids sort by creation time so id alone is a keyset key
+- MEMBER_ID_VERSION=4: random UUIDv4, the previous behaviour
+Both fit the existing UUID(as_uuid=True) column; tables may mix the two.
+"""
+import os
+import secrets
+import threading
+import time
+import uuid
+
+MEMBER_ID_VERSION = int(os.getenv("MEMBER_ID_VERSION", "7"))
+
+_RAND_A_MAX = 0xFFF
+_lock = threading.Lock()
+_last_ms = 0
+_sequence = 0
+
+
+def uuid7_from_parts(unix_ms: int, rand_a: int, rand_b: int) -> uuid.UUID:
+    """Assemble a UUIDv7 from a 48-bit millisecond timestamp, 12-bit rand_a and 62-bit rand_b"""
+    return uuid.UUID(int=(
+        (unix_ms & 0xFFFFFFFFFFFF) << 80
+        | 0x7 << 76
+        | (rand_a & _RAND_A_MAX) << 64
+        | 0b10 << 62
+        | (rand_b & 0x3FFFFFFFFFFFFFFF)
+    ))
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Time-ordered UUIDv7, strictly increasing within this process
+    - rand_a is a counter started at a random value below 2048 each millisecond
+      (RFC 9562 method 1); when it overflows the timestamp is advanced by 1 ms
+    - Across processes ids are ordered to the millisecond
+    - Random bits come from the OS CSPRNG like uuid4's, so ids seen in URLs do not reveal
+      the next ones
+    """
+    global _last_ms, _sequence
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            _sequence = secrets.randbits(11)
+        else:
+            _sequence += 1
+            if _sequence > _RAND_A_MAX:
+                _last_ms += 1
+                _sequence = secrets.randbits(11)
+        return uuid7_from_parts(_last_ms, _sequence, secrets.randbits(62))
+
+
+def new_member_id() -> uuid.UUID:
+    """Primary-key default for members, selected by MEMBER_ID_VERSION"""
+    if MEMBER_ID_VERSION == 7:
+        return uuid7()
+    if MEMBER_ID_VERSION == 4:
+        return uuid.uuid4()
+    raise ValueError(f"Unknown MEMBER_ID_VERSION '{MEMBER_ID_VERSION}', expected 4 or 7")
@@ -0,0 +1,190 @@
+"""
+Cognito JWT verification with cached signing keys and verified claims
+- JWKSCache: TTL cache of the user pool's signing keys, refreshed single-flight and
+  re-fetched early when a token names an unknown key id (key rotation)
+- TokenVerifier: verifies signature, expiry, issuer and audience, and caches the claims of
+  each verified token (keyed by its SHA-256) until the token expires
+- LocalTokenIssuer: RSA key pair + JWKS for local dev and tests, issuing tokens shaped like
+  Cognito's
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Callable, Optional
+
+from services.cache_service import LRUCache
+
+
+class InvalidTokenError(ValueError):
+    """Raised when a bearer token is malformed, expired or not signed by the user pool"""
+
+
+def cognito_issuer(user_pool_id: str) -> str:
+    # Pool ids are "<region>_<id>", e.g. us-east-1_AbCdEf123
+    region = user_pool_id.split("_", 1)[0]
+    return f"https://cognito-idp.{region}.amazonaws.com/{user_pool_id}"
+
+
+def fetch_jwks(url: str, timeout: float = 5.0) -> dict:
+    """Fetch a JWKS document over HTTPS"""
+    from urllib.request import urlopen
+    with urlopen(url, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+class JWKSCache:
+    """
+    Signing keys by kid, cached for ttl seconds
+    - An unknown kid triggers one early refresh, at most every min_refresh_interval
+      seconds, so rotated keys are picked up without letting bogus kids hammer the endpoint
+    """
+
+    def __init__(self, fetch: Callable[[], dict], ttl: float = 3600.0, min_refresh_interval: float = 60.0):
+        self._fetch = fetch
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self._lock = threading.Lock()
+        self._keys = None
+        self._fetched_at = 0.0
+        self.fetch_count = 0
+
+    def _refresh(self) -> dict:
+        from jwt import PyJWK
+        jwks = self._fetch()
+        # Build the public key objects once per fetch rather than once per token
+        self._keys = {jwk["kid"]: PyJWK(jwk) for jwk in jwks.get("keys", []) if "kid" in jwk}
+        self._fetched_at = time.monotonic()
+        self.fetch_count += 1
+        return self._keys
+
+    def get_key(self, kid: str):
+        keys = self._keys
+        if keys is not None and time.monotonic() - self._fetched_at < self.ttl and kid in keys:
+            return keys[kid]
+        with self._lock:
+            age = time.monotonic() - self._fetched_at
+            if self._keys is None or age >= self.ttl:
+                self._refresh()
+            elif kid not in self._keys and age >= self.min_refresh_interval:
+                print(f"Unknown JWT key id {kid}, re-fetching JWKS (rotation?)")
+                self._refresh()
+            if kid not in self._keys:
+                raise InvalidTokenError("Token signed with an unknown key")
+            return self._keys[kid]
+
+
+class TokenVerifier:
+    """
+    Verify Cognito ID/access tokens and cache their claims until exp
+    - audience: app client id; checked against aud (ID tokens) or client_id (access tokens)
+    - Repeated requests with the same token skip the signature check entirely
+    """
+
+    def __init__(self, jwks: JWKSCache, issuer: str, audience: Optional[str] = None,
+                 cache_size: int = 1024, max_cache_ttl: float = 3600.0, leeway: float = 0.0):
+        self.jwks = jwks
+        self.issuer = issuer
+        self.audience = audience
+        self.leeway = leeway
+        self._claims = LRUCache(max_size=cache_size, ttl=max_cache_ttl)
+
+    def verify(self, token: str) -> dict:
+        token_hash = hashlib.sha256(token.encode()).hexdigest()
+        claims = self._claims.get(token_hash)
+        if claims is not None:
+            if claims["exp"] + self.leeway > time.time():
+                return claims
+            self._claims.delete(token_hash)
+
+        claims = self._decode(token)
+        self._claims.set(token_hash, claims)
+        return claims
+
+    def _decode(self, token: str) -> dict:
+        import jwt
+        try:
+            header = jwt.get_unverified_header(token)
+            if header.get("alg") != "RS256":
+                raise InvalidTokenError("Unsupported token algorithm")
+            key = self.jwks.get_key(header.get("kid"))
+            claims = jwt.decode(
+                token,
+                key.key,
+                algorithms=["RS256"],
+                issuer=self.issuer,
+                leeway=self.leeway,
+                options={"require": ["exp", "iss", "token_use"], "verify_aud": False},
+            )
+        except jwt.PyJWTError as e:
+            raise InvalidTokenError(f"Invalid token: {e}")
+
+        token_use = claims.get("token_use")
+        if token_use not in ("id", "access"):
+            raise InvalidTokenError("Invalid token: unexpected token_use")
+        if self.audience is not None:
+            audience = claims.get("aud") if token_use == "id" else claims.get("client_id")
+            if audience != self.audience:
+                raise InvalidTokenError("Invalid token: audience mismatch")
+        return claims
+
+    def stats(self) -> dict:
+        return {**self._claims.stats(), "jwks_fetches": self.jwks.fetch_count}
+
+
+class LocalTokenIssuer:
+    """Locally generated RSA key pair that signs Cognito-shaped tokens, for local dev and tests"""
+
+    def __init__(self, issuer: str = "https://cognito-idp.local/local_pool", client_id: str = "local-client"):
+        from cryptography.hazmat.primitives.asymmetric import rsa
+        self.issuer = issuer
+        self.client_id = client_id
+        self.kid = uuid.uuid4().hex
+        self._private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    def jwks(self) -> dict:
+        from jwt.algorithms import RSAAlgorithm
+        jwk = json.loads(RSAAlgorithm.to_jwk(self._private_key.public_key()))
+        jwk.update({"kid": self.kid, "alg": "RS256", "use": "sig"})
+        return {"keys": [jwk]}
+
+    def rotate(self) -> None:
+        from cryptography.hazmat.primitives.asymmetric import rsa
+        self.kid = uuid.uuid4().hex
+        self._private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    def issue(self, email: str, expires_in: int = 3600, **claims) -> str:
+        import jwt
+        now = int(time.time())
+        payload = {
+            "sub": str(uuid.uuid4()),
+            "email": email,
+            "iss": self.issuer,
+            "aud": self.client_id,
+            "token_use": "id",
+            "iat": now,
+            "exp": now + expires_in,
+            **claims,
+        }
+        return jwt.encode(payload, self._private_key, algorithm="RS256", headers={"kid": self.kid})
+
+
+def build_token_verifier() -> Optional[TokenVerifier]:
+    """
+    Verifier for the configured user pool, or None when no pool is configured
+    - COGNITO_USER_POOL_ID / COGNITO_CLIENT_ID as set by the API stack
+    - COGNITO_JWKS_URL and COGNITO_ISSUER override the derived values (e.g. a local issuer)
+    """
+    user_pool_id = os.getenv("COGNITO_USER_POOL_ID")
+    issuer = os.getenv("COGNITO_ISSUER") or (cognito_issuer(user_pool_id) if user_pool_id else None)
+    if not issuer:
+        return None
+    jwks_url = os.getenv("COGNITO_JWKS_URL", f"{issuer}/.well-known/jwks.json")
+    return TokenVerifier(
+        JWKSCache(lambda: fetch_jwks(jwks_url), ttl=float(os.getenv("JWKS_CACHE_TTL", "3600"))),
+        issuer=issuer,
+        audience=os.getenv("COGNITO_CLIENT_ID") or None,
+        cache_size=int(os.getenv("JWT_CLAIMS_CACHE_SIZE", "1024")),
+    )
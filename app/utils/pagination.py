@@ -0,0 +1,37 @@
+"""
+Opaque keyset cursors for paginated member listings
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from uuid import UUID
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a client supplies a cursor that was not issued by the API"""
+
+
+def encode_cursor(created_at: Optional[datetime], member_id: UUID) -> str:
+    """
+    Encode the keyset position of the last row on a page
+    - (createdAt, id) for order=createdAt; id alone (created_at=None) for order=id
+    - URL-safe base64 of a compact JSON payload, padding stripped
+    """
+    position = {"i": str(member_id)} if created_at is None else {"c": created_at.isoformat(), "i": str(member_id)}
+    payload = json.dumps(position, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], UUID]:
+    """Decode a cursor produced by encode_cursor back into its (createdAt, id) position; createdAt may be None"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        created_at = datetime.fromisoformat(payload["c"]) if "c" in payload else None
+        return created_at, UUID(payload["i"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}") from e
@@ -0,0 +1,185 @@
+"""
+Per-request performance instrumentation
+- RequestMetricsMiddleware: pure ASGI middleware that times each request, adds a
+  Server-Timing header and prints one CloudWatch EMF (Embedded Metric Format) JSON line
+- phase(name): context manager that adds the time spent in a block to the current request
+  (auth, validation, notification, serialization, compression)
+- install_query_metrics(engine): SQLAlchemy cursor hooks counting queries and DB time
+
+Everything is off with REQUEST_METRICS=false: the middleware and hooks are not installed and
+phase() returns a shared no-op context manager.
+"""
+import os
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+import orjson
+from sqlalchemy import event
+
+REQUEST_METRICS_ENABLED = os.getenv("REQUEST_METRICS", "true").lower() == "true"
+# EMF lines are only useful where CloudWatch picks up stdout; locally they are opt-in
+REQUEST_METRICS_LOG = os.getenv(
+    "REQUEST_METRICS_LOG", "true" if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else "false"
+).lower() == "true"
+METRICS_NAMESPACE = os.getenv("METRICS_NAMESPACE", "MembershipApi")
+
+PHASES = ("auth", "validation", "db", "notification", "serialization", "compression")
+
+
+class RequestMetrics:
+    """Timings collected for one request; shared by reference with threadpool workers"""
+
+    __slots__ = ("start", "phases", "query_count")
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.query_count = 0
+
+    def add(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+
+
+def current_metrics() -> Optional[RequestMetrics]:
+    return _current.get()
+
+
+class _Phase:
+    __slots__ = ("name", "metrics", "started")
+
+    def __init__(self, name: str, metrics: RequestMetrics):
+        self.name = name
+        self.metrics = metrics
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.add(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class _NoPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_PHASE = _NoPhase()
+
+
+def phase(name: str):
+    """Time a block against the current request; a no-op outside requests or when disabled"""
+    metrics = _current.get()
+    if metrics is None:
+        return _NO_PHASE
+    return _Phase(name, metrics)
+
+
+def install_query_metrics(engine) -> None:
+    """Count statements and their execution time against the current request"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        # The execution context lives exactly as long as this statement
+        context._request_metrics_start = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        metrics = _current.get()
+        if metrics is None:
+            return
+        metrics.phases["db"] += time.perf_counter() - context._request_metrics_start
+        metrics.query_count += 1
+
+
+def server_timing(metrics: RequestMetrics, total: float) -> str:
+    """Server-Timing header value, durations in milliseconds"""
+    entries = [
+        f'{name};dur={seconds * 1000:.2f}' + (f';desc="{metrics.query_count} queries"' if name == "db" else "")
+        for name, seconds in metrics.phases.items()
+        if seconds or name == "db"
+    ]
+    entries.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(entries)
+
+
+def emf_record(metrics: RequestMetrics, total: float, method: str, route: str, status_code: int) -> dict:
+    """CloudWatch Embedded Metric Format record for one request"""
+    values = {f"{name.capitalize()}Time": round(seconds * 1000, 3) for name, seconds in metrics.phases.items()}
+    values["Latency"] = round(total * 1000, 3)
+    values["QueryCount"] = metrics.query_count
+    return {
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": METRICS_NAMESPACE,
+                "Dimensions": [["Method", "Route"]],
+                "Metrics": [
+                    {"Name": name, "Unit": "Count" if name == "QueryCount" else "Milliseconds"}
+                    for name in values
+                ],
+            }],
+        },
+        "Method": method,
+        "Route": route,
+        "StatusCode": status_code,
+        **values,
+    }
+
+
+class RequestMetricsMiddleware:
+    """
+    Time each HTTP request and report it
+    - Server-Timing is added when the response starts, after the endpoint has run
+    - The EMF line is printed once the body is sent; Route is the matched path template
+      (e.g. /members/{id}) so the metric dimensions stay low-cardinality
+    """
+
+    def __init__(self, app, log: bool = REQUEST_METRICS_LOG):
+        self.app = app
+        self.log = log
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                total = time.perf_counter() - metrics.start
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing(metrics, total).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            if self.log:
+                route = scope.get("route")
+                record = emf_record(
+                    metrics,
+                    time.perf_counter() - metrics.start,
+                    scope.get("method", ""),
+                    getattr(route, "path", "unmatched"),
+                    status_code,
+                )
+                print(orjson.dumps(record).decode())
@@ -1,10 +1,43 @@
 """
 Input sanitization utilities for XSS protection using industry-standard libraries
 """
+import os
 import re
-import bleach
-import phonenumbers
-from phonenumbers import NumberParseException
+import threading
+from functools import lru_cache
+from typing import List, Tuple
+
+# bleach and phonenumbers are imported inside the functions that use them: together they
+# are a large share of cold-start import time and many requests never validate input.
+
+_CONTROL_CHARS = r'\x00-\x08\x0b-\x0c\x0e-\x1f\x7f'
+_CONTROL_TABLE = dict.fromkeys(
+    [code for code in range(0x20) if code not in (0x09, 0x0a, 0x0d)] + [0x7f]
+)
+# Control characters and whitespace runs, removed/collapsed in one pass
+_CONTROL_OR_SPACE_RUN = re.compile(rf'[{_CONTROL_CHARS}\s]+')
+# Anything the full pipeline would change after strip/truncate: control characters,
+# whitespace other than single spaces, and the only characters bleach rewrites (<, >, &)
+_NEEDS_CLEANING = re.compile(rf'[{_CONTROL_CHARS}<>&]|[^\S ]|  ')
+_PLAIN_NAME = re.compile(r"[\w'.\-]+(?: [\w'.\-]+)*")
+_NAME_DISALLOWED = re.compile(r"[^\w\s\-'.]", flags=re.UNICODE)
+
+_cleaners = threading.local()
+
+
+def _bleach_clean(value: str) -> str:
+    # bleach.clean builds a new Cleaner (and html5lib parser) per call; Cleaner is not
+    # thread-safe, so keep one per thread
+    cleaner = getattr(_cleaners, "cleaner", None)
+    if cleaner is None:
+        from bleach.sanitizer import Cleaner
+        cleaner = _cleaners.cleaner = Cleaner(tags=[], attributes={}, strip=True)
+    return cleaner.clean(value)
+
+
+def _collapse(match: re.Match) -> str:
+    # A run of control characters with no real whitespace in it disappears entirely
+    return ' ' if match.group().translate(_CONTROL_TABLE) else ''
 
 
 def sanitize_string(value: str, max_length: int = 255) -> str:
@@ -14,25 +47,24 @@ def sanitize_string(value: str, max_length: int = 255) -> str:
     - Removes all HTML tags and attributes
     - Enforces maximum length
     - Removes control characters
+    - Plain text (no control characters, extra whitespace or <, >, &) is returned without
+      running the regexes or bleach, which leave it unchanged anyway
     """
     if not value:
         return value
 
-    # Strip whitespace
-    value = value.strip()
+    # Strip whitespace and enforce max length
+    value = value.strip()[:max_length]
 
-    # Enforce max length
-    if len(value) > max_length:
-        value = value[:max_length]
-
-    # Remove control characters
-    value = re.sub(r'[\x00-\x08\x0b-\x0c\x0e-\x1f\x7f]', '', value)
+    if not _NEEDS_CLEANING.search(value):
+        return value
 
-    # Collapse multiple spaces into one
-    value = re.sub(r'\s+', ' ', value)
+    # Remove control characters and collapse multiple spaces into one
+    value = _CONTROL_OR_SPACE_RUN.sub(_collapse, value)
 
     # Use bleach to clean any HTML/script tags (removes all tags by default)
-    value = bleach.clean(value, tags=[], attributes={}, strip=True)
+    if '<' in value or '>' in value or '&' in value:
+        value = _bleach_clean(value)
 
     return value
 
@@ -47,38 +79,101 @@ def sanitize_name(name: str) -> str:
     if not name:
         return name
 
+    # Typical names ("John", "Mary-Jane O'Neil") are already clean
+    stripped = name.strip()[:100]
+    if _PLAIN_NAME.fullmatch(stripped):
+        return stripped
+
     # Basic sanitization with bleach
     name = sanitize_string(name, max_length=100)
 
     # Remove characters that aren't typical in names
     # Allow: letters (any language), spaces, hyphens, apostrophes, periods
-    name = re.sub(r"[^\w\s\-'.]", '', name, flags=re.UNICODE)
+    name = _NAME_DISALLOWED.sub('', name)
 
     return name.strip()
 
 
-def validate_phone_number(phone: str) -> bool:
+def sanitize_names_batch(names: List[str]) -> List[str]:
     """
-    Validate phone number using Google's libphonenumber
-    - Supports international formats
-    - Defaults to Singapore (SG) region
-    - SG mobile: 8/9 digits starting with 8 or 9 (e.g., 81234567, 91234567)
-    - SG landline: 8 digits (e.g., 62345678)
+    sanitize_name over a list of names, for bulk ingestion
+    - Repeated values (common first/last names) are sanitized once
     """
-    if not phone:
-        return True  # Optional field
+    sanitized = {}
+    results = []
+    for name in names:
+        if name not in sanitized:
+            sanitized[name] = sanitize_name(name)
+        results.append(sanitized[name])
+    return results
+
+
+PHONE_DEFAULT_REGION = "SG"
+PHONE_CACHE_SIZE = int(os.getenv("PHONE_CACHE_SIZE", "4096"))
+
+
+@lru_cache(maxsize=PHONE_CACHE_SIZE)
+def _normalize_phone_number(phone: str, region: str) -> Tuple[bool, str]:
+    import phonenumbers
+    from phonenumbers import NumberParseException
 
     try:
-        # Try to parse with Singapore as default region
-        parsed = phonenumbers.parse(phone, "SG")
-        return phonenumbers.is_valid_number(parsed)
+        # Try parsing with the default region first
+        parsed = phonenumbers.parse(phone, region)
     except NumberParseException:
-        # If SG parsing fails, try international format
+        # Try international format if default-region parsing fails
         try:
             parsed = phonenumbers.parse(phone, None)
-            return phonenumbers.is_valid_number(parsed)
         except NumberParseException:
-            return False
+            parsed = None
+
+    if parsed is not None and phonenumbers.is_valid_number(parsed):
+        # E164 format (+6581234567 for Singapore)
+        return True, phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+
+    # Invalid: cleaned version (digits + optional leading +)
+    if phone.startswith('+'):
+        return False, '+' + re.sub(r'\D', '', phone)
+    return False, re.sub(r'\D', '', phone)
+
+
+def normalize_phone_number(phone: str, region: str = PHONE_DEFAULT_REGION) -> Tuple[bool, str]:
+    """
+    Validate and normalize a phone number with a single libphonenumber parse
+    - Returns (is_valid, E164 number); invalid numbers get the digits-only fallback
+    - Results are memoised in a bounded LRU cache keyed by (raw input, region)
+    - Empty input is valid (optional field) and returned unchanged
+    """
+    if not phone:
+        return True, phone
+    return _normalize_phone_number(phone, region)
+
+
+def normalize_phone_numbers_batch(phones: List[str], region: str = PHONE_DEFAULT_REGION) -> List[Tuple[bool, str]]:
+    """
+    normalize_phone_number over a list of phones, for bulk ingestion
+    - Repeated values are parsed once
+    - Bypasses the LRU cache so a large import of mostly unique numbers does not evict
+      the entries serving single-member requests
+    """
+    normalized = {}
+    results = []
+    for phone in phones:
+        if phone not in normalized:
+            normalized[phone] = _normalize_phone_number.__wrapped__(phone, region) if phone else (True, phone)
+        results.append(normalized[phone])
+    return results
+
+
+def validate_phone_number(phone: str) -> bool:
+    """
+    Validate phone number using Google's libphonenumber
+    - Supports international formats
+    - Defaults to Singapore (SG) region
+    - SG mobile: 8/9 digits starting with 8 or 9 (e.g., 81234567, 91234567)
+    - SG landline: 8 digits (e.g., 62345678)
+    """
+    return normalize_phone_number(phone)[0]
 
 
 def sanitize_phone_number(phone: str) -> str:
@@ -87,25 +182,4 @@ def sanitize_phone_number(phone: str) -> str:
     - Defaults to Singapore region
     - Returns standardized international format: +6581234567 (SG), +1234567890 (others)
     """
-    if not phone:
-        return phone
-
-    try:
-        # Try parsing with Singapore as default region
-        parsed = phonenumbers.parse(phone, "SG")
-        if phonenumbers.is_valid_number(parsed):
-            # Return in E164 format (+6581234567 for Singapore)
-            return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
-    except NumberParseException:
-        # Try international format if SG parsing fails
-        try:
-            parsed = phonenumbers.parse(phone, None)
-            if phonenumbers.is_valid_number(parsed):
-                return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
-        except NumberParseException:
-            pass
-
-    # If all parsing fails, return cleaned version (digits + optional leading +)
-    if phone.startswith('+'):
-        return '+' + re.sub(r'\D', '', phone)
-    return re.sub(r'\D', '', phone)
+    return normalize_phone_number(phone)[1]
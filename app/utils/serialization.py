@@ -0,0 +1,77 @@
+"""
+Response serialisation for member payloads without re-validating trusted rows
+- Rows read from the database (or the member cache) already satisfied MemberCreate on the
+  way in, so they are wrapped with model_construct instead of being validated again
+- Routes render payload dicts with ORJSONResponse; returning a Response instance makes
+  FastAPI skip response_model validation, which stays in place for the OpenAPI schema only
+- members_page_response cuts a list page short, with a cursor to the rest, when its body
+  would not fit in LIST_RESPONSE_MAX_BYTES (the Lambda payload limit when deployed)
+"""
+import os
+from datetime import datetime
+from typing import Any, Callable, List, Optional
+from uuid import UUID
+
+from fastapi.responses import ORJSONResponse
+
+from models.member_model import Member
+from utils.compression import LAMBDA_MAX_BODY_BYTES
+from utils.request_metrics import phase
+
+# 0 disables the check; locally there is no payload limit
+LIST_RESPONSE_MAX_BYTES = int(os.getenv(
+    "LIST_RESPONSE_MAX_BYTES", str(LAMBDA_MAX_BODY_BYTES) if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else "0"
+))
+
+MEMBER_FIELDS = ("id", "firstName", "lastName", "email", "phone", "age", "isEmployee", "createdAt")
+
+
+def member_from_row(row: Any) -> Member:
+    """Wrap an ORM object, Core Row or Member in a Member without validation"""
+    return Member.model_construct(**{field: getattr(row, field) for field in MEMBER_FIELDS})
+
+
+def member_from_json(values: dict) -> Member:
+    """Rebuild a Member from its model_dump(mode="json") form, restoring id/createdAt types"""
+    values = dict(values)
+    values["id"] = UUID(values["id"])
+    values["createdAt"] = datetime.fromisoformat(values["createdAt"])
+    return Member.model_construct(**values)
+
+
+def member_payload(row: Any) -> dict:
+    """Response dict for one member; orjson renders the UUID and datetime values natively"""
+    return {field: getattr(row, field) for field in MEMBER_FIELDS}
+
+
+def json_response(content: Any, status_code: int = 200, headers: Optional[dict] = None) -> ORJSONResponse:
+    # The body is rendered in the constructor
+    with phase("serialization"):
+        return ORJSONResponse(content, status_code=status_code, headers=headers)
+
+
+def members_page_response(
+    members: List[Any],
+    next_cursor: Optional[str],
+    cursor_after: Callable[[Any], str],
+    max_bytes: int = LIST_RESPONSE_MAX_BYTES,
+) -> ORJSONResponse:
+    """
+    A page of members as a JSON response no larger than max_bytes
+    - An oversized page is truncated and next_cursor set to cursor_after(last member kept),
+      so clients carry on paging as usual instead of getting a payload-limit error
+    - Rows are close to the same size, so the first cut is proportional and rarely repeated
+    """
+    def render(page, cursor):
+        return json_response({
+            "message": "Members retrieved successfully",
+            "members": [member_payload(member) for member in page],
+            "next_cursor": cursor,
+        })
+
+    response = render(members, next_cursor)
+    while max_bytes and len(response.body) > max_bytes and len(members) > 1:
+        keep = int(len(members) * max_bytes / len(response.body) * 0.95)
+        members = members[:max(1, min(keep, len(members) - 1))]
+        response = render(members, cursor_after(members[-1]))
+    return response
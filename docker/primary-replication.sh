@@ -0,0 +1,5 @@
+#!/bin/bash
+# Runs once when the primary's data directory is initialised: allow the replica
+# service to stream WAL with the regular database user
+set -e
+echo "host replication ${POSTGRES_USER} all scram-sha-256" >> "$PGDATA/pg_hba.conf"